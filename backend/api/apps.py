@@ -1,11 +1,22 @@
 import sys
+import threading
 from django.apps import AppConfig
+from django.conf import settings
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
     def ready(self):
+        # Connect the receivers that keep the derived recommendation tables current,
+        # also for writes made by management commands such as seed
+        from . import collaborative_filtering, major_affinity, society_stats  # noqa: F401
+
         if "runserver" in sys.argv:
             from .scheduler import start_scheduler
-            start_scheduler()
\ No newline at end of file
+            start_scheduler()
+
+        # NLP models load lazily on first use; optionally warm them up in the background
+        if getattr(settings, "NLP_WARM_UP_ON_STARTUP", False):
+            from .nlp_similarity import text_similarity_analyzer
+            threading.Thread(target=text_similarity_analyzer.warm_up, daemon=True).start()
@@ -0,0 +1,62 @@
+import threading
+from django.db import connections, transaction
+from .scoring_stats import scoring_stats
+
+
+class BackgroundRefresh:
+    """
+    Runs a refresh callable in a daemon thread of the current process, one run at
+    a time, so derived state (e.g. the vector index or co-occurrence neighbors) is
+    built lazily in every web worker and management command without a request
+    waiting for it. The thread starts once the caller's transaction commits, so it
+    reads the committed data; requests made inside a rolled back transaction are
+    dropped. Requests made during a run are covered by one more run.
+    """
+
+    def __init__(self, name, refresh):
+        self.name = name
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self._rerun = False
+
+    @property
+    def running(self):
+        return self._running
+
+    def request(self):
+        """Run the refresh in the background after the current transaction commits."""
+        transaction.on_commit(self._start)
+
+    def join(self, timeout=None):
+        """Wait for the current run (if any) to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _start(self):
+        with self._lock:
+            if self._running:
+                self._rerun = True
+                return
+            self._running = True
+            self._rerun = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                try:
+                    with scoring_stats.timer(self.name):
+                        self.refresh()
+                except Exception:
+                    scoring_stats.fallback(self.name)
+                with self._lock:
+                    if not self._rerun:
+                        self._running = False
+                        return
+                    self._rerun = False
+        finally:
+            # The thread's database connections are not reused by anything else
+            connections.close_all()
@@ -1,7 +1,12 @@
 import random
 from collections import Counter
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
 from .models import Society, Student, User
+from .major_affinity import major_affinity_store
+from .bounded_cache import BoundedCache
+from .society_profile_store import society_profile_store
 
 class ColdStartHandler:
     """
@@ -31,6 +36,11 @@ class ColdStartHandler:
         # Number of top societies to consider from each source
         self.num_societies_per_source = 5
         
+        # Rankings shared by every new user, recomputed once their time to live has passed
+        cache_ttl = getattr(settings, 'COLD_START_CACHE_TTL', 600)
+        self.category_leaders = BoundedCache('cold_start.category_leaders', maxsize=16, ttl=cache_ttl)
+        self.major_rankings = BoundedCache('cold_start.major_rankings', maxsize=1000, ttl=cache_ttl)
+        
     def get_initial_recommendations(self, student_id, limit=5):
         """
         Generate recommendations for a new user with no society memberships
@@ -46,6 +56,9 @@ class ColdStartHandler:
             
         Returns:
             List of recommended Society objects
+        
+        Every source is one query with its LIMIT in SQL, and the major and popularity
+        rankings are cached, so a new user costs a constant number of queries.
         """
         try:
             student = Student.objects.get(id=student_id)
@@ -58,25 +71,29 @@ class ColdStartHandler:
             candidates = []
             
             # Source 1: Major-based recommendations
-            major_recommendations = self._get_major_based_recommendations(student_major)
+            major_recommendations = self._get_major_based_recommendations(
+                student_major, self.num_societies_per_source
+            )
             candidates.extend([
                 {'society': society, 'source': 'major', 'score': 3.0}
-                for society in major_recommendations[:self.num_societies_per_source]
+                for society in major_recommendations
             ])
             
             # Source 2: Social-based recommendations (from followed users)
             if following:
-                social_recommendations = self._get_social_based_recommendations(following)
+                social_recommendations = self._get_social_based_recommendations(
+                    following, self.num_societies_per_source
+                )
                 candidates.extend([
                     {'society': society, 'source': 'social', 'score': 2.5}
-                    for society in social_recommendations[:self.num_societies_per_source]
+                    for society in social_recommendations
                 ])
             
             # Source 3: Popular but diverse societies
-            popular_diverse = self._get_diverse_popular_societies()
+            popular_diverse = self._get_diverse_popular_societies(self.num_societies_per_source)
             candidates.extend([
                 {'society': society, 'source': 'popular', 'score': 2.0}
-                for society in popular_diverse[:self.num_societies_per_source]
+                for society in popular_diverse
             ])
             
             # Remove any duplicates while preserving the highest score
@@ -97,35 +114,38 @@ class ColdStartHandler:
             # Return an empty list if student doesn't exist
             return []
             
-    def _get_major_based_recommendations(self, major):
+    def _get_major_based_recommendations(self, major, limit=None):
         """
-        Get societies that are popular among students with the same major.
+        Get societies that are popular among students with the same major, by
+        their precomputed affinity. Rankings are cached per major and limit.
         
         Args:
             major: Student's major field of study
+            limit: Maximum number of societies to return (all if None)
             
         Returns:
             List of Society objects
         """
         if not major:
             return []
+        
+        cached = self.major_rankings.get((major, limit))
+        if cached is not None:
+            return list(cached)
             
-        # Find societies that have members with the same major
-        societies = Society.objects.filter(
-            status="Approved",
-            society_members__major=major
-        ).annotate(
-            major_members=Count('society_members', filter=Q(society_members__major=major))
-        ).order_by('-major_members')
+        # Read from the precomputed affinities, falling back to similar majors
+        societies = major_affinity_store.societies_for_major(major, limit)
         
+        self.major_rankings.set((major, limit), societies)
         return list(societies)
         
-    def _get_social_based_recommendations(self, followed_users):
+    def _get_social_based_recommendations(self, followed_users, limit=None):
         """
         Get societies that are popular among users the student follows.
         
         Args:
-            followed_users: List of User objects the student follows
+            followed_users: User objects (or their IDs) the student follows
+            limit: Maximum number of societies to return (all if None)
             
         Returns:
             List of Society objects
@@ -134,7 +154,7 @@ class ColdStartHandler:
             return []
             
         # Extract user IDs
-        user_ids = [user.id for user in followed_users]
+        user_ids = [getattr(user, 'id', user) for user in followed_users]
         
         # Find societies that these users are members of
         societies = Society.objects.filter(
@@ -142,62 +162,48 @@ class ColdStartHandler:
             society_members__in=user_ids
         ).annotate(
             friend_count=Count('society_members', filter=Q(society_members__in=user_ids))
-        ).order_by('-friend_count')
+        ).order_by('-friend_count', 'id')
         
-        return list(societies)
+        return list(societies[:limit] if limit is not None else societies)
         
-    def _get_diverse_popular_societies(self):
+    def _get_diverse_popular_societies(self, limit=10):
         """
-        Get popular societies with a focus on category diversity.
+        Get popular societies with a focus on category diversity: the most popular
+        society of every category, then the second most popular of each.
+        One window query ranks the societies within their category by members
+        (ROW_NUMBER() OVER (PARTITION BY category)); the leaders are cached.
         
+        Args:
+            limit: Maximum number of societies to return
+            
         Returns:
             List of Society objects from different categories
         """
-        # Get total societies per category
-        categories = Society.objects.filter(
-            status="Approved"
-        ).values('category').annotate(
-            count=Count('id')
-        ).order_by()
+        cached = self.category_leaders.get(limit)
+        if cached is not None:
+            return list(cached)
         
-        # Find the most popular society from each category
-        diverse_societies = []
-        
-        for category_data in categories:
-            category = category_data['category']
-            if not category:
-                continue
-                
-            # Get the most popular society in this category
-            top_society = Society.objects.filter(
-                status="Approved",
-                category=category
+        member_count = F('stats__member_count').desc(nulls_last=True)
+        societies = list(
+            Society.objects.filter(
+                status="Approved"
+            ).exclude(
+                category__isnull=True
+            ).exclude(
+                category=''
             ).annotate(
-                member_count=Count('society_members')
-            ).order_by('-member_count').first()
-            
-            if top_society:
-                diverse_societies.append(top_society)
-                
-        # If we still need more, add second most popular from each category
-        if len(diverse_societies) < 10:
-            for category_data in categories:
-                category = category_data['category']
-                if not category:
-                    continue
-                    
-                # Get the second most popular society in this category
-                second_society = Society.objects.filter(
-                    status="Approved",
-                    category=category
-                ).annotate(
-                    member_count=Count('society_members')
-                ).order_by('-member_count')[1:2].first()
-                
-                if second_society:
-                    diverse_societies.append(second_society)
-                    
-        return diverse_societies
+                category_rank=Window(
+                    expression=RowNumber(),
+                    partition_by=[F('category')],
+                    order_by=[member_count, F('id').asc()]
+                )
+            ).filter(
+                category_rank__lte=2
+            ).order_by('category_rank', member_count, 'id')[:limit]
+        )
+        
+        self.category_leaders.set(limit, societies)
+        return list(societies)
         
     def _ensure_category_diversity(self, candidates, limit):
         """
@@ -302,7 +308,15 @@ class ColdStartHandler:
             "activism": "advocacy"
         }
         
-        category_desc = category_descriptions.get(society.category, society.category)
+        category_desc = category_descriptions.get(society.category)
+        if category_desc is None:
+            # Free-form categories: describe the society by its stored semantic profile instead
+            profile = getattr(society, 'semantic_profile', None)
+            domains = society_profile_store.categories(profile) if profile is not None else []
+            category_desc = next(
+                (category_descriptions[domain] for domain in domains if domain in category_descriptions),
+                society.category
+            )
         
         return {
             "type": "category",
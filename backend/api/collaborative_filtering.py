@@ -0,0 +1,272 @@
+import threading
+import time
+from collections import Counter, defaultdict
+import numpy as np
+from django.conf import settings
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from scipy.sparse import csr_matrix
+
+from .background_refresh import BackgroundRefresh
+from .models import Event, Society, Student
+
+# Every relation through which a student interacts with a society
+Memberships = Student.societies.through
+SocietyMembers = Society.society_members.through
+AttendedEvents = Student.attended_events.through
+EventAttendees = Event.current_attendees.through
+
+# Accessor of the students on the society/event side of each interaction relation
+STUDENT_ACCESSORS = {
+    Memberships: 'members',
+    SocietyMembers: 'society_members',
+    AttendedEvents: 'attendees',
+    EventAttendees: 'current_attendees',
+}
+
+
+class SocietyCoOccurrence:
+    """
+    Item-item collaborative filtering over the membership graph: "students who
+    joined X also joined Y". A student interacts with a society by being one of
+    its members (either membership relation) or by attending one of its events.
+    build() turns these interactions into a sparse student x society CSR matrix
+    whose product with itself gives every pair's co-occurrence count, and keeps
+    the k most co-occurring neighbors of each society, scored by cosine or
+    Jaccard similarity. Membership and attendance changes are applied to the
+    counts incrementally, so only the neighbor lists of the affected societies
+    are re-ranked. Lookups only read the built state; when it is missing or
+    max_age seconds old they start refresh() in a background thread of the
+    process, which picks up changes this process did not see (other processes,
+    rolled back transactions, bulk deletes).
+    """
+
+    def __init__(self, k=None, metric=None, max_age=None):
+        self.k = k if k is not None else getattr(settings, 'COLLABORATIVE_FILTERING_NEIGHBORS', 20)
+        self.metric = metric or getattr(settings, 'COLLABORATIVE_FILTERING_METRIC', 'cosine')
+        if self.metric not in ('cosine', 'jaccard'):
+            raise ValueError(f"Unknown co-occurrence metric: {self.metric}")
+        self.max_age = max_age if max_age is not None else getattr(
+            settings, 'COLLABORATIVE_FILTERING_MAX_AGE', 3600
+        )
+        self._lock = threading.RLock()
+        self.built_at = None
+        self.student_societies = {}
+        self.society_counts = Counter()
+        self.cooccurrence = defaultdict(Counter)
+        self.neighbors = {}
+        self._background_refresh = BackgroundRefresh('collaborative_filtering.refresh', self.refresh)
+
+    def interactions(self, student_ids=None):
+        """Distinct (student_id, society_id) interactions, optionally of some students only."""
+        querysets = [
+            Memberships.objects.values_list('student_id', 'society_id'),
+            SocietyMembers.objects.values_list('student_id', 'society_id'),
+            AttendedEvents.objects.filter(event__hosted_by__isnull=False)
+            .values_list('student_id', 'event__hosted_by_id'),
+            EventAttendees.objects.filter(event__hosted_by__isnull=False)
+            .values_list('student_id', 'event__hosted_by_id'),
+        ]
+        pairs = set()
+        for queryset in querysets:
+            if student_ids is not None:
+                queryset = queryset.filter(student_id__in=student_ids)
+            pairs.update(queryset)
+        return pairs
+
+    def interaction_matrix(self):
+        """The binary student x society CSR matrix, with the student and society ids of its rows and columns."""
+        pairs = self.interactions()
+        student_ids = sorted({student_id for student_id, _ in pairs})
+        society_ids = sorted({society_id for _, society_id in pairs})
+        student_index = {student_id: i for i, student_id in enumerate(student_ids)}
+        society_index = {society_id: j for j, society_id in enumerate(society_ids)}
+
+        matrix = csr_matrix(
+            (
+                np.ones(len(pairs), dtype=np.float32),
+                (
+                    [student_index[student_id] for student_id, _ in pairs],
+                    [society_index[society_id] for _, society_id in pairs],
+                )
+            ),
+            shape=(len(student_ids), len(society_ids))
+        )
+        return matrix, student_ids, society_ids
+
+    def build(self):
+        """Rebuild the co-occurrence counts and every neighbor list. Returns the number of societies."""
+        matrix, student_ids, society_ids = self.interaction_matrix()
+        # Co-occurrence counts of every society pair; the diagonal holds each society's interactions
+        counts = (matrix.T @ matrix).tocsr()
+
+        student_societies = {
+            student_id: {society_ids[j] for j in matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]}
+            for i, student_id in enumerate(student_ids)
+        }
+        cooccurrence = defaultdict(Counter)
+        society_counts = Counter()
+        for i, society_id in enumerate(society_ids):
+            columns = counts.indices[counts.indptr[i]:counts.indptr[i + 1]]
+            values = counts.data[counts.indptr[i]:counts.indptr[i + 1]]
+            for j, value in zip(columns, values):
+                if j == i:
+                    society_counts[society_id] = int(value)
+                else:
+                    cooccurrence[society_id][society_ids[j]] = int(value)
+
+        with self._lock:
+            self.student_societies = student_societies
+            self.society_counts = society_counts
+            self.cooccurrence = cooccurrence
+            self.neighbors = {}
+            for society_id in society_ids:
+                self._rank(society_id)
+            self.built_at = time.monotonic()
+        return len(society_ids)
+
+    def _similarity(self, counts, society_count, other_counts):
+        if self.metric == 'jaccard':
+            return counts / (society_count + other_counts - counts)
+        return counts / np.sqrt(society_count * other_counts)
+
+    def _rank(self, society_id):
+        """Recompute one society's top-k neighbor list from its co-occurrence counts."""
+        row = self.cooccurrence.get(society_id)
+        if not row:
+            self.neighbors.pop(society_id, None)
+            return
+        other_ids = np.array(list(row))
+        scores = self._similarity(
+            np.array(list(row.values()), dtype=float),
+            self.society_counts[society_id],
+            np.array([self.society_counts[other_id] for other_id in other_ids], dtype=float)
+        )
+        # Ties go to the lower id, so rebuilt and incrementally updated lists agree
+        order = np.lexsort((other_ids, -scores))[:self.k]
+        self.neighbors[society_id] = [(int(other_ids[i]), float(scores[i])) for i in order]
+
+    def needs_refresh(self):
+        return self.built_at is None or time.monotonic() - self.built_at > self.max_age
+
+    def refresh(self):
+        """
+        Build the state if it is missing, invalidated or max_age seconds old.
+        Run in the background on behalf of lookups, and by batch jobs. Returns True if it was rebuilt.
+        """
+        if self.needs_refresh():
+            self.build()
+            return True
+        return False
+
+    def _refresh_in_background(self):
+        if self.needs_refresh():
+            self._background_refresh.request()
+
+    def update_students(self, student_ids):
+        """
+        Apply the current interactions of the given students. Only pairs involving
+        a society a student joined or left change, and only those societies and
+        their co-occurring neighbors are re-ranked.
+        """
+        if self.built_at is None or not student_ids:
+            # Nothing to update yet: the next refresh() builds from the current data
+            return
+        current = defaultdict(set)
+        for student_id, society_id in self.interactions(student_ids):
+            current[student_id].add(society_id)
+
+        with self._lock:
+            affected = set()
+            for student_id in student_ids:
+                old = self.student_societies.get(student_id, set())
+                new = current.get(student_id, set())
+                changed = old ^ new
+                if not changed:
+                    continue
+                for society_id in changed:
+                    self.society_counts[society_id] += 1 if society_id in new else -1
+                    for other_id in (old | new) - {society_id}:
+                        delta = (
+                            (society_id in new and other_id in new)
+                            - (society_id in old and other_id in old)
+                        )
+                        if not delta:
+                            continue
+                        self._add_pair(society_id, other_id, delta)
+                        # Pairs of two changed societies are counted from both sides
+                        if other_id not in changed:
+                            self._add_pair(other_id, society_id, delta)
+                        affected.add(other_id)
+                    # The society's new count rescales its pair with every co-occurring society
+                    affected.add(society_id)
+                    affected.update(self.cooccurrence.get(society_id, ()))
+                if new:
+                    self.student_societies[student_id] = new
+                else:
+                    self.student_societies.pop(student_id, None)
+
+            for society_id in affected:
+                if self.society_counts.get(society_id, 0) <= 0:
+                    self.society_counts.pop(society_id, None)
+                self._rank(society_id)
+
+    def _add_pair(self, society_id, other_id, delta):
+        row = self.cooccurrence[society_id]
+        row[other_id] += delta
+        if row[other_id] <= 0:
+            del row[other_id]
+            if not row:
+                del self.cooccurrence[society_id]
+
+    def invalidate(self):
+        """Rebuild on the next refresh(), e.g. when the changed students are not known."""
+        self.built_at = None
+
+    def get_neighbors(self, society_id):
+        """The society's top-k (neighbor_id, score) pairs, most co-occurring first (none until built)."""
+        self._refresh_in_background()
+        with self._lock:
+            return list(self.neighbors.get(society_id, ()))
+
+    def scores_for(self, joined_ids):
+        """
+        Co-occurrence scores of the societies neighboring any of the joined ones,
+        summed over the joined societies: O(k) per joined society.
+        """
+        self._refresh_in_background()
+        joined_ids = set(joined_ids)
+        scores = Counter()
+        with self._lock:
+            for joined_id in joined_ids:
+                for neighbor_id, score in self.neighbors.get(joined_id, ()):
+                    if neighbor_id not in joined_ids:
+                        scores[neighbor_id] += score
+        return dict(scores)
+
+
+# Create a singleton instance for reuse
+society_cooccurrence = SocietyCoOccurrence()
+
+
+@receiver(m2m_changed, sender=Memberships)
+@receiver(m2m_changed, sender=SocietyMembers)
+@receiver(m2m_changed, sender=AttendedEvents)
+@receiver(m2m_changed, sender=EventAttendees)
+def update_society_cooccurrence(sender, instance, action, reverse, pk_set, **kwargs):
+    """Apply membership and attendance changes to the co-occurrence counts."""
+    if action == 'pre_clear' and not isinstance(instance, Student):
+        # The affected students are only known before they are cleared
+        instance._cleared_interaction_student_ids = list(
+            getattr(instance, STUDENT_ACCESSORS[sender]).values_list('id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Student):
+        society_cooccurrence.update_students([instance.pk])
+    elif action == 'post_clear':
+        society_cooccurrence.update_students(getattr(instance, '_cleared_interaction_student_ids', []))
+    elif pk_set:
+        society_cooccurrence.update_students(list(pk_set))
+
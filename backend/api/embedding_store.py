@@ -0,0 +1,364 @@
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+from django.conf import settings
+
+
+EMBEDDING_PRECISIONS = ('float32', 'float16', 'int8')
+
+
+def quantize_embedding(embedding, precision):
+    """
+    Convert a float embedding to the given storage precision.
+    int8 vectors are scaled per vector so the largest component maps to 127.
+    Returns (quantized_vector, scale); dequantize with quantized * scale.
+    """
+    embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    if precision == 'int8':
+        max_abs = float(np.abs(embedding).max()) if embedding.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        return np.clip(np.round(embedding / scale), -127, 127).astype(np.int8), scale
+    return embedding.astype(np.dtype(precision)), 1.0
+
+
+class SocietyEmbeddingStore:
+    """
+    Persistent store of sentence embeddings for society descriptions.
+    Vectors live in one contiguous file opened with np.memmap, so all
+    workers share the same pages instead of re-encoding after every restart.
+    A JSON index maps each society id to its row and the hash of the
+    description the vector was computed from.
+    Vectors are written as float32, float16 or per-vector scaled int8,
+    according to settings.NLP_EMBEDDING_PRECISION.
+    Writes hold an exclusive lock on a lock file next to the index, so writers
+    in different processes apply their changes one after the other.
+    """
+
+    def __init__(self, precision=None):
+        self.vectors_path = os.path.join(
+            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'society_embeddings.f32'
+        )
+        self.index_path = os.path.join(
+            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'society_embeddings_index.json'
+        )
+
+        self.precision = precision or getattr(settings, 'NLP_EMBEDDING_PRECISION', 'float32')
+        if self.precision not in EMBEDDING_PRECISIONS:
+            self.precision = 'float32'
+
+        self.vectors = None
+        self.dtype = np.dtype(np.float32)
+        self.norms = None
+        self.dimension = None
+        self.row_count = 0
+        self.entries = {}       # society_id -> {'row': int, 'hash': str, 'scale': float}
+        self.hash_entries = {}  # description hash -> entry
+        self._loaded_mtime = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def description_hash(text):
+        """Stable hash of a description, used to detect edits."""
+        return hashlib.sha1((text or '').encode('utf-8')).hexdigest()
+
+    def refresh(self):
+        """
+        (Re)open the store if the index changed since it was last loaded.
+        Returns True when vectors are available.
+        """
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            self._reset()
+            return False
+
+        if mtime == self._loaded_mtime:
+            return self.vectors is not None
+
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            dimension = int(index['dimension'])
+            row_count = int(index['rows'])
+            dtype = np.dtype(index.get('dtype', 'float32'))
+            entries = {
+                int(society_id): entry for society_id, entry in index['entries'].items()
+            }
+            vectors = None
+            if row_count:
+                vectors = np.memmap(
+                    self.vectors_path, dtype=dtype, mode='r', shape=(row_count, dimension)
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+            return False
+
+        self.vectors = vectors
+        self.dtype = dtype
+        self.norms = None
+        self.dimension = dimension
+        self.row_count = row_count
+        self.entries = entries
+        self.hash_entries = {entry['hash']: entry for entry in entries.values()}
+        self._loaded_mtime = mtime
+        return self.vectors is not None
+
+    def _reset(self):
+        self.vectors = None
+        self.dtype = np.dtype(np.float32)
+        self.norms = None
+        self.dimension = None
+        self.row_count = 0
+        self.entries = {}
+        self.hash_entries = {}
+        self._loaded_mtime = None
+
+    def _vector(self, entry):
+        """Dequantized float32 copy of a stored row."""
+        return np.asarray(self.vectors[entry['row']], dtype=np.float32) * entry.get('scale', 1.0)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the stored vectors (plus int8 scales)."""
+        if self.vectors is None:
+            return 0
+        scale_bytes = 4 * self.row_count if self.dtype == np.int8 else 0
+        return self.vectors.nbytes + scale_bytes
+
+    def get(self, society_id):
+        """Return the stored embedding of a society, or None."""
+        self.refresh()
+        entry = self.entries.get(society_id)
+        if entry is None or self.vectors is None:
+            return None
+        return self._vector(entry)
+
+    def get_by_text(self, text):
+        """Return the stored embedding for an exact description text, or None."""
+        if not text:
+            return None
+        self.refresh()
+        entry = self.hash_entries.get(self.description_hash(text))
+        if entry is None or self.vectors is None:
+            return None
+        return self._vector(entry)
+
+    def contains_texts(self, texts):
+        """True if every non-empty text has a stored vector."""
+        self.refresh()
+        if self.vectors is None:
+            return False
+        return all(
+            self.description_hash(text) in self.hash_entries for text in texts if text
+        )
+
+    def similarity_matrix(self, texts_a, texts_b):
+        """
+        Cosine similarity between the stored vectors of two lists of texts,
+        computed on the stored (possibly quantized) rows without dequantizing:
+        int8 rows are multiplied in int32 and the per-vector scales cancel out.
+        Empty texts give zero rows. Every non-empty text must be in the store.
+        """
+        self.refresh()
+        if self.norms is None:
+            self.norms = self._row_norms()
+
+        rows_a = self._rows_for_texts(texts_a)
+        rows_b = self._rows_for_texts(texts_b)
+        similarities = np.zeros((len(texts_a), len(texts_b)), dtype=np.float32)
+
+        present_a = [i for i, row in enumerate(rows_a) if row is not None]
+        present_b = [j for j, row in enumerate(rows_b) if row is not None]
+        if not present_a or not present_b:
+            return similarities
+
+        selected_a = [rows_a[i] for i in present_a]
+        selected_b = [rows_b[j] for j in present_b]
+        compute_dtype = np.int32 if self.dtype == np.int8 else np.float32
+        dots = (
+            np.asarray(self.vectors[selected_a], dtype=compute_dtype)
+            @ np.asarray(self.vectors[selected_b], dtype=compute_dtype).T
+        )
+
+        norms = np.outer(self.norms[selected_a], self.norms[selected_b])
+        norms[norms == 0] = 1.0
+        similarities[np.ix_(present_a, present_b)] = dots / norms
+        return similarities
+
+    def _rows_for_texts(self, texts):
+        rows = []
+        for text in texts:
+            entry = self.hash_entries.get(self.description_hash(text)) if text else None
+            rows.append(entry['row'] if entry is not None else None)
+        return rows
+
+    def _row_norms(self, chunk_size=4096):
+        """L2 norm of every stored row in its storage units, computed in chunks."""
+        norms = np.zeros(self.row_count, dtype=np.float32)
+        for start in range(0, self.row_count, chunk_size):
+            chunk = np.asarray(self.vectors[start:start + chunk_size], dtype=np.float32)
+            norms[start:start + chunk_size] = np.linalg.norm(chunk, axis=1)
+        return norms
+
+    def needs_update(self, society_id, description):
+        """True if the society has no vector or its description changed since it was encoded."""
+        self.refresh()
+        entry = self.entries.get(society_id)
+        return entry is None or entry['hash'] != self.description_hash(description)
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Serialize writers of this process and of every other process, and reload
+        the store inside the lock so a write never starts from a stale index.
+        """
+        with self._lock:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(self.index_path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._loaded_mtime = None
+                    self.refresh()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, society_id, description, embedding):
+        """
+        Store the embedding of one society description.
+        An existing row is overwritten in place; a new society is appended,
+        so the cost is one vector write rather than a rebuild.
+        """
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+
+        with self._write_lock():
+            if self.dimension is not None and self.dimension != embedding.shape[0]:
+                # Model changed dimension: start a fresh store
+                self._write_all({society_id: (description, embedding)})
+                return
+
+            if self.row_count and self.dtype != np.dtype(self.precision):
+                # Precision setting changed: rewrite every row in the new format
+                items = {
+                    stored_id: (None, self._vector(entry))
+                    for stored_id, entry in self.entries.items()
+                }
+                hashes = {stored_id: entry['hash'] for stored_id, entry in self.entries.items()}
+                items[society_id] = (description, embedding)
+                hashes.pop(society_id, None)
+                self._write_all(items, hashes)
+                return
+
+            quantized, scale = quantize_embedding(embedding, self.precision)
+            entry = self.entries.get(society_id)
+            if entry is not None:
+                vectors = np.memmap(
+                    self.vectors_path, dtype=self.dtype, mode='r+',
+                    shape=(self.row_count, self.dimension)
+                )
+                vectors[entry['row']] = quantized
+                vectors.flush()
+                del vectors
+                entry['hash'] = self.description_hash(description)
+                entry['scale'] = scale
+            else:
+                os.makedirs(os.path.dirname(self.vectors_path), exist_ok=True)
+                # Drop any bytes past the indexed rows (e.g. from an interrupted append)
+                with open(self.vectors_path, 'ab') as f:
+                    f.truncate(self.row_count * quantized.nbytes)
+                    f.write(quantized.tobytes())
+                self.entries[society_id] = {
+                    'row': self.row_count, 'hash': self.description_hash(description),
+                    'scale': scale
+                }
+                self.row_count += 1
+                self.dimension = embedding.shape[0]
+                self.dtype = quantized.dtype
+
+            self._write_index()
+
+    def remove(self, society_id):
+        """Forget a society. Its row stays in the file until the next rebuild."""
+        with self._write_lock():
+            if self.entries.pop(society_id, None) is not None:
+                self._write_index()
+
+    def rebuild(self, societies, encode):
+        """
+        Rewrite the store for the given (society_id, description) pairs.
+        Vectors whose description hash is unchanged are reused; the rest are
+        encoded with a single encode(list_of_texts) call.
+        Returns the number of stored societies.
+        """
+        societies = [(society_id, description) for society_id, description in societies if description]
+
+        with self._write_lock():
+            items = {}
+            missing = []
+            for society_id, description in societies:
+                entry = self.entries.get(society_id)
+                if (entry is not None and self.vectors is not None
+                        and entry['hash'] == self.description_hash(description)):
+                    items[society_id] = (description, self._vector(entry))
+                else:
+                    missing.append((society_id, description))
+
+            if missing:
+                encoded = encode([description for _, description in missing])
+                for (society_id, description), embedding in zip(missing, encoded):
+                    items[society_id] = (description, embedding)
+
+            self._write_all(items)
+            return len(items)
+
+    def _write_all(self, items, hashes=None):
+        """
+        Write a compact vectors file and index for {society_id: (description, embedding)}
+        in the configured precision. hashes optionally supplies precomputed description hashes.
+        """
+        os.makedirs(os.path.dirname(self.vectors_path), exist_ok=True)
+        hashes = hashes or {}
+
+        society_ids = list(items)
+        quantized = [
+            quantize_embedding(items[society_id][1], self.precision) for society_id in society_ids
+        ]
+        if quantized:
+            matrix = np.vstack([vector.reshape(1, -1) for vector, _ in quantized])
+        else:
+            matrix = np.zeros((0, self.dimension or 0), dtype=np.dtype(self.precision))
+
+        tmp_vectors_path = self.vectors_path + '.tmp'
+        matrix.tofile(tmp_vectors_path)
+        os.replace(tmp_vectors_path, self.vectors_path)
+
+        self.dtype = matrix.dtype
+        self.dimension = matrix.shape[1]
+        self.row_count = matrix.shape[0]
+        self.entries = {}
+        for row, (society_id, (_, scale)) in enumerate(zip(society_ids, quantized)):
+            description_hash = hashes.get(society_id) or self.description_hash(items[society_id][0])
+            self.entries[society_id] = {'row': row, 'hash': description_hash, 'scale': scale}
+        self._write_index()
+
+    def _write_index(self):
+        tmp_index_path = self.index_path + '.tmp'
+        with open(tmp_index_path, 'w') as f:
+            json.dump({
+                'dimension': self.dimension,
+                'rows': self.row_count,
+                'dtype': self.dtype.name,
+                'entries': {str(society_id): entry for society_id, entry in self.entries.items()},
+            }, f)
+        os.replace(tmp_index_path, self.index_path)
+
+        self._loaded_mtime = None
+        self.refresh()
+
+
+# Create a singleton instance for reuse
+society_embedding_store = SocietyEmbeddingStore()
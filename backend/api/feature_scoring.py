@@ -0,0 +1,106 @@
+from django.utils import timezone
+import numpy as np
+import datetime
+
+from .semantic_enhancer import semantic_enhancer
+
+FEATURES = (
+    'category_match',          # 1 if the candidate shares a category with a joined society
+    'matching_tags',           # Number of candidate tags found among the joined societies' tags
+    'description_similarity',  # NLP similarity of the description to the joined descriptions
+    'semantic_boost',          # Summed name/category boost against every joined society
+    'attended_category',       # 1 if the student attended an event hosted in this category
+    'co_membership',           # Summed co-occurrence score with the joined societies ("also joined")
+)
+
+# Weights of the original hand-written scoring, plus the collaborative filtering signal
+DEFAULT_FEATURE_WEIGHTS = {
+    'category_match': 3.0,
+    'matching_tags': 2.0,
+    'description_similarity': 1.5,
+    'semantic_boost': 3.0,
+    'attended_category': 2.0,
+    'co_membership': 2.0,
+}
+
+
+class FeatureScoringEngine:
+    """
+    Scores recommendation candidates as one weighted dot product over an
+    (n_candidates x n_features) feature matrix, multiplied elementwise by a
+    recency boost for societies with events in the last 30 days.
+    """
+
+    def __init__(self, weights=None, recency_boost=1.2):
+        self.weights = dict(DEFAULT_FEATURE_WEIGHTS)
+        self.weights.update(weights or {})
+        self.recency_boost = recency_boost
+
+    @property
+    def weight_vector(self):
+        return np.array([self.weights[feature] for feature in FEATURES])
+
+    def score(self, candidates, context, desc_similarities=None):
+        """
+        Scores of the candidates (an array aligned with them). context comes from
+        SocietyRecommender._scoring_context; desc_similarities are the candidates'
+        description similarities to the joined descriptions, if already computed.
+        """
+        if not candidates:
+            return np.zeros(0)
+        features = self.feature_matrix(candidates, context, desc_similarities)
+        return (features @ self.weight_vector) * self.recency_multipliers(candidates)
+
+    def feature_matrix(self, candidates, context, desc_similarities=None):
+        """Feature matrix of shape (len(candidates), len(FEATURES)), columns ordered as FEATURES."""
+        features = np.zeros((len(candidates), len(FEATURES)))
+        joined_categories = context['joined_categories']
+        joined_tags = context['joined_tags']
+        attended_categories = context['attended_event_categories']
+
+        features[:, 0] = [society.category in joined_categories for society in candidates]
+        features[:, 1] = [
+            sum(1 for tag in (society.tags or []) if tag in joined_tags) for society in candidates
+        ]
+        features[:, 4] = [society.category in attended_categories for society in candidates]
+        co_membership_scores = context.get('co_membership_scores', {})
+        features[:, 5] = [
+            co_membership_scores.get(getattr(society, 'id', None), 0.0) for society in candidates
+        ]
+
+        # Description-based features only apply to described candidates, against described joined societies
+        described = np.array([
+            bool(getattr(society, 'description', None)) for society in candidates
+        ])
+        if context['joined_descriptions'] and described.any():
+            if desc_similarities is not None:
+                features[:, 2] = np.where(described, np.asarray(desc_similarities, dtype=float), 0.0)
+
+            if context['identical_descriptions'] and context['semantic_texts']:
+                rows = np.flatnonzero(described)
+                boosts = semantic_enhancer.calculate_semantic_boost_matrix(
+                    [
+                        candidates[i].name + " " + (candidates[i].category or "")
+                        for i in rows
+                    ],
+                    context['semantic_texts']
+                )
+                features[rows, 3] = np.asarray(boosts, dtype=float).sum(axis=1)
+
+        return features
+
+    def recency_multipliers(self, candidates):
+        """
+        recency_boost for candidates with events in the last 30 days, else 1.
+        Uses the recent_event_count annotation when present, else queries.
+        """
+        recent_counts = []
+        thirty_days_ago = None
+        for society in candidates:
+            count = getattr(society, 'recent_event_count', None)
+            if count is None:
+                if thirty_days_ago is None:
+                    thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
+                count = society.events.filter(date__gte=thirty_days_ago).count()
+            recent_counts.append(count)
+        return np.where(np.array(recent_counts) > 0, self.recency_boost, 1.0)
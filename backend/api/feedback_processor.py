@@ -5,6 +5,7 @@ from django.db.models import Avg, F, Max
 from django.utils import timezone
 from django.conf import settings
 from .models import Society
+from .recommendation_cache import recommendation_cache
 
 class FeedbackProcessor:
     """
@@ -92,6 +93,8 @@ class FeedbackProcessor:
         self._preference_adjustments = {}
         self._cache_last_updated = None
         
+        recommendation_cache.invalidate_student(student_id)
+        
         return True
     
     def get_preference_adjustments(self, student_id):
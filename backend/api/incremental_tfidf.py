@@ -0,0 +1,229 @@
+import hashlib
+import numpy as np
+from collections import Counter
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+
+class IncrementalTfidfModel:
+    """
+    TF-IDF (or plain term count) model that can absorb documents one at a time.
+    Keeps running document frequencies over a vocabulary that new terms are appended
+    to, so adding, editing or removing one document costs O(tokens of that document).
+    IDF weights are only recomputed lazily on the next transform after a change.
+    With max_features, the vocabulary is pruned to the max_features terms found in the
+    most documents whenever it grows past twice that size, so it stays bounded (a pruned
+    term that comes back starts counting its documents again).
+    Exposes the parts of the scikit-learn vectorizer interface used by the analyzer
+    (fit, transform, vocabulary_, get_feature_names_out); tokenization is
+    scikit-learn's, so a full fit gives the same terms as TfidfVectorizer/CountVectorizer
+    with the same options (max_features ranks terms by document rather than term frequency).
+    """
+
+    # Models pickled before the vocabulary was capped have no max_features of their own
+    max_features = None
+
+    def __init__(self, stop_words='english', ngram_range=(1, 1), max_df=1.0,
+                 use_idf=True, norm='l2', max_features=None):
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self.max_df = max_df
+        self.use_idf = use_idf
+        self.norm = norm
+        self.max_features = max_features
+        self._reset()
+
+    def _reset(self, vocabulary=None):
+        self._vocabulary = dict(vocabulary or {})
+        self._terms = sorted(self._vocabulary, key=self._vocabulary.get)
+        self._document_frequency = [0] * len(self._terms)
+        self._documents = {}  # document key -> term ids present in the document
+        self._signatures = {}  # document key -> digest of all its terms, including pruned ones
+        self._fitted = vocabulary is not None
+        self._weights = None
+        self._feature_rank = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_analyzer', None)  # Rebuilt on demand; holds unpicklable closures
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('_signatures', {})
+        self.__dict__.update(state)
+
+    @staticmethod
+    def _signature(terms):
+        return hashlib.sha1('\n'.join(sorted(terms)).encode('utf-8')).digest()
+
+    @property
+    def analyzer(self):
+        if getattr(self, '_analyzer', None) is None:
+            self._analyzer = CountVectorizer(
+                stop_words=self.stop_words, ngram_range=self.ngram_range
+            ).build_analyzer()
+        return self._analyzer
+
+    @property
+    def vocabulary_(self):
+        """Term -> column mapping; raises AttributeError until the model has been fitted."""
+        if not self._fitted:
+            raise AttributeError('vocabulary_')
+        return self._vocabulary
+
+    @vocabulary_.setter
+    def vocabulary_(self, vocabulary):
+        self._reset(vocabulary)
+
+    @vocabulary_.deleter
+    def vocabulary_(self):
+        self._reset()
+
+    @property
+    def document_count(self):
+        return len(self._documents)
+
+    def get_feature_names_out(self):
+        return np.array(self._terms, dtype=object)
+
+    @property
+    def feature_rank_(self):
+        """Alphabetical rank of each column, matching scikit-learn's sorted vocabulary order."""
+        if self._feature_rank is None or len(self._feature_rank) != len(self._terms):
+            order = np.argsort(np.array(self._terms, dtype=object), kind='stable')
+            self._feature_rank = np.empty(len(self._terms), dtype=int)
+            self._feature_rank[order] = np.arange(len(self._terms))
+        return self._feature_rank
+
+    def fit(self, texts, keys=None):
+        """Rebuild the model from scratch on a list of texts, keyed by position unless keys are given."""
+        self._reset()
+        self._fitted = True
+        # Prune once at the end, so no term loses its count to an intermediate prune
+        max_features, self.max_features = self.max_features, None
+        try:
+            for key, text in zip(keys if keys is not None else range(len(texts)), texts):
+                self.add_document(key, text)
+        finally:
+            self.max_features = max_features
+        if self.max_features:
+            self.prune()
+        return self
+
+    def add_document(self, key, text):
+        """
+        Add a document, replacing any previous document with the same key.
+        Returns False if the key already holds a document with the same terms.
+        """
+        terms = set(self.analyzer(text or ''))
+        signature = self._signature(terms)
+        if key in self._documents:
+            if self._signatures.get(key) == signature:
+                return False
+            self.remove_document(key)
+
+        term_ids = set()
+        for term in terms:
+            term_id = self._vocabulary.get(term)
+            if term_id is None:
+                term_id = len(self._terms)
+                self._vocabulary[term] = term_id
+                self._terms.append(term)
+                self._document_frequency.append(0)
+            self._document_frequency[term_id] += 1
+            term_ids.add(term_id)
+
+        self._documents[key] = term_ids
+        self._signatures[key] = signature
+        self._fitted = True
+        self._weights = None
+        if self.max_features and len(self._terms) > 2 * self.max_features:
+            self.prune()
+        return True
+
+    def remove_document(self, key):
+        """Remove a document; its terms stay in the vocabulary with reduced frequency."""
+        term_ids = self._documents.pop(key, None)
+        if term_ids is None:
+            return False
+        self._signatures.pop(key, None)
+        for term_id in term_ids:
+            self._document_frequency[term_id] -= 1
+        self._weights = None
+        return True
+
+    def prune(self, max_features=None):
+        """
+        Drop the terms no current document contains and, beyond max_features (default:
+        the model's), the terms found in the fewest documents (ties keep the
+        alphabetically first). Remaining columns keep their relative order.
+        Returns the number of terms removed.
+        """
+        max_features = max_features or self.max_features
+        kept = [term_id for term_id, df in enumerate(self._document_frequency) if df > 0]
+        if max_features and len(kept) > max_features:
+            kept = sorted(kept, key=lambda term_id: (-self._document_frequency[term_id], self._terms[term_id]))
+            kept = sorted(kept[:max_features])
+        removed = len(self._terms) - len(kept)
+        if not removed:
+            return 0
+
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(kept)}
+        self._terms = [self._terms[old_id] for old_id in kept]
+        self._vocabulary = {term: term_id for term_id, term in enumerate(self._terms)}
+        self._document_frequency = [self._document_frequency[old_id] for old_id in kept]
+        self._documents = {
+            key: {new_ids[term_id] for term_id in term_ids if term_id in new_ids}
+            for key, term_ids in self._documents.items()
+        }
+        self._weights = None
+        self._feature_rank = None
+        return removed
+
+    def _term_weights(self):
+        """
+        Per-column weights: smoothed IDF (as in scikit-learn) when use_idf is set, else 1.
+        Terms that no current document contains, or that exceed max_df, get weight 0.
+        """
+        if self._weights is None or len(self._weights) != len(self._terms):
+            df = np.asarray(self._document_frequency, dtype=np.float64)
+            n_documents = len(self._documents)
+            if self.use_idf:
+                weights = np.log((1.0 + n_documents) / (1.0 + df)) + 1.0
+            else:
+                weights = np.ones(len(df))
+            weights[df <= 0] = 0.0
+            if self.max_df < 1.0:
+                weights[df > self.max_df * n_documents] = 0.0
+            self._weights = weights
+        return self._weights
+
+    def transform(self, texts):
+        """Sparse document-term matrix of the texts, weighted and normalized like the fitted vectorizer."""
+        if not self._fitted:
+            raise ValueError('IncrementalTfidfModel is not fitted')
+
+        weights = self._term_weights()
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = Counter(
+                self._vocabulary[term] for term in self.analyzer(text or '')
+                if term in self._vocabulary
+            )
+            for term_id, count in counts.items():
+                if weights[term_id] > 0:
+                    indices.append(term_id)
+                    data.append(count * weights[term_id])
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), indices, indptr),
+            shape=(len(texts), len(self._terms))
+        )
+        matrix.sort_indices()
+
+        if self.norm == 'l2':
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1.0
+            matrix = sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+        return matrix
@@ -0,0 +1,193 @@
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from scipy.sparse import csr_matrix
+
+from .models import MajorSimilarity, MajorSocietyAffinity, Society, Student
+
+Membership = Society.society_members.through
+
+
+class MajorAffinityStore:
+    """
+    Maintains the MajorSocietyAffinity and MajorSimilarity rows. rebuild()
+    recomputes every affinity with one aggregate query and derives the major
+    similarity matrix from them; membership changes refresh only the affected
+    (major, society) pairs. The rebuild also picks up students who were created
+    or changed major since.
+    """
+
+    def __init__(self, smoothing=None, neighbors=None):
+        self.smoothing = smoothing if smoothing is not None else getattr(
+            settings, 'MAJOR_AFFINITY_SMOOTHING', 5
+        )
+        self.neighbors = neighbors if neighbors is not None else getattr(
+            settings, 'MAJOR_SIMILARITY_NEIGHBORS', 5
+        )
+
+    def _affinity_rows(self, majors=None, society_ids=None):
+        """(major, society_id, members, students of the major) of every pair with members, in one query."""
+        memberships = Membership.objects.exclude(student__major='')
+        if majors is not None:
+            memberships = memberships.filter(student__major__in=majors)
+        if society_ids is not None:
+            memberships = memberships.filter(society_id__in=society_ids)
+        major_size = Student.objects.filter(
+            major=OuterRef('student__major')
+        ).order_by().values('major').annotate(count=Count('pk')).values('count')
+        return memberships.values_list('student__major', 'society_id').annotate(
+            members=Count('pk'),
+            major_size=Coalesce(Subquery(major_size), 0)
+        ).order_by()
+
+    def refresh(self, majors=None, society_ids=None):
+        """
+        Recompute the affinities of the given majors and societies (default: all),
+        replacing their rows. Returns the number of rows written.
+        """
+        if majors is not None:
+            majors = [major for major in set(majors) if major]
+            if not majors:
+                return 0
+        if society_ids is not None:
+            society_ids = [society_id for society_id in set(society_ids) if society_id is not None]
+            if not society_ids:
+                return 0
+
+        rows = [
+            MajorSocietyAffinity(
+                major=major,
+                society_id=society_id,
+                member_count=members,
+                score=members / (max(major_size, members) + self.smoothing)
+            )
+            for major, society_id, members, major_size in self._affinity_rows(majors, society_ids)
+        ]
+        stale = MajorSocietyAffinity.objects.all()
+        if majors is not None:
+            stale = stale.filter(major__in=majors)
+        if society_ids is not None:
+            stale = stale.filter(society_id__in=society_ids)
+        with transaction.atomic():
+            stale.delete()
+            MajorSocietyAffinity.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    def rebuild(self):
+        """Recompute every affinity and the major similarity matrix. Returns the number of affinities."""
+        with transaction.atomic():
+            written = self.refresh()
+            self.rebuild_similarities()
+        return written
+
+    def rebuild_similarities(self):
+        """
+        Keep each major's most similar majors: the cosine similarity of their
+        member counts per society. Returns the number of rows written.
+        """
+        pairs = list(MajorSocietyAffinity.objects.values_list('major', 'society_id', 'member_count'))
+        majors = sorted({major for major, _, _ in pairs})
+        society_ids = sorted({society_id for _, society_id, _ in pairs})
+        major_index = {major: i for i, major in enumerate(majors)}
+        society_index = {society_id: j for j, society_id in enumerate(society_ids)}
+
+        rows = []
+        if majors:
+            matrix = csr_matrix(
+                (
+                    np.array([count for _, _, count in pairs], dtype=float),
+                    (
+                        [major_index[major] for major, _, _ in pairs],
+                        [society_index[society_id] for _, society_id, _ in pairs],
+                    )
+                ),
+                shape=(len(majors), len(society_ids))
+            )
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            similarities = (matrix @ matrix.T).toarray() / np.outer(norms, norms)
+            np.fill_diagonal(similarities, 0.0)
+            for i, major in enumerate(majors):
+                # Most similar first, ties to the alphabetically first major
+                for j in np.lexsort((np.arange(len(majors)), -similarities[i]))[:self.neighbors]:
+                    if similarities[i, j] <= 0:
+                        break
+                    rows.append(MajorSimilarity(
+                        major=major, similar_major=majors[j], score=float(similarities[i, j])
+                    ))
+
+        with transaction.atomic():
+            MajorSimilarity.objects.all().delete()
+            MajorSimilarity.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    def societies_for_major(self, major, limit=None):
+        """
+        Approved societies with the highest affinity for the major. When the major
+        has fewer than limit of its own, societies favoured by its similar majors
+        follow, scored by similarity x affinity. Two queries at most.
+        """
+        if not major:
+            return []
+        affinities = MajorSocietyAffinity.objects.filter(
+            major=major, society__status='Approved'
+        ).select_related('society').order_by('-score', 'society_id')
+        societies = [affinity.society for affinity in (affinities[:limit] if limit is not None else affinities)]
+        if limit is not None and len(societies) >= limit:
+            return societies
+
+        similarity = MajorSimilarity.objects.filter(
+            major=major, similar_major=OuterRef('major')
+        ).order_by().values('score')
+        fallbacks = MajorSocietyAffinity.objects.filter(
+            major__in=MajorSimilarity.objects.filter(major=major).values('similar_major'),
+            society__status='Approved'
+        ).exclude(
+            society_id__in=[society.id for society in societies]
+        ).annotate(
+            weighted_score=F('score') * Subquery(similarity)
+        ).select_related('society').order_by('-weighted_score', 'society_id')
+        if limit is not None:
+            # Each society appears at most once per similar major
+            fallbacks = fallbacks[:(limit - len(societies)) * self.neighbors]
+
+        seen = {society.id for society in societies}
+        for affinity in fallbacks:
+            if limit is not None and len(societies) >= limit:
+                break
+            if affinity.society_id not in seen:
+                seen.add(affinity.society_id)
+                societies.append(affinity.society)
+        return societies
+
+
+# Create a singleton instance for reuse
+major_affinity_store = MajorAffinityStore()
+
+
+@receiver(m2m_changed, sender=Membership)
+def update_major_affinity(sender, instance, action, reverse, pk_set, **kwargs):
+    """Refresh the (major, society) pairs of students who joined or left."""
+    if action == 'pre_clear':
+        # The affected pairs are only known before they are cleared
+        if isinstance(instance, Society):
+            instance._cleared_member_majors = list(
+                instance.society_members.values_list('major', flat=True).distinct()
+            )
+        else:
+            instance._cleared_society_ids = list(instance.societies_belongs_to.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Society):
+        if action == 'post_clear':
+            majors = getattr(instance, '_cleared_member_majors', [])
+        else:
+            majors = Student.objects.filter(id__in=pk_set or ()).values_list('major', flat=True).distinct()
+        major_affinity_store.refresh(majors=list(majors), society_ids=[instance.pk])
+    else:
+        society_ids = getattr(instance, '_cleared_society_ids', []) if action == 'post_clear' else pk_set
+        major_affinity_store.refresh(majors=[instance.major], society_ids=list(society_ids or ()))
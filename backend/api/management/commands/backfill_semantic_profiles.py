@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from api.models import Society
+from api.society_profile_store import society_profile_store
+
+class Command(BaseCommand):
+    help = 'Compute the stored semantic profile of every approved society'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Recompute every profile, not only missing or outdated ones'
+        )
+
+    def handle(self, *args, **options):
+        societies = Society.objects.filter(status="Approved").only('id', 'description')
+
+        updated = 0
+        for society in societies.iterator():
+            if society_profile_store.update(society, force=options['force']):
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Updated {updated} of {societies.count()} society semantic profiles'
+        ))
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import numpy as np
+from django.core.management.base import BaseCommand
+from api.embedding_store import SocietyEmbeddingStore
+from api.models import Society, Student
+from api.nlp_similarity import text_similarity_analyzer
+from api.recommendation_service import SocietyRecommender
+from api.similarity_cache import society_similarity_cache
+from api.society_similarity_matrix import society_similarity_matrix
+
+class Command(BaseCommand):
+    help = 'Compare quantized society embedding storage (int8/float16) against full precision'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--precision',
+            type=str,
+            default='all',
+            help='Precision to evaluate: int8, float16 or all'
+        )
+        parser.add_argument(
+            '--societies',
+            type=int,
+            default=200,
+            help='Number of societies compared pairwise for the similarity drift'
+        )
+        parser.add_argument(
+            '--students',
+            type=int,
+            default=50,
+            help='Number of students used for the recommendation overlap'
+        )
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=5,
+            help='Number of recommendations to generate per student'
+        )
+
+    def handle(self, *args, **options):
+        precisions = ['int8', 'float16'] if options['precision'] == 'all' else [options['precision']]
+
+        if text_similarity_analyzer.sentence_model is None:
+            self.stdout.write(self.style.WARNING('Sentence embeddings are unavailable; nothing to evaluate'))
+            return
+
+        societies = list(
+            Society.objects.filter(status="Approved").exclude(description='').values_list('id', 'description')
+        )
+        if not societies:
+            self.stdout.write(self.style.WARNING('No approved societies with descriptions to evaluate'))
+            return
+
+        # Encode once so every precision is quantized from the same full-precision vectors
+        descriptions = [description for _, description in societies]
+        encoded = text_similarity_analyzer.sentence_model.encode(descriptions, convert_to_numpy=True)
+        vectors = dict(zip(descriptions, encoded))
+
+        sample_descriptions = descriptions[:options['societies']]
+        student_ids = list(
+            Student.objects.filter(societies__isnull=False).distinct()
+            .values_list('id', flat=True)[:options['students']]
+        )
+
+        original_store = text_similarity_analyzer.embedding_store
+        original_pointer_path = society_similarity_matrix.pointer_path
+        original_alias = society_similarity_cache.alias
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # The stored matrix and cached pairs were scored from the live embeddings;
+                # point the matrix at a missing version and keep pairs out of the shared cache
+                society_similarity_matrix.pointer_path = os.path.join(tmp_dir, 'society_similarity.json')
+                society_similarity_cache.alias = ''
+                baseline = self._build_store(tmp_dir, 'float32', societies, vectors)
+                baseline_scores, baseline_recommendations = self._evaluate(
+                    baseline, sample_descriptions, student_ids, options['k']
+                )
+                self.stdout.write(
+                    f"float32: {baseline.nbytes} bytes for {baseline.row_count} society embeddings"
+                )
+
+                for precision in precisions:
+                    store = self._build_store(tmp_dir, precision, societies, vectors)
+                    scores, recommendations = self._evaluate(
+                        store, sample_descriptions, student_ids, options['k']
+                    )
+                    self._print_results(
+                        precision, baseline, store, baseline_scores, scores,
+                        baseline_recommendations, recommendations
+                    )
+        finally:
+            text_similarity_analyzer.embedding_store = original_store
+            society_similarity_matrix.pointer_path = original_pointer_path
+            society_similarity_matrix.refresh()
+            society_similarity_cache.alias = original_alias
+            society_similarity_cache.clear_local()
+            society_similarity_cache.version = None
+
+    def _build_store(self, tmp_dir, precision, societies, vectors):
+        """Write a throwaway store holding the given vectors in one precision."""
+        store = SocietyEmbeddingStore(precision=precision)
+        store.vectors_path = os.path.join(tmp_dir, f'society_embeddings_{precision}.bin')
+        store.index_path = os.path.join(tmp_dir, f'society_embeddings_{precision}.json')
+        store.rebuild(societies, lambda texts: [vectors[text] for text in texts])
+        return store
+
+    def _evaluate(self, store, descriptions, student_ids, k):
+        """Pairwise similarity scores (0-5) and recommendation ids using the given store."""
+        text_similarity_analyzer.embedding_store = store
+        # Pairs cached while scoring another precision would hide this store's drift
+        society_similarity_cache.clear_local()
+        society_similarity_matrix.refresh()
+        scores = text_similarity_analyzer.calculate_similarity_matrix(descriptions, descriptions)
+
+        recommender = SocietyRecommender()
+        recommendations = {
+            student_id: [
+                society.id for society in
+                recommender.get_recommendations_for_student(student_id, limit=k)
+            ]
+            for student_id in student_ids
+        }
+        return np.asarray(scores), recommendations
+
+    def _print_results(self, precision, baseline, store, baseline_scores, scores,
+                       baseline_recommendations, recommendations):
+        """Print memory saved, similarity drift and recommendation overlap for one precision."""
+        saved = baseline.nbytes - store.nbytes
+        saved_percent = 100.0 * saved / baseline.nbytes if baseline.nbytes else 0.0
+
+        self.stdout.write(f"\n=== {precision} ===")
+        self.stdout.write(f"  Memory: {store.nbytes} bytes (saved {saved} bytes, {saved_percent:.1f}%)")
+
+        if scores.size:
+            drift = np.abs(scores - baseline_scores)
+            self.stdout.write(f"  Similarity drift (0-5 scale): mean {drift.mean():.4f}, max {drift.max():.4f}")
+
+        overlaps = [
+            len(set(recommendations[student_id]) & set(baseline_ids)) / len(baseline_ids)
+            for student_id, baseline_ids in baseline_recommendations.items()
+            if baseline_ids
+        ]
+        if overlaps:
+            self.stdout.write(
+                f"  Recommendation overlap: {np.mean(overlaps):.4f} over {len(overlaps)} students"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Finished evaluating {precision} embeddings"))
@@ -1,6 +1,8 @@
 # backend/api/management/commands/initialize_nlp_model.py
 from django.core.management.base import BaseCommand
+from api.nlp_similarity import text_similarity_analyzer
 from api.recommendation_service import SocietyRecommender
+from api.society_similarity_matrix import society_similarity_matrix
 
 class Command(BaseCommand):
     help = 'Initialize the NLP text similarity model with existing society descriptions'
@@ -18,4 +20,12 @@ class Command(BaseCommand):
             self.style.SUCCESS(
                 f'Successfully initialized NLP model with {description_count} society descriptions'
             )
-        )
\ No newline at end of file
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Stored similarity matrix for {len(society_similarity_matrix.row_index)} approved societies'
+            )
+        )
+        
+        for component, seconds in text_similarity_analyzer.load_timings.items():
+            self.stdout.write(f'  Loaded {component} in {seconds:.3f}s')
\ No newline at end of file
@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from api.recommendation_materializer import RecommendationMaterializer
+
+class Command(BaseCommand):
+    help = 'Precompute the top recommendations of every active student'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=20,
+            help='Number of recommendations to store per student'
+        )
+        parser.add_argument(
+            '--diversity',
+            type=str,
+            default='balanced',
+            help='Diversity level to materialize: low, balanced or high'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Number of worker processes scoring students in parallel'
+        )
+
+    def handle(self, *args, **options):
+        materializer = RecommendationMaterializer(count=options['count'])
+
+        start = time.perf_counter()
+        materialized = materializer.materialize(
+            diversity_level=options['diversity'], processes=options['processes']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized recommendations of {materialized} students '
+            f'in {time.perf_counter() - start:.1f}s'
+        ))
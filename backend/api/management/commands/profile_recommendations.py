@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from api.models import Student
+from api.recommendation_service import SocietyRecommender
+from api.scoring_stats import scoring_stats
+
+class Command(BaseCommand):
+    help = 'Replay recommendation requests and report where scoring time is spent'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Number of recommendation requests to replay'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=5,
+            help='Number of recommendations per request'
+        )
+        parser.add_argument(
+            '--diversity',
+            type=str,
+            default='balanced',
+            help='Diversity level of the requests: low, balanced or high'
+        )
+
+    def handle(self, *args, **options):
+        student_ids = list(
+            Student.objects.filter(societies__isnull=False).distinct().values_list('id', flat=True)
+        )
+        if not student_ids:
+            self.stdout.write(self.style.WARNING('No students with societies to profile'))
+            return
+
+        recommender = SocietyRecommender()
+        scoring_stats.reset()
+
+        for i in range(options['requests']):
+            recommender.get_recommendations_for_student(
+                student_ids[i % len(student_ids)],
+                limit=options['limit'],
+                diversity_level=options['diversity']
+            )
+
+        stats = scoring_stats.snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Profiled {options['requests']} requests over {len(student_ids)} students"
+        ))
+
+        self.stdout.write('\nComponent timings (ms):')
+        self.stdout.write(
+            f"  {'component':<42} {'calls':>7} {'total':>10} {'mean':>8} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8}"
+        )
+        components = sorted(
+            stats['components'].items(), key=lambda item: item[1]['total_ms'], reverse=True
+        )
+        for name, timing in components:
+            self.stdout.write(
+                f"  {name:<42} {timing['calls']:>7} {timing['total_ms']:>10.1f} "
+                f"{timing['mean_ms']:>8.2f} {timing['p50_ms']:>8.2f} "
+                f"{timing['p95_ms']:>8.2f} {timing['p99_ms']:>8.2f}"
+            )
+
+        if stats['caches']:
+            self.stdout.write('\nCache hit rates:')
+            for name, cache in sorted(stats['caches'].items()):
+                self.stdout.write(
+                    f"  {name:<42} {cache['hit_rate']:>6.1%} "
+                    f"({cache['hits']} hits, {cache['misses']} misses)"
+                )
+
+        if stats['fallbacks']:
+            self.stdout.write('\nFallbacks:')
+            for name, count in sorted(stats['fallbacks'].items()):
+                self.stdout.write(f"  {name:<42} {count}")
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.major_affinity import major_affinity_store
+
+class Command(BaseCommand):
+    help = 'Rebuild the major to society affinities and the major similarity matrix'
+
+    def handle(self, *args, **options):
+        affinities = major_affinity_store.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {affinities} major to society affinities'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.society_stats import society_stats_store
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized popularity statistics of every society'
+
+    def handle(self, *args, **options):
+        reconciled = society_stats_store.reconcile()
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled the stats of {reconciled} societies'))
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.nlp_similarity import text_similarity_analyzer
+from api.nlp_worker import NLPScoringServer
+
+class Command(BaseCommand):
+    help = 'Run the shared NLP scoring worker that web workers reach over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            type=str,
+            default=getattr(settings, 'NLP_WORKER_SOCKET', '') or '/tmp/nlp_worker.sock',
+            help='Path of the Unix socket to listen on'
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+
+        # This process does the scoring itself
+        text_similarity_analyzer.worker_client = None
+
+        self.stdout.write('Loading NLP models...')
+        for component, seconds in text_similarity_analyzer.warm_up().items():
+            self.stdout.write(f'  Loaded {component} in {seconds:.3f}s')
+
+        server = NLPScoringServer(
+            socket_path,
+            text_similarity_analyzer,
+            save_interval=getattr(settings, 'NLP_TEXT_MODEL_SAVE_INTERVAL', 300)
+        )
+        self.stdout.write(self.style.SUCCESS(f'NLP scoring worker listening on {socket_path}'))
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write('NLP scoring worker stopped')
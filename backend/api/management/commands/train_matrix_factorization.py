@@ -0,0 +1,65 @@
+import time
+from django.core.management.base import BaseCommand
+from api.matrix_factorization import ImplicitALSTrainer, factor_model
+
+class Command(BaseCommand):
+    help = 'Train the implicit-feedback matrix factorization model into versioned factor arrays'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factors',
+            type=int,
+            default=None,
+            help='Number of latent factors (default: MATRIX_FACTORIZATION_FACTORS)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=15,
+            help='Number of alternating least squares iterations'
+        )
+        parser.add_argument(
+            '--regularization',
+            type=float,
+            default=0.1,
+            help='L2 regularization of the factors'
+        )
+        parser.add_argument(
+            '--alpha',
+            type=float,
+            default=5.0,
+            help='Confidence gained per unit of preference'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=None,
+            help='Number of solver threads (default: MATRIX_FACTORIZATION_THREADS, or one per CPU)'
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=3,
+            help='Number of model versions to keep'
+        )
+
+    def handle(self, *args, **options):
+        trainer = ImplicitALSTrainer(
+            factors=options['factors'],
+            regularization=options['regularization'],
+            alpha=options['alpha'],
+            iterations=options['iterations'],
+            threads=options['threads']
+        )
+
+        start = time.perf_counter()
+        student_ids, student_factors, society_ids, society_factors = trainer.train()
+        version = factor_model.save(
+            student_ids, student_factors, society_ids, society_factors,
+            params=trainer.params(), keep=options['keep']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Trained factors of {len(student_ids)} students and {len(society_ids)} societies '
+            f'(version {version}) in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,332 @@
+import glob
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from scipy.sparse import csr_matrix
+
+from .collaborative_filtering import AttendedEvents, EventAttendees, Memberships, SocietyMembers
+from .feedback_processor import feedback_processor
+from .models import RecommendationFeedback
+
+# Preference each interaction adds to a student-society pair; feedback events use
+# the feedback processor's weights
+MEMBERSHIP_WEIGHT = 3.0
+ATTENDANCE_WEIGHT = 1.0
+IMPLICIT_FEEDBACK_TYPES = ('click', 'view_details', 'join')
+
+
+class ImplicitALSTrainer:
+    """
+    Offline implicit-feedback matrix factorization (alternating least squares,
+    Hu, Koren & Volinsky). Memberships, event RSVPs, recommendation ratings and
+    recorded click/join events are summed into a sparse student x society
+    preference matrix; each pair's confidence is 1 + alpha x preference.
+    Every half-iteration solves the factors of one side with the other fixed,
+    with a few conjugate gradient steps warm-started from the previous
+    iteration, which costs O(interactions x factors) instead of a factors^3
+    solve per student. Students (or societies) are solved in blocks of at most
+    block_size interactions on a thread pool, so memory stays bounded by
+    block_size x factors whatever the number of students.
+    """
+
+    def __init__(self, factors=None, regularization=0.1, alpha=5.0, iterations=15,
+                 threads=None, block_size=None, cg_steps=3, seed=0):
+        self.factors = factors or getattr(settings, 'MATRIX_FACTORIZATION_FACTORS', 32)
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.threads = threads or getattr(settings, 'MATRIX_FACTORIZATION_THREADS', 0) or os.cpu_count() or 1
+        self.block_size = block_size or getattr(settings, 'MATRIX_FACTORIZATION_BLOCK_SIZE', 4096)
+        self.cg_steps = cg_steps
+        self.seed = seed
+
+    def preferences(self):
+        """(student_id, society_id, preference) arrays of every recorded interaction."""
+        student_ids, society_ids, weights = [], [], []
+
+        def add(pairs, weight):
+            for student_id, society_id in pairs:
+                student_ids.append(student_id)
+                society_ids.append(society_id)
+                weights.append(weight)
+
+        # A membership or RSVP recorded through both relations counts once
+        memberships = set(Memberships.objects.values_list('student_id', 'society_id').iterator())
+        memberships.update(SocietyMembers.objects.values_list('student_id', 'society_id').iterator())
+        add(memberships, MEMBERSHIP_WEIGHT)
+
+        rsvps = {}
+        for model in (AttendedEvents, EventAttendees):
+            for student_id, event_id, society_id in model.objects.filter(
+                event__hosted_by__isnull=False
+            ).values_list('student_id', 'event_id', 'event__hosted_by_id').iterator():
+                rsvps[(student_id, event_id)] = society_id
+        add(((student_id, society_id) for (student_id, _), society_id in rsvps.items()), ATTENDANCE_WEIGHT)
+
+        # Ratings above "somewhat relevant" are positive; joins after a recommendation count as joins
+        for student_id, society_id, rating, is_joined in RecommendationFeedback.objects.values_list(
+            'student_id', 'society_id', 'rating', 'is_joined'
+        ).iterator():
+            weight = feedback_processor.weights['rating'] * max(rating - 3, 0) / 2
+            if is_joined:
+                weight += feedback_processor.weights['join']
+            if weight > 0:
+                add([(student_id, society_id)], weight)
+
+        now = datetime.now()
+        for item in feedback_processor.feedback_data.get('user_feedback', []):
+            if item.get('feedback_type') not in IMPLICIT_FEEDBACK_TYPES or item.get('society_id') is None:
+                continue
+            try:
+                days_old = (now - datetime.fromisoformat(item['timestamp'])).days
+                student_id, society_id = int(item['student_id']), int(item['society_id'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            decay_factor = 2 ** (-max(days_old, 0) / feedback_processor.feedback_half_life)
+            add([(student_id, society_id)], feedback_processor.weights[item['feedback_type']] * decay_factor)
+
+        return (
+            np.array(student_ids, dtype=np.int64),
+            np.array(society_ids, dtype=np.int64),
+            np.array(weights, dtype=np.float32),
+        )
+
+    def preference_matrix(self):
+        """The student x society CSR preference matrix, with the student and society ids of its rows and columns."""
+        student_ids, society_ids, weights = self.preferences()
+        row_ids, rows = np.unique(student_ids, return_inverse=True)
+        column_ids, columns = np.unique(society_ids, return_inverse=True)
+        # Duplicate pairs are summed
+        matrix = csr_matrix((weights, (rows, columns)), shape=(len(row_ids), len(column_ids)))
+        matrix.sum_duplicates()
+        return matrix, row_ids, column_ids
+
+    def fit(self, matrix):
+        """Student and society factors (float32) of a student x society preference matrix."""
+        rng = np.random.default_rng(self.seed)
+        confidence = matrix.astype(np.float64) * self.alpha
+        confidence_t = confidence.T.tocsr()
+
+        student_factors = np.zeros((matrix.shape[0], self.factors))
+        society_factors = rng.normal(scale=0.01, size=(matrix.shape[1], self.factors))
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for _ in range(self.iterations):
+                self._solve(confidence, society_factors, student_factors, executor)
+                self._solve(confidence_t, student_factors, society_factors, executor)
+        return student_factors.astype(np.float32), society_factors.astype(np.float32)
+
+    def _solve(self, confidence, fixed, solved, executor):
+        """
+        Update the least-squares factors of every row of confidence in place, given
+        the fixed factors of its columns.
+        """
+        gram = fixed.T @ fixed + self.regularization * np.eye(self.factors)
+
+        def solve_block(block):
+            start, end = block
+            solved[start:end] = self._solve_block(confidence, fixed, gram, solved[start:end], start, end)
+
+        list(executor.map(solve_block, self._blocks(confidence.indptr)))
+
+    def _blocks(self, indptr):
+        """Consecutive (start, end) row ranges holding at most block_size interactions and rows."""
+        blocks, start, rows = [], 0, len(indptr) - 1
+        while start < rows:
+            end = int(np.searchsorted(indptr, indptr[start] + self.block_size, side='right')) - 1
+            end = min(max(end, start + 1), start + self.block_size, rows)
+            blocks.append((start, end))
+            start = end
+        return blocks
+
+    def _solve_block(self, confidence, fixed, gram, current, start, end):
+        # Row u solves (YtY + reg I + Yu^T (Cu - I) Yu) x = Yu^T Cu pu, with pu 1 on observed pairs
+        indptr = confidence.indptr[start:end + 1]
+        first, last = indptr[0], indptr[-1]
+        counts = np.diff(indptr)
+        observed = np.flatnonzero(counts)
+        offsets = indptr[observed] - first
+        factors = fixed[confidence.indices[first:last]]
+        weights = confidence.data[first:last]
+        rows_of_pairs = np.repeat(np.arange(end - start), counts)
+
+        def multiply(vectors):
+            product = vectors @ gram
+            if len(observed):
+                projections = np.einsum('ni,ni->n', factors, vectors[rows_of_pairs]) * weights
+                product[observed] += np.add.reduceat(factors * projections[:, None], offsets, axis=0)
+            return product
+
+        solution = current.copy()
+        rhs = np.zeros_like(solution)
+        if len(observed):
+            rhs[observed] = np.add.reduceat((1 + weights)[:, None] * factors, offsets, axis=0)
+        residual = rhs - multiply(solution)
+        direction = residual.copy()
+        residual_norms = (residual * residual).sum(axis=1)
+        for _ in range(self.cg_steps):
+            if residual_norms.max(initial=0.0) < 1e-20:
+                break
+            product = multiply(direction)
+            curvature = (direction * product).sum(axis=1)
+            step = np.divide(residual_norms, curvature, out=np.zeros_like(curvature), where=curvature > 0)
+            solution += step[:, None] * direction
+            residual -= step[:, None] * product
+            new_norms = (residual * residual).sum(axis=1)
+            ratio = np.divide(new_norms, residual_norms, out=np.zeros_like(new_norms), where=residual_norms > 0)
+            direction = residual + ratio[:, None] * direction
+            residual_norms = new_norms
+        return solution
+
+    def train(self):
+        """Fit the current interactions. Returns (student_ids, student_factors, society_ids, society_factors)."""
+        matrix, student_ids, society_ids = self.preference_matrix()
+        student_factors, society_factors = self.fit(matrix)
+        return student_ids, student_factors, society_ids, society_factors
+
+    def params(self):
+        return {
+            'factors': self.factors,
+            'regularization': self.regularization,
+            'alpha': self.alpha,
+            'iterations': self.iterations,
+            'cg_steps': self.cg_steps,
+        }
+
+
+class FactorModel:
+    """
+    Versioned student and society factor arrays trained by ImplicitALSTrainer.
+    Each training run writes its arrays and id index under a new version in
+    api/ml_models, then atomically points matrix_factorization.json at it, so
+    readers never see a half-written model. Arrays are opened memory-mapped.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models')
+        self.pointer_path = os.path.join(self.directory, 'matrix_factorization.json')
+
+        self.version = None
+        self.student_factors = None
+        self.society_factors = None
+        self.student_rows = {}
+        self.society_ids = None
+        self._loaded_mtime = None
+        self._lock = threading.Lock()
+
+    def _path(self, version, name):
+        return os.path.join(self.directory, f'mf_{version}_{name}')
+
+    def save(self, student_ids, student_factors, society_ids, society_factors, params=None, keep=3):
+        """Store a trained model as the current version, keeping the last `keep` versions. Returns the version."""
+        os.makedirs(self.directory, exist_ok=True)
+        version = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+
+        np.save(self._path(version, 'students.npy'), np.asarray(student_factors, dtype=np.float32))
+        np.save(self._path(version, 'societies.npy'), np.asarray(society_factors, dtype=np.float32))
+        with open(self._path(version, 'index.json'), 'w') as f:
+            json.dump({
+                'student_ids': [int(student_id) for student_id in student_ids],
+                'society_ids': [int(society_id) for society_id in society_ids],
+                'params': params or {},
+            }, f)
+
+        tmp_pointer_path = self.pointer_path + '.tmp'
+        with open(tmp_pointer_path, 'w') as f:
+            json.dump({'version': version}, f)
+        os.replace(tmp_pointer_path, self.pointer_path)
+
+        for old_version in self.versions()[:-keep]:
+            for path in glob.glob(self._path(old_version, '*')):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        self.refresh()
+        return version
+
+    def versions(self):
+        """Stored versions, oldest first."""
+        suffix = '_index.json'
+        return sorted(
+            os.path.basename(path)[len('mf_'):-len(suffix)]
+            for path in glob.glob(os.path.join(self.directory, f'mf_*{suffix}'))
+        )
+
+    def refresh(self):
+        """
+        (Re)open the current version if the pointer changed since it was last loaded.
+        Returns True when a model is available.
+        """
+        try:
+            mtime = os.path.getmtime(self.pointer_path)
+        except OSError:
+            self._reset()
+            return False
+
+        with self._lock:
+            if mtime == self._loaded_mtime:
+                return self.society_factors is not None
+
+            try:
+                with open(self.pointer_path, 'r') as f:
+                    version = json.load(f)['version']
+                with open(self._path(version, 'index.json'), 'r') as f:
+                    index = json.load(f)
+                student_factors = np.load(self._path(version, 'students.npy'), mmap_mode='r')
+                society_factors = np.load(self._path(version, 'societies.npy'), mmap_mode='r')
+            except (OSError, ValueError, KeyError):
+                self._reset()
+                return False
+
+            if (student_factors.shape[0] != len(index['student_ids'])
+                    or society_factors.shape[0] != len(index['society_ids'])):
+                self._reset()
+                return False
+
+            self.version = version
+            self.student_factors = student_factors
+            self.society_factors = society_factors
+            self.student_rows = {student_id: row for row, student_id in enumerate(index['student_ids'])}
+            self.society_ids = np.array(index['society_ids'], dtype=np.int64)
+            self._loaded_mtime = mtime
+            return True
+
+    def _reset(self):
+        self.version = None
+        self.student_factors = None
+        self.society_factors = None
+        self.student_rows = {}
+        self.society_ids = None
+        self._loaded_mtime = None
+
+    def rank(self, student_id, limit, exclude_ids=(), candidate_ids=None):
+        """
+        The student's `limit` best societies as (society_id, score) pairs, scoring
+        every society with one matrix-vector product. Societies in exclude_ids, or
+        outside candidate_ids when given, are skipped. None if the student is unknown.
+        """
+        if not self.refresh():
+            return None
+        row = self.student_rows.get(student_id)
+        if row is None:
+            return None
+
+        scores = self.society_factors @ self.student_factors[row]
+        allowed = ~np.isin(self.society_ids, list(exclude_ids))
+        if candidate_ids is not None:
+            allowed &= np.isin(self.society_ids, list(candidate_ids))
+        indices = np.flatnonzero(allowed)
+        if limit < len(indices):
+            indices = indices[np.argpartition(-scores[indices], limit)[:limit]]
+        indices = indices[np.argsort(-scores[indices], kind='stable')]
+        return [(int(self.society_ids[i]), float(scores[i])) for i in indices]
+
+
+# Create a singleton instance for reuse
+factor_model = FactorModel()
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.18 on 2026-10-17 02:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocietySemanticProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_mask', models.IntegerField(default=0, help_text='Bitmask of the domain categories found in the description')),
+                ('activity_mask', models.IntegerField(default=0, help_text='Bitmask of the activity types found in the description')),
+                ('keywords', models.JSONField(blank=True, default=list)),
+                ('description_hash', models.CharField(help_text='Hash of the description (and profile version) the profile was computed from', max_length=40)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('society', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='semantic_profile', to='api.society')),
+            ],
+            options={
+                'verbose_name': 'Society Semantic Profile',
+                'verbose_name_plural': 'Society Semantic Profiles',
+            },
+        ),
+    ]
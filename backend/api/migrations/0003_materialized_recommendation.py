@@ -0,0 +1,34 @@
+# Generated by Django 4.2.18 on 2026-10-17 02:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_society_semantic_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterializedRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('diversity_level', models.CharField(default='balanced', max_length=10)),
+                ('rank', models.PositiveSmallIntegerField(help_text='1-based position in the recommendations')),
+                ('score', models.FloatField(default=0.0)),
+                ('explanation_type', models.CharField(default='general', max_length=20)),
+                ('explanation_message', models.CharField(blank=True, max_length=255)),
+                ('computed_at', models.DateTimeField()),
+                ('society', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.society')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='materialized_recommendations', to='api.student')),
+            ],
+            options={
+                'verbose_name': 'Materialized Recommendation',
+                'verbose_name_plural': 'Materialized Recommendations',
+                'ordering': ['student', 'diversity_level', 'rank'],
+                'unique_together': {('student', 'diversity_level', 'rank')},
+            },
+        ),
+    ]
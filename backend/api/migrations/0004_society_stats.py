@@ -0,0 +1,33 @@
+# Generated by Django 4.2.18 on 2026-10-17 03:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_materialized_recommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocietyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('member_count', models.PositiveIntegerField(default=0)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+                ('total_attendance', models.PositiveIntegerField(default=0, help_text='Attendees summed over every event hosted by the society')),
+                ('recent_event_count', models.PositiveIntegerField(default=0)),
+                ('recent_join_count', models.PositiveIntegerField(default=0, help_text='Members whose account was created in the last 30 days')),
+                ('base_popularity_score', models.IntegerField(db_index=True, default=0, help_text='2 x members + 3 x events + 4 x attendance')),
+                ('popularity_score', models.IntegerField(db_index=True, default=0, help_text='base_popularity_score + 5 x recent events + 3 x recent joins')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('society', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='api.society')),
+            ],
+            options={
+                'verbose_name': 'Society Stats',
+                'verbose_name_plural': 'Society Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.18 on 2026-10-17 04:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_society_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MajorSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('major', models.CharField(db_index=True, max_length=50)),
+                ('similar_major', models.CharField(max_length=50)),
+                ('score', models.FloatField(default=0.0)),
+            ],
+            options={
+                'verbose_name': 'Major Similarity',
+                'verbose_name_plural': 'Major Similarities',
+                'ordering': ['major', '-score'],
+                'unique_together': {('major', 'similar_major')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MajorSocietyAffinity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('major', models.CharField(max_length=50)),
+                ('member_count', models.PositiveIntegerField(default=0, help_text='Members of the society with this major')),
+                ('score', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('society', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='major_affinities', to='api.society')),
+            ],
+            options={
+                'verbose_name': 'Major Society Affinity',
+                'verbose_name_plural': 'Major Society Affinities',
+                'indexes': [models.Index(fields=['major', '-score'], name='api_affinity_major_score')],
+                'unique_together': {('major', 'society')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class MMRReranker:
+    """
+    Maximal Marginal Relevance reranking of any scored list (societies, events,
+    news). Items are picked greedily by
+    lambda_ * relevance - (1 - lambda_) * max similarity to the items already picked.
+    The max-similarity of every remaining item is kept in a vector and updated
+    with one similarity row per pick, so a selection of k items out of n needs
+    k - 1 rows instead of O(k^2 * n) pairwise comparisons.
+    """
+
+    def __init__(self, lambda_=0.7):
+        self.lambda_ = lambda_
+
+    def rerank(self, relevance, similarity_row, limit):
+        """
+        Indices of the selected items in pick order.
+
+        Arguments:
+            relevance: Relevance score of each item
+            similarity_row: Callable (picked_index, remaining_indices) returning the
+                similarities of the picked item to the remaining ones, aligned with them
+            limit: Maximum number of items to select
+        """
+        relevance = np.asarray(relevance, dtype=float)
+        size = len(relevance)
+        limit = min(limit, size)
+
+        selected = []
+        remaining = np.ones(size, dtype=bool)
+        max_similarity = np.full(size, -np.inf)
+
+        while len(selected) < limit:
+            if selected:
+                mmr_scores = self.lambda_ * relevance - (1 - self.lambda_) * max_similarity
+            else:
+                mmr_scores = relevance.copy()
+            mmr_scores[~remaining] = -np.inf
+
+            # argmax keeps the first of equal scores, so ties go to the earlier item
+            picked = int(np.argmax(mmr_scores))
+            selected.append(picked)
+            remaining[picked] = False
+
+            if len(selected) < limit:
+                remaining_indices = np.flatnonzero(remaining)
+                similarities = np.asarray(similarity_row(picked, remaining_indices), dtype=float)
+                max_similarity[remaining_indices] = np.maximum(
+                    max_similarity[remaining_indices], similarities
+                )
+
+        return selected
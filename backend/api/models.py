@@ -10,6 +10,10 @@ from api.models_files.event_models import *
 from api.models_files.society_models import *
 from api.models_files.request_models import *
 from api.models_files.recommendation_feedback_model import *
+from api.models_files.society_semantic_profile_model import *
+from api.models_files.materialized_recommendation_model import *
+from api.models_files.society_stats_model import *
+from api.models_files.major_affinity_model import *
 
 
 class SiteSettings(models.Model):
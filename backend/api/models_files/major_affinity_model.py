@@ -0,0 +1,52 @@
+from django.db import models
+from api.models import Society
+
+class MajorSocietyAffinity(models.Model):
+    """
+    Precomputed affinity of the students of a major for a society, rebuilt in
+    bulk by a scheduled job and updated when students join or leave, so
+    cold-start rankings per major are one indexed ORDER BY. The score is the
+    share of the major's students who are members, smoothed towards zero for
+    small majors: members / (students of the major + smoothing).
+    """
+    major = models.CharField(max_length=50)
+    society = models.ForeignKey(
+        Society,
+        on_delete=models.CASCADE,
+        related_name='major_affinities'
+    )
+    member_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Members of the society with this major"
+    )
+    score = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['major', 'society']
+        indexes = [models.Index(fields=['major', '-score'], name='api_affinity_major_score')]
+        verbose_name = 'Major Society Affinity'
+        verbose_name_plural = 'Major Society Affinities'
+
+    def __str__(self):
+        return f"{self.major} -> {self.society.name}: {self.score:.3f}"
+
+
+class MajorSimilarity(models.Model):
+    """
+    One of a major's most similar majors, by the cosine similarity of their
+    society memberships. Rebuilt with the affinities; used as fallbacks for
+    majors with few affinities of their own.
+    """
+    major = models.CharField(max_length=50, db_index=True)
+    similar_major = models.CharField(max_length=50)
+    score = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['major', '-score']
+        unique_together = ['major', 'similar_major']
+        verbose_name = 'Major Similarity'
+        verbose_name_plural = 'Major Similarities'
+
+    def __str__(self):
+        return f"{self.major} ~ {self.similar_major}: {self.score:.3f}"
@@ -0,0 +1,34 @@
+from django.db import models
+from api.models import Student, Society
+
+class MaterializedRecommendation(models.Model):
+    """
+    One row of a student's precomputed top-N recommendations, written by the
+    nightly materialize_recommendations job so recommendation requests can be
+    served without scoring. Rows of a student are replaced as a whole.
+    """
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='materialized_recommendations'
+    )
+    diversity_level = models.CharField(max_length=10, default='balanced')
+    rank = models.PositiveSmallIntegerField(help_text="1-based position in the recommendations")
+    society = models.ForeignKey(
+        Society,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    score = models.FloatField(default=0.0)
+    explanation_type = models.CharField(max_length=20, default='general')
+    explanation_message = models.CharField(max_length=255, blank=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['student', 'diversity_level', 'rank']
+        unique_together = ['student', 'diversity_level', 'rank']
+        verbose_name = 'Materialized Recommendation'
+        verbose_name_plural = 'Materialized Recommendations'
+
+    def __str__(self):
+        return f"{self.student.username} #{self.rank}: {self.society.name}"
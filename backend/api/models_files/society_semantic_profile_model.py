@@ -0,0 +1,35 @@
+from django.db import models
+from api.models import Society
+
+class SocietySemanticProfile(models.Model):
+    """
+    Precomputed semantic profile of a society's description, so recommendation
+    requests read domain categories, activity types and keywords instead of
+    reparsing the text. Recomputed only when the description hash changes.
+    """
+    society = models.OneToOneField(
+        Society,
+        on_delete=models.CASCADE,
+        related_name='semantic_profile'
+    )
+    category_mask = models.IntegerField(
+        default=0,
+        help_text="Bitmask of the domain categories found in the description"
+    )
+    activity_mask = models.IntegerField(
+        default=0,
+        help_text="Bitmask of the activity types found in the description"
+    )
+    keywords = models.JSONField(default=list, blank=True)
+    description_hash = models.CharField(
+        max_length=40,
+        help_text="Hash of the description (and profile version) the profile was computed from"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Society Semantic Profile'
+        verbose_name_plural = 'Society Semantic Profiles'
+
+    def __str__(self):
+        return f"Semantic profile of {self.society.name}"
@@ -0,0 +1,44 @@
+from django.db import models
+from api.models import Society
+
+class SocietyStats(models.Model):
+    """
+    Materialized popularity statistics of a society, kept current by signals on
+    memberships, events and attendance and reconciled periodically, so popularity
+    rankings are one indexed ORDER BY instead of a multi-join aggregate.
+    Recent counts cover the last 30 days.
+    """
+    society = models.OneToOneField(
+        Society,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    member_count = models.PositiveIntegerField(default=0)
+    event_count = models.PositiveIntegerField(default=0)
+    total_attendance = models.PositiveIntegerField(
+        default=0,
+        help_text="Attendees summed over every event hosted by the society"
+    )
+    recent_event_count = models.PositiveIntegerField(default=0)
+    recent_join_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Members whose account was created in the last 30 days"
+    )
+    base_popularity_score = models.IntegerField(
+        default=0,
+        db_index=True,
+        help_text="2 x members + 3 x events + 4 x attendance"
+    )
+    popularity_score = models.IntegerField(
+        default=0,
+        db_index=True,
+        help_text="base_popularity_score + 5 x recent events + 3 x recent joins"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Society Stats'
+        verbose_name_plural = 'Society Stats'
+
+    def __str__(self):
+        return f"Stats of {self.society.name}"
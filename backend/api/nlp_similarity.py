@@ -1,9 +1,15 @@
 import numpy as np
 import re
 import os
+import json
+import hashlib
 import pickle
+import tempfile
 import functools
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+import importlib.util
+import threading
+import time
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
 from django.conf import settings
 import nltk
@@ -11,21 +17,109 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from nltk.tokenize import word_tokenize
 from .semantic_enhancer import semantic_enhancer
+from .embedding_store import society_embedding_store
+from .incremental_tfidf import IncrementalTfidfModel
+from .models import Society
+from .nlp_worker import NLPScoringClient, NLPWorkerUnavailable
+from .scoring_stats import scoring_stats, timed
+from .bounded_cache import BoundedCache
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# Only check whether the package is installed; importing it (and torch) is deferred
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
 
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('wordnet')
+_nltk_resources_checked = False
+
+# Patterns used by preprocess_text, compiled once
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Bump when preprocessing changes so persisted normalized texts are discarded
+NORMALIZED_TEXT_CACHE_VERSION = 1
+
+# Embeddings of recently seen texts kept in memory per analyzer
+EMBEDDING_CACHE_SIZE = 1024
+
+# Token lemmas memoized across texts per analyzer
+LEMMA_CACHE_SIZE = 50000
+
+# Stored top keywords of society descriptions (see prime_keywords) kept per analyzer
+KEYWORD_CACHE_SIZE = 10000
+
+# Vocabulary caps of the TF-IDF and keyword models
+TFIDF_MAX_FEATURES = 1000
+KEYWORD_MAX_FEATURES = 500
+
+
+def ensure_nltk_resources():
+    """Make sure the NLTK data used for preprocessing is present, downloading it once if needed."""
+    global _nltk_resources_checked
+    if _nltk_resources_checked:
+        return
+
+    try:
+        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('corpora/stopwords')
+        nltk.data.find('corpora/wordnet')
+    except LookupError:
+        nltk.download('punkt')
+        nltk.download('stopwords')
+        nltk.download('wordnet')
+
+    _nltk_resources_checked = True
+
+
+def _lazy_component(name):
+    """
+    Property for an analyzer component that is loaded on first access.
+    Assigning to it directly marks the component as loaded.
+    """
+    private_name = '_' + name
+
+    def getter(self):
+        self._ensure_component(name)
+        return getattr(self, private_name)
+
+    def setter(self, value):
+        setattr(self, private_name, value)
+        self._loaded_components.add(name)
+
+    return property(getter, setter)
+
+
+def _delegate_to_worker(decode=None):
+    """
+    Run an analyzer method in the shared NLP scoring worker when the analyzer is in
+    client mode, falling back to in-process scoring if the worker is unavailable.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.worker_client is not None and not kwargs:
+                try:
+                    result = self.worker_client.call(method.__name__, *args)
+                    return decode(result) if decode is not None and result is not None else result
+                except NLPWorkerUnavailable:
+                    scoring_stats.fallback('analyzer.worker')
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _cache_embeddings(method):
+    """
+    Keep the embeddings of recently seen texts in the analyzer's bounded LRU cache.
+    Unlike functools.lru_cache on a method, the cache is per analyzer and does not
+    keep the analyzer alive.
+    """
+    @functools.wraps(method)
+    def wrapper(self, text):
+        embedding = self.embedding_cache.get(text)
+        if embedding is None:
+            embedding = method(self, text)
+            if embedding is not None:
+                self.embedding_cache.set(text, embedding)
+        return embedding
+    return wrapper
 
 
 class TextSimilarityAnalyzer:
@@ -33,55 +127,125 @@ class TextSimilarityAnalyzer:
     Advanced text similarity analyzer using NLP techniques.
     Implements multiple similarity metrics with domain-specific knowledge.
     Now includes neural sentence embeddings for improved semantic understanding.
+
+    With lazy=True, NLTK resources, vectorizers and the sentence model are only loaded
+    on first use (or by warm_up()), so importing the module stays cheap.
     """
 
-    def __init__(self):
-        self.tfidf_vectorizer = None
-        self.count_vectorizer = None
-        self.sentence_model = None
+    tfidf_vectorizer = _lazy_component('tfidf_vectorizer')
+    count_vectorizer = _lazy_component('count_vectorizer')
+    sentence_model = _lazy_component('sentence_model')
+    lemmatizer = _lazy_component('lemmatizer')
+    stop_words = _lazy_component('stop_words')
+    normalized_text_cache = _lazy_component('normalized_text_cache')
+
+    # Upper bound on normalized texts memoized in memory outside update_corpus
+    max_normalized_cache_size = 10000
+
+    def __init__(self, lazy=False):
+        self._loaded_components = set()
+        self._load_lock = threading.RLock()
+        # Serializes changes to the text models (e.g. from concurrent scoring worker threads)
+        self._text_model_lock = threading.RLock()
+        self._text_models_dirty = False  # Incremental changes not yet persisted by save_text_models()
+        self.load_timings = {}  # Seconds spent loading each component
+        self._component_loaders = {
+            'nltk_resources': ensure_nltk_resources,
+            'tfidf_vectorizer': self._load_tfidf_vectorizer,
+            'count_vectorizer': self._load_count_vectorizer,
+            'sentence_model': self._initialize_sentence_model,
+            'lemmatizer': self._load_lemmatizer,
+            'stop_words': self._load_stop_words,
+            'normalized_text_cache': self._load_normalized_text_cache,
+        }
+
+        self._weights = None
         self.corpus = []
         self.corpus_tfidf_vectors = None
         self.corpus_count_vectors = None
-        self.embedding_cache = {}  # Cache for sentence embeddings
+        self.embedding_store = society_embedding_store  # Persisted society embeddings
 
-        # Paths to saved vectorizers
+        # Paths to saved incremental text models
         self.model_path = os.path.join(
-            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'tfidf_vectorizer.pkl'
+            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'tfidf_model.pkl'
         )
         self.count_model_path = os.path.join(
-            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'count_vectorizer.pkl'
+            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'count_model.pkl'
         )
-        self.embed_model_path = os.path.join(
-            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'sentence_embeddings.pkl'
+        self.normalized_cache_path = os.path.join(
+            getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models', 'normalized_texts.json'
         )
 
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        self._lemma_cache = BoundedCache('analyzer.lemma_cache', maxsize=LEMMA_CACHE_SIZE)  # token -> lemma
+        self.embedding_cache = BoundedCache('analyzer.embedding_cache', maxsize=EMBEDDING_CACHE_SIZE)
+        self.keyword_cache = BoundedCache('analyzer.keyword_cache', maxsize=KEYWORD_CACHE_SIZE)  # text -> keywords
 
-        # Initialize or load vectorizers
-        self._load_or_create_vectorizers()
-        
-        # Initialize sentence transformer model if available
-        self._initialize_sentence_model()
+        # Client mode: run scoring in the shared NLP worker when one is configured
+        socket_path = getattr(settings, 'NLP_WORKER_SOCKET', '')
+        self.worker_client = NLPScoringClient(socket_path) if socket_path else None
 
-        # Define similarity weights (updated to include embeddings)
-        self.weights = {
-            'embedding': 0.35,  # Neural sentence embedding weight
-            'tfidf': 0.25,      # TF-IDF cosine similarity weight
-            'keyword': 0.15,    # Keyword overlap weight
-            'jaccard': 0.05,    # Jaccard similarity weight
-            'semantic': 0.2     # Domain-specific semantic boost weight
-        }
-        
+        if not lazy:
+            self.warm_up()
+
+    @property
+    def weights(self):
+        """Similarity weights; depend on whether the sentence model could be loaded."""
+        if self._weights is None:
+            self._weights = self._default_weights()
+        return self._weights
+
+    @weights.setter
+    def weights(self, value):
+        self._weights = value
+
+    def _default_weights(self):
         # If sentence embeddings are not available, redistribute weights
         if not SENTENCE_TRANSFORMERS_AVAILABLE or self.sentence_model is None:
-            self.weights = {
+            return {
                 'tfidf': 0.4,     # TF-IDF cosine similarity weight
                 'keyword': 0.2,   # Keyword overlap weight
                 'jaccard': 0.1,   # Jaccard similarity weight
                 'semantic': 0.3   # Domain-specific semantic boost weight
             }
 
+        # Define similarity weights (updated to include embeddings)
+        return {
+            'embedding': 0.35,  # Neural sentence embedding weight
+            'tfidf': 0.25,      # TF-IDF cosine similarity weight
+            'keyword': 0.15,    # Keyword overlap weight
+            'jaccard': 0.05,    # Jaccard similarity weight
+            'semantic': 0.2     # Domain-specific semantic boost weight
+        }
+
+    def _ensure_component(self, name):
+        """Load a component if it has not been loaded yet, recording how long it took."""
+        if name in self._loaded_components:
+            return
+
+        with self._load_lock:
+            if name in self._loaded_components:
+                return
+            start = time.perf_counter()
+            self._component_loaders[name]()
+            self.load_timings[name] = time.perf_counter() - start
+            self._loaded_components.add(name)
+
+    def warm_up(self):
+        """
+        Explicitly load every component (e.g. at worker start-up) instead of on first use.
+        Returns the load time in seconds of each component.
+        """
+        for name in self._component_loaders:
+            self._ensure_component(name)
+        return dict(self.load_timings)
+
+    def get_stats(self):
+        """Per-component timings, cache hit rates and fallback counts of similarity scoring."""
+        return scoring_stats.snapshot('analyzer.')
+
+    def reset_stats(self):
+        scoring_stats.reset('analyzer.')
+
     def _initialize_sentence_model(self):
         """Initialize the sentence transformer model for embeddings."""
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
@@ -89,103 +253,210 @@ class TextSimilarityAnalyzer:
             return
             
         try:
+            from sentence_transformers import SentenceTransformer
             self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
         except Exception:
             self.sentence_model = None
 
+    def _load_lemmatizer(self):
+        self._ensure_component('nltk_resources')
+        self.lemmatizer = WordNetLemmatizer()
+
+    def _load_stop_words(self):
+        self._ensure_component('nltk_resources')
+        self.stop_words = set(stopwords.words('english'))
+
+    def _load_normalized_text_cache(self):
+        """Load the persisted normalized society descriptions (content hash -> text)."""
+        self.normalized_text_cache = {}
+        if not os.path.exists(self.normalized_cache_path):
+            return
+
+        try:
+            with open(self.normalized_cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == NORMALIZED_TEXT_CACHE_VERSION:
+                self.normalized_text_cache = dict(data.get('texts', {}))
+        except Exception:
+            pass
+
+    def _save_normalized_text_cache(self, texts):
+        """Persist the normalized form of the given texts, replacing the previous file."""
+        cache = self.normalized_text_cache
+        entries = {}
+        for text in texts:
+            key = self._text_key(text)
+            if key in cache:
+                entries[key] = cache[key]
+
+        payload = json.dumps({'version': NORMALIZED_TEXT_CACHE_VERSION, 'texts': entries}).encode('utf-8')
+        try:
+            self._write_atomically(self.normalized_cache_path, lambda f: f.write(payload))
+        except OSError:
+            scoring_stats.fallback('analyzer.save_normalized_text_cache')
+
+    @staticmethod
+    def _text_key(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
     def _load_or_create_vectorizers(self):
         """Load existing vectorizers if available, or create new ones."""
+        self._load_tfidf_vectorizer()
+        self._load_count_vectorizer()
+
+    def _load_tfidf_vectorizer(self):
+        """Load the saved TF-IDF vectorizer if available, or create a new one."""
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
 
-        # --- TF-IDF Vectorizer ---
         if os.path.exists(self.model_path):
             try:
                 with open(self.model_path, 'rb') as f:
                     self.tfidf_vectorizer = pickle.load(f)
+                if not isinstance(self.tfidf_vectorizer, IncrementalTfidfModel):
+                    self._create_new_tfidf_vectorizer()
+                elif self.tfidf_vectorizer.max_features is None:
+                    self.tfidf_vectorizer.max_features = TFIDF_MAX_FEATURES
             except Exception:
                 self._create_new_tfidf_vectorizer()
         else:
             self._create_new_tfidf_vectorizer()
 
-        # --- Count Vectorizer ---
+    def _load_count_vectorizer(self):
+        """Load the saved Count vectorizer if available, or create a new one."""
+        os.makedirs(os.path.dirname(self.count_model_path), exist_ok=True)
+
         if os.path.exists(self.count_model_path):
             try:
                 with open(self.count_model_path, 'rb') as f:
                     self.count_vectorizer = pickle.load(f)
+                if not isinstance(self.count_vectorizer, IncrementalTfidfModel):
+                    self._create_new_count_vectorizer()
+                elif self.count_vectorizer.max_features is None:
+                    self.count_vectorizer.max_features = KEYWORD_MAX_FEATURES
             except Exception:
                 self._create_new_count_vectorizer()
         else:
             self._create_new_count_vectorizer()
 
     def _create_new_tfidf_vectorizer(self):
-        """Create a new TF-IDF vectorizer."""
-        self.tfidf_vectorizer = TfidfVectorizer(
-            min_df=1,
+        """Create a new incremental TF-IDF model."""
+        self.tfidf_vectorizer = IncrementalTfidfModel(
             max_df=0.95,
-            max_features=1000,
             stop_words='english',
-            ngram_range=(1, 3)
+            ngram_range=(1, 3),
+            max_features=TFIDF_MAX_FEATURES
         )
 
     def _create_new_count_vectorizer(self):
         """
-        Create a new Count vectorizer for keyword extraction.
-        Using min_df=0.0 and max_df=1.0 to avoid pruning in highly similar docs.
+        Create a new incremental term-count model for keyword extraction.
+        Using max_df=1.0 to avoid pruning in highly similar docs.
         """
-        self.count_vectorizer = CountVectorizer(
-            min_df=0.0,  
+        self.count_vectorizer = IncrementalTfidfModel(
             max_df=1.0,
-            max_features=500,
-            stop_words='english'
+            stop_words='english',
+            use_idf=False,
+            norm=None,
+            max_features=KEYWORD_MAX_FEATURES
         )
 
     def preprocess_text(self, text):
         """
         Clean and normalize text for better comparison.
         Uses lemmatization and removes stopwords for improved semantic matching.
+        Normalized texts are looked up by content hash before doing any NLP work.
         """
         if not text:
             return ""
 
+        key = self._text_key(text)
+        cache = self.normalized_text_cache
+        processed_text = cache.get(key)
+        if processed_text is not None:
+            scoring_stats.cache_hit('analyzer.normalized_text_cache')
+            return processed_text
+
+        scoring_stats.cache_miss('analyzer.normalized_text_cache')
+        with scoring_stats.timer('analyzer.preprocess'):
+            processed_text = self._normalize_text(text)
+
+        if len(cache) < self.max_normalized_cache_size:
+            cache[key] = processed_text
+
+        return processed_text
+
+    def preprocess_many(self, texts):
+        """
+        Preprocess a list of texts, normalizing each distinct text only once.
+        Returns the processed texts in the same order.
+        """
+        processed = {}
+        results = []
+        for text in texts:
+            if text not in processed:
+                processed[text] = self.preprocess_text(text)
+            results.append(processed[text])
+        return results
+
+    def _normalize_text(self, text):
+        """Run the full normalization pipeline on one text."""
+        self._ensure_component('nltk_resources')
+
         # Convert to lowercase
         text = text.lower()
 
         # Remove punctuation
-        text = re.sub(r'[^\w\s]', ' ', text)
+        text = PUNCTUATION_PATTERN.sub(' ', text)
 
         # Tokenize
         tokens = word_tokenize(text)
 
-        # Remove stopwords and lemmatize
-        lemmatized_tokens = [
-            self.lemmatizer.lemmatize(token)
-            for token in tokens
-            if token not in self.stop_words and len(token) > 2
-        ]
+        # Remove stopwords and lemmatize, memoizing lemmas across texts
+        stop_words = self.stop_words
+        lemma_cache = self._lemma_cache
+        lemmatized_tokens = []
+        for token in tokens:
+            if token in stop_words or len(token) <= 2:
+                continue
+            lemma = lemma_cache.get(token)
+            if lemma is None:
+                lemma = self.lemmatizer.lemmatize(token)
+                lemma_cache.set(token, lemma)
+            lemmatized_tokens.append(lemma)
 
         # Rejoin tokens
         processed_text = ' '.join(lemmatized_tokens)
 
         # Remove extra whitespace
-        processed_text = re.sub(r'\s+', ' ', processed_text).strip()
+        processed_text = WHITESPACE_PATTERN.sub(' ', processed_text).strip()
 
         return processed_text
 
-    @functools.lru_cache(maxsize=128)
+    @_cache_embeddings
+    @_delegate_to_worker(decode=lambda result: np.asarray(result, dtype=np.float32))
     def get_embedding(self, text):
         """
         Get embedding for a text using sentence transformers.
-        Uses a cache to avoid recomputing embeddings for the same text.
+        Uses a cache to avoid recomputing embeddings for the same text, and reads
+        society descriptions from the persisted embedding store when available.
         """
         if not text or self.sentence_model is None:
             return None
             
+        stored = self.embedding_store.get_by_text(text)
+        if stored is not None:
+            scoring_stats.cache_hit('analyzer.embedding_store')
+            return stored
+            
+        scoring_stats.cache_miss('analyzer.embedding_store')
         try:
             # Get embedding from model
-            embedding = self.sentence_model.encode(text, convert_to_numpy=True)
+            with scoring_stats.timer('analyzer.encode'):
+                embedding = self.sentence_model.encode(text, convert_to_numpy=True)
             return embedding
         except Exception:
+            scoring_stats.fallback('analyzer.encode')
             return None
 
     def _calculate_embedding_similarity(self, text1, text2):
@@ -210,6 +481,7 @@ class TextSimilarityAnalyzer:
             
             return similarity
         except Exception:
+            scoring_stats.fallback('analyzer.embedding')
             return 0
 
     def extract_keywords(self, text, top_n=10):
@@ -224,62 +496,154 @@ class TextSimilarityAnalyzer:
         # Get keyword frequencies
         frequencies = zip(feature_names, vector.toarray()[0])
 
-        # Sort by frequency and take top N
+        # Sort by frequency (ties alphabetically) and take top N
         keywords = [
             word for word, freq in
-            sorted(frequencies, key=lambda x: x[1], reverse=True)[:top_n]
+            sorted(frequencies, key=lambda x: (-x[1], x[0]))[:top_n]
             if freq > 0
         ]
         return keywords
 
-    def update_corpus(self, society_descriptions):
+    def prime_keywords(self, text, keywords):
+        """
+        Seed the keyword memo with the stored top keywords of a text (e.g. from
+        SocietySemanticProfile), so scoring it does not recount its keywords.
         """
-        Update the corpus with society descriptions and train the vectorizers.
+        if text:
+            self.keyword_cache.set(text, list(keywords))
+
+    def update_corpus(self, society_descriptions, society_ids=None):
+        """
+        Update the corpus with society descriptions and rebuild the text models.
         Removes duplicate descriptions and ensures enough variety for training.
+        When society_ids (aligned with the descriptions) are given, documents are keyed
+        by society so later edits through update_society_text replace them.
         """
+        if society_ids is None:
+            society_ids = [None] * len(society_descriptions)
+
         # Remove duplicates
         unique_descriptions = list(set(society_descriptions))
 
-        # Preprocess descriptions
-        self.corpus = [
-            self.preprocess_text(desc) for desc in unique_descriptions if desc
-        ]
+        # Preprocess descriptions and persist their normalized form for request-time lookups
+        descriptions = [desc for desc in unique_descriptions if desc]
+        self.corpus = self.preprocess_many(descriptions)
+        self._save_normalized_text_cache(descriptions)
+        processed = dict(zip(descriptions, self.corpus))
+
+        documents = {}
+        for society_id, desc in zip(society_ids, society_descriptions):
+            if desc:
+                key = society_id if society_id is not None else 'text:' + self._text_key(desc)
+                documents[key] = processed[desc]
 
         # If corpus is empty or too small, add sample descriptions
         if len(self.corpus) < 3:
-            self.corpus.extend([
+            placeholders = [
                 "This is a placeholder description about a student society.",
                 "Our society organizes various activities, discussions, and events for students.",
                 "A group of passionate individuals coming together to share knowledge and experiences."
-            ])
+            ]
+            self.corpus.extend(placeholders)
+            for i, placeholder in enumerate(placeholders):
+                documents['placeholder:%d' % i] = placeholder
 
-        # Fit vectorizers
-        try:
-            self.tfidf_vectorizer.fit(self.corpus)
-            self.count_vectorizer.fit(self.corpus)
-        except ValueError:
-            return
-
-        # Transform the corpus
-        self.corpus_tfidf_vectors = self.tfidf_vectorizer.transform(self.corpus)
-        self.corpus_count_vectors = self.count_vectorizer.transform(self.corpus)
+        # Rebuild the text models
+        with self._text_model_lock:
+            try:
+                self.tfidf_vectorizer.fit(list(documents.values()), keys=list(documents))
+                self.count_vectorizer.fit(list(documents.values()), keys=list(documents))
+            except ValueError:
+                return
 
-        # Save vectorizers
-        try:
-            with open(self.model_path, 'wb') as f:
-                pickle.dump(self.tfidf_vectorizer, f)
+            # Transform the corpus
+            self.corpus_tfidf_vectors = self.tfidf_vectorizer.transform(self.corpus)
+            self.corpus_count_vectors = self.count_vectorizer.transform(self.corpus)
 
-            with open(self.count_model_path, 'wb') as f:
-                pickle.dump(self.count_vectorizer, f)
-        except Exception:
-            pass
-            
+            self._save_text_models()
+        
         # Pre-compute and cache embeddings for the original descriptions
         if self.sentence_model is not None:
             for desc in unique_descriptions:
                 if desc:
                     self.get_embedding(desc)
 
+    @_delegate_to_worker()
+    def update_society_text(self, society_id, description):
+        """
+        Add or replace one society description in the TF-IDF and keyword models
+        without refitting them. Costs O(tokens of the description); IDF weights
+        are recomputed lazily on the next transform. The change is persisted by the
+        next save_text_models(). Returns True if the models changed.
+        """
+        if not description:
+            return self.remove_society_text(society_id)
+
+        try:
+            # An unfitted model is fitted from the whole corpus first rather than from this one text
+            self._ensure_vectorizers_fitted()
+            processed = self.preprocess_text(description)
+            with self._text_model_lock:
+                changed = self.tfidf_vectorizer.add_document(society_id, processed)
+                changed = self.count_vectorizer.add_document(society_id, processed) or changed
+                if changed:
+                    self._text_models_dirty = True
+        except Exception:
+            return False
+        return changed
+
+    @_delegate_to_worker()
+    def remove_society_text(self, society_id):
+        """Remove a society description from the text models. Returns True if it was present."""
+        try:
+            with self._text_model_lock:
+                removed = self.tfidf_vectorizer.remove_document(society_id)
+                removed = self.count_vectorizer.remove_document(society_id) or removed
+                if removed:
+                    self._text_models_dirty = True
+        except Exception:
+            return False
+        return removed
+
+    def save_text_models(self):
+        """
+        Persist the text models if incremental updates changed them since the last
+        save. Run on a schedule (and by the scoring worker) rather than per edit.
+        Returns True if they were written.
+        """
+        with self._text_model_lock:
+            if not self._text_models_dirty:
+                return False
+            return self._save_text_models()
+
+    def _save_text_models(self):
+        """Persist the TF-IDF and keyword models, each replacing its file atomically."""
+        with self._text_model_lock:
+            try:
+                self._write_atomically(self.model_path, lambda f: pickle.dump(self.tfidf_vectorizer, f))
+                self._write_atomically(self.count_model_path, lambda f: pickle.dump(self.count_vectorizer, f))
+            except (OSError, pickle.PicklingError):
+                scoring_stats.fallback('analyzer.save_text_models')
+                return False
+            self._text_models_dirty = False
+            return True
+
+    @staticmethod
+    def _write_atomically(path, write):
+        """Write a file through a temporary file in its directory, so readers never see a partial one."""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @timed('analyzer.calculate_similarity')
+    @_delegate_to_worker(decode=float)
     def calculate_similarity(self, text, comparison_texts):
         """
         Calculate similarity between a text and a list of comparison texts.
@@ -307,12 +671,9 @@ class TextSimilarityAnalyzer:
         if not text or not comparison_texts:
             return 0
 
-        # If vectorizers aren't fit, attempt to fit them with these texts
-        if (not hasattr(self.tfidf_vectorizer, 'vocabulary_') or
-            not hasattr(self.count_vectorizer, 'vocabulary_')):
-            all_texts = [text] + comparison_texts
-            self.tfidf_vectorizer.fit(all_texts)
-            self.count_vectorizer.fit(all_texts)
+        # Until the text models are fitted from the society corpus, score without them
+        fitted = self._ensure_vectorizers_fitted()
+        weights = self._component_weights(fitted)
 
         try:
             # Calculate multiple similarity metrics
@@ -322,33 +683,39 @@ class TextSimilarityAnalyzer:
                 
                 # 1) Neural Sentence Embedding Similarity (if available)
                 if self.sentence_model is not None:
-                    embedding_similarity = self._calculate_embedding_similarity(
-                        original_text, orig_comp_text
-                    )
+                    with scoring_stats.timer('analyzer.embedding'):
+                        embedding_similarity = self._calculate_embedding_similarity(
+                            original_text, orig_comp_text
+                        )
                     similarity_components['embedding'] = embedding_similarity
                 
-                # 2) TF-IDF Cosine Similarity
-                tfidf_similarity = self._calculate_tfidf_similarity(text, comp_text)
-                similarity_components['tfidf'] = tfidf_similarity
+                if fitted:
+                    # 2) TF-IDF Cosine Similarity
+                    with scoring_stats.timer('analyzer.tfidf'):
+                        tfidf_similarity = self._calculate_tfidf_similarity(text, comp_text)
+                    similarity_components['tfidf'] = tfidf_similarity
 
-                # 3) Keyword Overlap
-                keyword_similarity = self._calculate_keyword_overlap(text, comp_text)
-                similarity_components['keyword'] = keyword_similarity
+                    # 3) Keyword Overlap
+                    with scoring_stats.timer('analyzer.keyword'):
+                        keyword_similarity = self._calculate_keyword_overlap(text, comp_text)
+                    similarity_components['keyword'] = keyword_similarity
 
                 # 4) Jaccard Similarity
-                jaccard_similarity = self._calculate_jaccard_similarity_single(text, comp_text)
+                with scoring_stats.timer('analyzer.jaccard'):
+                    jaccard_similarity = self._calculate_jaccard_similarity_single(text, comp_text)
                 similarity_components['jaccard'] = jaccard_similarity
 
                 # 5) Semantic Boost
-                semantic_boost = semantic_enhancer.calculate_semantic_boost(
-                    original_text, orig_comp_text
-                )
+                with scoring_stats.timer('analyzer.semantic'):
+                    semantic_boost = semantic_enhancer.calculate_semantic_boost(
+                        original_text, orig_comp_text
+                    )
                 similarity_components['semantic'] = semantic_boost
 
                 # Combine with weights
                 weighted_similarity = sum(
-                    self.weights[key] * similarity_components.get(key, 0)
-                    for key in self.weights
+                    weights[key] * similarity_components.get(key, 0)
+                    for key in weights
                 )
                 
                 similarities.append(weighted_similarity)
@@ -366,8 +733,368 @@ class TextSimilarityAnalyzer:
 
         except Exception:
             # Fallback to Jaccard
+            scoring_stats.fallback('analyzer.calculate_similarity')
             return self._calculate_jaccard_similarity(text, comparison_texts)
 
+    @timed('analyzer.calculate_similarity_matrix')
+    @_delegate_to_worker(decode=np.asarray)
+    def calculate_similarity_matrix(self, texts_a, texts_b):
+        """
+        Calculate pairwise similarity scores between two lists of texts.
+        Each side is preprocessed and vectorized once and every component is computed
+        with matrix operations. Entry (i, j) is on the same 0-5 scale as
+        calculate_similarity(texts_a[i], [texts_b[j]]).
+        """
+        texts_a = list(texts_a or [])
+        texts_b = list(texts_b or [])
+        if not texts_a or not texts_b:
+            return np.zeros((len(texts_a), len(texts_b)))
+
+        processed_a = self.preprocess_many(texts_a)
+        processed_b = self.preprocess_many(texts_b)
+
+        raw_similarities = self._raw_similarity_matrix(texts_a, processed_a, texts_b, processed_b)
+        scores = np.round(self._transform_similarity_matrix(raw_similarities) * 5, 2)
+
+        valid_a = np.array([bool(p) for p in processed_a])
+        valid_b = np.array([bool(p) for p in processed_b])
+        scores[~valid_a, :] = 0
+        scores[:, ~valid_b] = 0
+
+        # Exact matches are a perfect similarity regardless of preprocessing
+        exact_matches = np.array(
+            [[bool(a) and a == b for b in texts_b] for a in texts_a]
+        )
+        scores[exact_matches] = 5.0
+
+        return scores
+
+    @timed('analyzer.calculate_similarity_batch')
+    @_delegate_to_worker(decode=np.asarray)
+    def calculate_similarity_batch(self, texts, comparison_texts):
+        """
+        Vectorized equivalent of calling calculate_similarity(text, comparison_texts)
+        for every text in texts. Returns an array with one 0-5 score per text.
+        """
+        return self._similarity_batch(texts, comparison_texts)[0]
+
+    @timed('analyzer.calculate_similarity_batch_with_pairs')
+    @_delegate_to_worker(decode=lambda result: (np.asarray(result[0]), np.asarray(result[1])))
+    def calculate_similarity_batch_with_pairs(self, texts, comparison_texts):
+        """
+        calculate_similarity_batch scores together with the pairwise 0-5 scores of
+        every text against every comparison text (as calculate_similarity_matrix
+        would return them), both from a single vectorization pass.
+        """
+        return self._similarity_batch(texts, comparison_texts, pairwise=True)
+
+    def _similarity_batch(self, texts, comparison_texts, pairwise=False):
+        """Scores of calculate_similarity_batch and, if requested, the pairwise score matrix."""
+        texts = list(texts or [])
+        comparison_texts = list(comparison_texts or [])
+        pairs = np.zeros((len(texts), len(comparison_texts))) if pairwise else None
+        present = [i for i, t in enumerate(comparison_texts) if t]
+        if not texts or not present:
+            return np.zeros(len(texts)), pairs
+
+        nonempty_comparisons = [comparison_texts[i] for i in present]
+        comparison_set = set(nonempty_comparisons)
+        processed_texts = self.preprocess_many(texts)
+        processed_comparisons = self.preprocess_many(nonempty_comparisons)
+        invalid_texts = [not p for p in processed_texts]
+        exact_texts = [bool(t) and t in comparison_set for t in texts]
+
+        if pairwise:
+            # Exact matches are a perfect similarity regardless of preprocessing
+            pairs[np.array([[bool(a) and a == b for b in comparison_texts] for a in texts])] = 5.0
+
+        valid_comparisons = [
+            i for i, processed in enumerate(processed_comparisons) if processed
+        ]
+        if not valid_comparisons:
+            return np.array([5.0 if exact else 0.0 for exact in exact_texts]), pairs
+
+        raw_similarities = self._raw_similarity_matrix(
+            texts, processed_texts,
+            [nonempty_comparisons[i] for i in valid_comparisons],
+            [processed_comparisons[i] for i in valid_comparisons]
+        )
+        # Take the max before the non-linear transform, as calculate_similarity does
+        scores = np.round(
+            self._transform_similarity_matrix(raw_similarities.max(axis=1)) * 5, 2
+        )
+        scores[invalid_texts] = 0
+        scores[exact_texts] = 5.0
+
+        if pairwise:
+            pair_scores = np.round(self._transform_similarity_matrix(raw_similarities) * 5, 2)
+            pair_scores[invalid_texts, :] = 0
+            columns = [present[i] for i in valid_comparisons]
+            exact_pairs = pairs[:, columns] == 5.0
+            pairs[:, columns] = np.where(exact_pairs, 5.0, pair_scores)
+
+        return scores, pairs
+
+    def _raw_similarity_matrix(self, texts_a, processed_a, texts_b, processed_b):
+        """
+        Weighted combination of all similarity components for every pair of texts,
+        before the non-linear transform. Falls back to Jaccard similarity on error.
+        """
+        try:
+            # Until the text models are fitted from the society corpus, score without them
+            fitted = self._ensure_vectorizers_fitted()
+            weights = self._component_weights(fitted)
+
+            similarity_components = {}
+
+            # 1) Neural Sentence Embedding Similarity (if available)
+            if self.sentence_model is not None:
+                with scoring_stats.timer('analyzer.matrix.embedding'):
+                    similarity_components['embedding'] = self._embedding_similarity_matrix(
+                        texts_a, texts_b
+                    )
+
+            if fitted:
+                # 2) TF-IDF Cosine Similarity
+                with scoring_stats.timer('analyzer.matrix.tfidf'):
+                    similarity_components['tfidf'] = cosine_similarity(
+                        self.tfidf_vectorizer.transform(processed_a),
+                        self.tfidf_vectorizer.transform(processed_b)
+                    )
+
+                # 3) Keyword Overlap
+                with scoring_stats.timer('analyzer.matrix.keyword'):
+                    similarity_components['keyword'] = self._set_overlap_matrix(
+                        self._keyword_indicator_matrix(processed_a, top_n=15, texts=texts_a),
+                        self._keyword_indicator_matrix(processed_b, top_n=15, texts=texts_b)
+                    )
+
+            # 4) Jaccard Similarity
+            with scoring_stats.timer('analyzer.matrix.jaccard'):
+                similarity_components['jaccard'] = self._set_overlap_matrix(
+                    *self._token_indicator_matrices(processed_a, processed_b)
+                )
+
+            # 5) Semantic Boost
+            with scoring_stats.timer('analyzer.matrix.semantic'):
+                similarity_components['semantic'] = semantic_enhancer.calculate_semantic_boost_matrix(
+                    texts_a, texts_b
+                )
+
+            weighted_similarities = np.zeros((len(texts_a), len(texts_b)))
+            for key in weights:
+                if key in similarity_components:
+                    weighted_similarities += weights[key] * similarity_components[key]
+
+            return weighted_similarities
+
+        except Exception:
+            # Fallback to Jaccard
+            scoring_stats.fallback('analyzer.calculate_similarity_matrix')
+            return self._set_overlap_matrix(
+                *self._token_indicator_matrices(processed_a, processed_b)
+            )
+
+    def _vectorizers_fitted(self):
+        return (hasattr(self.tfidf_vectorizer, 'vocabulary_') and
+                hasattr(self.count_vectorizer, 'vocabulary_'))
+
+    def _ensure_vectorizers_fitted(self):
+        """
+        True once the TF-IDF and keyword models are fitted. Before they were first
+        built and persisted, they are fitted here from the approved society
+        descriptions, keyed by society like update_corpus, and never from the texts
+        being scored. Returns False if there is nothing to fit on (or the database
+        cannot be read), so callers score with the other components.
+        """
+        if self._vectorizers_fitted():
+            return True
+
+        with self._text_model_lock:
+            if self._vectorizers_fitted():
+                return True
+            try:
+                societies = list(self._approved_society_texts())
+                processed = self.preprocess_many([description for _, description in societies])
+                documents = {
+                    society_id: text for (society_id, _), text in zip(societies, processed) if text
+                }
+                if not documents:
+                    return False
+                self.tfidf_vectorizer.fit(list(documents.values()), keys=list(documents))
+                self.count_vectorizer.fit(list(documents.values()), keys=list(documents))
+            except Exception:
+                scoring_stats.fallback('analyzer.fit_text_models')
+                return False
+            self._text_models_dirty = True
+        return True
+
+    @staticmethod
+    def _approved_society_texts():
+        """(society_id, description) pairs of the approved societies with a description."""
+        return Society.objects.filter(status="Approved").exclude(description='').values_list('id', 'description')
+
+    def _component_weights(self, fitted):
+        """
+        Weights of the similarity components; without fitted text models the TF-IDF
+        and keyword shares are spread over the remaining components.
+        """
+        if fitted:
+            return self.weights
+        weights = {key: weight for key, weight in self.weights.items() if key not in ('tfidf', 'keyword')}
+        total = sum(weights.values())
+        return {key: weight / total for key, weight in weights.items()} if total else weights
+
+    def _embedding_similarity_matrix(self, texts_a, texts_b):
+        """Cosine similarity between the sentence embeddings of two lists of texts."""
+        # Stored society vectors are compared in their (possibly quantized) storage format
+        if self.embedding_store.contains_texts(texts_a) and self.embedding_store.contains_texts(texts_b):
+            return self.embedding_store.similarity_matrix(texts_a, texts_b)
+
+        embeddings_a = self._embedding_matrix(texts_a)
+        embeddings_b = self._embedding_matrix(texts_b)
+        if embeddings_a is None or embeddings_b is None:
+            return np.zeros((len(texts_a), len(texts_b)))
+        return cosine_similarity(embeddings_a, embeddings_b)
+
+    def _embedding_matrix(self, texts):
+        """
+        Encode a list of texts in a single model call.
+        Empty texts get a zero vector so that their similarities come out as 0.
+        """
+        unique_texts = list(dict.fromkeys(t for t in texts if t))
+        if not unique_texts:
+            return None
+
+        vectors = {}
+        for text in unique_texts:
+            stored = self.embedding_store.get_by_text(text)
+            if stored is not None:
+                vectors[text] = stored
+
+        missing = [text for text in unique_texts if text not in vectors]
+        scoring_stats.cache_hit('analyzer.embedding_store', len(vectors))
+        scoring_stats.cache_miss('analyzer.embedding_store', len(missing))
+        if missing:
+            try:
+                with scoring_stats.timer('analyzer.encode'):
+                    encoded = self.sentence_model.encode(missing, convert_to_numpy=True)
+            except Exception:
+                scoring_stats.fallback('analyzer.encode')
+                return None
+            vectors.update(zip(missing, encoded))
+
+        dimension = len(next(iter(vectors.values())))
+        embeddings = np.zeros((len(texts), dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            if text:
+                embeddings[i] = vectors[text]
+        return embeddings
+
+    @_delegate_to_worker()
+    def update_society_embedding(self, society_id, description):
+        """
+        Encode and persist the embedding of one society description.
+        Does nothing when the stored vector is already up to date.
+        Returns True if the store was updated.
+        """
+        # Compare with the stored hash first: loading the model is only worth it for a changed text
+        if not description or not self.embedding_store.needs_update(society_id, description):
+            return False
+        if self.sentence_model is None:
+            return False
+
+        embedding = self.get_embedding(description)
+        if embedding is None:
+            return False
+
+        self.embedding_store.update(society_id, description, embedding)
+        return True
+
+    def rebuild_society_embeddings(self, societies):
+        """
+        Rebuild the embedding store from (society_id, description) pairs,
+        re-encoding only descriptions that changed. Returns the number of stored vectors.
+        """
+        if self.sentence_model is None:
+            return 0
+
+        return self.embedding_store.rebuild(
+            societies,
+            lambda texts: self.sentence_model.encode(texts, convert_to_numpy=True)
+        )
+
+    def _keyword_indicator_matrix(self, processed_texts, top_n=10, texts=None):
+        """
+        Sparse 0/1 matrix marking the top_n keywords of each processed text.
+        Keywords are chosen exactly like extract_keywords: by descending count,
+        ties broken alphabetically. Rows whose original text (from texts) has
+        primed keywords use those instead of counting.
+        """
+        texts = texts or [None] * len(processed_texts)
+        vocabulary = self.count_vectorizer.vocabulary_
+        primed = [self.keyword_cache.get(text) if text else None for text in texts]
+        to_count = [i for i, keywords in enumerate(primed) if keywords is None]
+
+        rows, cols = [], []
+        for i, keywords in enumerate(primed):
+            if keywords is not None:
+                columns = sorted({vocabulary[word] for word in keywords[:top_n] if word in vocabulary})
+                rows.extend([i] * len(columns))
+                cols.extend(columns)
+
+        if to_count:
+            counts = self.count_vectorizer.transform([processed_texts[i] for i in to_count]).tocsr()
+            feature_rank = self.count_vectorizer.feature_rank_
+            for row, i in enumerate(to_count):
+                start, end = counts.indptr[row], counts.indptr[row + 1]
+                indices = counts.indices[start:end]
+                frequencies = counts.data[start:end]
+                top = np.lexsort((feature_rank[indices], -frequencies))[:top_n]
+                top = top[frequencies[top] > 0]
+                rows.extend([i] * len(top))
+                cols.extend(indices[top])
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(processed_texts), len(self.count_vectorizer.get_feature_names_out()))
+        )
+
+    def _token_indicator_matrices(self, texts_a, texts_b):
+        """Sparse 0/1 word-presence matrices for two lists of texts over a shared vocabulary."""
+        vocabulary = {}
+
+        def build(texts):
+            rows, cols = [], []
+            for i, text in enumerate(texts):
+                for token in set(text.split()):
+                    rows.append(i)
+                    cols.append(vocabulary.setdefault(token, len(vocabulary)))
+            return rows, cols
+
+        rows_a, cols_a = build(texts_a)
+        rows_b, cols_b = build(texts_b)
+        n_tokens = max(len(vocabulary), 1)
+
+        indicators_a = sparse.csr_matrix(
+            (np.ones(len(rows_a)), (rows_a, cols_a)), shape=(len(texts_a), n_tokens)
+        )
+        indicators_b = sparse.csr_matrix(
+            (np.ones(len(rows_b)), (rows_b, cols_b)), shape=(len(texts_b), n_tokens)
+        )
+        return indicators_a, indicators_b
+
+    def _set_overlap_matrix(self, indicators_a, indicators_b):
+        """Pairwise Jaccard index (intersection over union) between rows of two 0/1 matrices."""
+        intersection = (indicators_a @ indicators_b.T).toarray()
+        sizes_a = np.asarray(indicators_a.sum(axis=1)).reshape(-1, 1)
+        sizes_b = np.asarray(indicators_b.sum(axis=1)).reshape(1, -1)
+        union = sizes_a + sizes_b - intersection
+
+        overlap = np.zeros_like(intersection, dtype=float)
+        np.divide(intersection, union, out=overlap, where=union > 0)
+        return overlap
+
     def _calculate_tfidf_similarity(self, text1, text2):
         """Calculate cosine similarity using TF-IDF vectors."""
         try:
@@ -376,6 +1103,7 @@ class TextSimilarityAnalyzer:
             similarity = cosine_similarity(vector1, vector2)[0][0]
             return similarity
         except Exception:
+            scoring_stats.fallback('analyzer.tfidf')
             return 0
 
     def _calculate_keyword_overlap(self, text1, text2):
@@ -394,6 +1122,7 @@ class TextSimilarityAnalyzer:
             return similarity
 
         except Exception:
+            scoring_stats.fallback('analyzer.keyword')
             return 0
 
     def _calculate_jaccard_similarity_single(self, text1, text2):
@@ -424,6 +1153,14 @@ class TextSimilarityAnalyzer:
         transformed = 0.2 + (0.8 * (1 / (1 + np.exp(-12 * (similarity - 0.5)))))
         return min(transformed, 1.0)
 
+    def _transform_similarity_matrix(self, similarities):
+        """Vectorized version of _transform_similarity_score."""
+        similarities = np.asarray(similarities, dtype=float)
+        transformed = 0.2 + (0.8 * (1 / (1 + np.exp(-12 * (similarities - 0.5)))))
+        transformed = np.minimum(transformed, 1.0)
+        transformed = np.where(similarities <= 0.2, similarities * 1.5, transformed)
+        return np.where(similarities >= 0.9, 1.0, transformed)
+
     def _calculate_jaccard_similarity(self, text, comparison_texts):
         """
         Calculate Jaccard similarity as a fallback. 
@@ -450,5 +1187,5 @@ class TextSimilarityAnalyzer:
         return result
 
 
-# Create a singleton instance for reuse
-text_similarity_analyzer = TextSimilarityAnalyzer()
\ No newline at end of file
+# Create a singleton instance for reuse; models load on first use or via warm_up()
+text_similarity_analyzer = TextSimilarityAnalyzer(lazy=True)
\ No newline at end of file
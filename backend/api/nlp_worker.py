@@ -0,0 +1,188 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+import numpy as np
+
+
+# Analyzer methods a web worker may run in the scoring worker
+WORKER_METHODS = (
+    'calculate_similarity',
+    'calculate_similarity_matrix',
+    'calculate_similarity_batch',
+    'calculate_similarity_batch_with_pairs',
+    'get_embedding',
+    'update_society_text',
+    'remove_society_text',
+    'update_society_embedding',
+)
+
+_HEADER = struct.Struct('>I')
+
+
+class NLPWorkerUnavailable(Exception):
+    """The scoring worker could not be reached or failed to answer a request."""
+
+
+def _to_json(value):
+    """Convert numpy results to plain JSON types."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+
+def _send_message(sock, payload):
+    data = json.dumps(payload).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _receive_message(sock):
+    (size,) = _HEADER.unpack(_receive_exactly(sock, _HEADER.size))
+    return json.loads(_receive_exactly(sock, size).decode('utf-8'))
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Answers length-prefixed JSON requests until the client disconnects."""
+
+    def handle(self):
+        while True:
+            try:
+                request = _receive_message(self.request)
+            except (ConnectionError, OSError, ValueError, struct.error):
+                return
+
+            method = request.get('method')
+            if method == 'ping':
+                response = {'result': 'pong'}
+            elif method not in WORKER_METHODS:
+                response = {'error': f'Unknown method: {method}'}
+            else:
+                try:
+                    result = getattr(self.server.analyzer, method)(*request.get('args', []))
+                    response = {'result': _to_json(result)}
+                except Exception as e:
+                    response = {'error': str(e)}
+
+            try:
+                _send_message(self.request, response)
+            except OSError:
+                return
+
+
+class NLPScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Long-running scoring service holding the single TextSimilarityAnalyzer of the host.
+    Web workers connect over a Unix socket; each connection gets its own thread,
+    and the numpy/BLAS-heavy scoring releases the GIL while it runs. Incremental
+    text model changes are saved every save_interval seconds and on shutdown.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, analyzer, save_interval=300):
+        self.analyzer = analyzer
+        self.socket_path = socket_path
+        self.save_interval = save_interval
+        self._next_save = time.monotonic() + save_interval
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        super().__init__(socket_path, _RequestHandler)
+
+    def service_actions(self):
+        """Called by serve_forever() between requests."""
+        if time.monotonic() >= self._next_save:
+            self._next_save = time.monotonic() + self.save_interval
+            self.analyzer.save_text_models()
+
+    def server_close(self):
+        super().server_close()
+        self.analyzer.save_text_models()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class NLPScoringClient:
+    """
+    Client used by the analyzer in web workers to run scoring in the shared worker.
+    After a failure the worker is skipped for retry_interval seconds, so an
+    unreachable worker costs one failed connection instead of one per request.
+    """
+
+    def __init__(self, socket_path, timeout=10.0, retry_interval=30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+        self._local = threading.local()
+
+    def call(self, method, *args):
+        """Run an analyzer method in the worker and return its JSON result."""
+        if time.monotonic() < self._unavailable_until:
+            raise NLPWorkerUnavailable('NLP worker recently unavailable')
+
+        request = {'method': method, 'args': _to_json(list(args))}
+        # A kept-alive connection may have been closed by a worker restart: retry once on a new one
+        attempts = 2 if getattr(self._local, 'sock', None) is not None else 1
+        for attempt in range(attempts):
+            try:
+                sock = self._connection()
+                _send_message(sock, request)
+                response = _receive_message(sock)
+                break
+            except (OSError, ValueError, struct.error) as e:
+                self._close_connection()
+                if attempt == attempts - 1:
+                    self._unavailable_until = time.monotonic() + self.retry_interval
+                    raise NLPWorkerUnavailable(str(e)) from e
+
+        if 'error' in response:
+            raise NLPWorkerUnavailable(response['error'])
+        return response['result']
+
+    def ping(self):
+        """True if the worker answers."""
+        try:
+            return self.call('ping') == 'pong'
+        except NLPWorkerUnavailable:
+            return False
+
+    def _connection(self):
+        """Reuse one connection per thread."""
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close_connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self._local.sock = None
@@ -0,0 +1,70 @@
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+
+from .society_similarity_matrix import society_similarity_matrix
+
+
+class RecommendationCache:
+    """
+    Caches a student's computed recommendations in Django's cache framework, keyed
+    by student, limit and diversity level. All results of one student live in one
+    entry, so a membership, attendance or feedback change drops them with a single
+    delete. Entries are also tagged with the similarity model version (the stored
+    similarity matrix's modification time) and a catalog token, so rebuilding the
+    model or editing societies invalidates every student at once.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'RECOMMENDATION_CACHE_TIMEOUT', 3600
+        )
+        self.key_prefix = 'recommendations'
+
+    def _student_key(self, student_id):
+        return f'{self.key_prefix}:student:{student_id}'
+
+    def _catalog_key(self):
+        return f'{self.key_prefix}:catalog'
+
+    def model_version(self):
+        """Version of the similarity model the cached results were computed with."""
+        try:
+            return society_similarity_matrix.model_version()
+        except Exception:
+            return None
+
+    def _version(self):
+        catalog_token = cache.get(self._catalog_key())
+        if catalog_token is None:
+            # A missing token (first use or evicted) must not match any existing entry
+            cache.add(self._catalog_key(), uuid.uuid4().hex, None)
+            catalog_token = cache.get(self._catalog_key())
+        return (self.model_version(), catalog_token)
+
+    def get(self, student_id, limit, diversity_level):
+        """Cached recommendations, or None if missing or computed with an outdated model."""
+        entry = cache.get(self._student_key(student_id))
+        if not entry or entry.get('version') != self._version():
+            return None
+        return entry['results'].get(f'{limit}:{diversity_level}')
+
+    def set(self, student_id, limit, diversity_level, recommendations):
+        version = self._version()
+        entry = cache.get(self._student_key(student_id))
+        if not entry or entry.get('version') != version:
+            entry = {'version': version, 'results': {}}
+        entry['results'][f'{limit}:{diversity_level}'] = recommendations
+        cache.set(self._student_key(student_id), entry, self.timeout)
+
+    def invalidate_student(self, *student_ids):
+        """Drop the cached recommendations of the given students."""
+        cache.delete_many([self._student_key(student_id) for student_id in student_ids])
+
+    def invalidate_all(self):
+        """Invalidate every student's cached recommendations."""
+        cache.set(self._catalog_key(), uuid.uuid4().hex, None)
+
+
+# Create a singleton instance for reuse
+recommendation_cache = RecommendationCache()
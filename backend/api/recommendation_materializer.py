@@ -0,0 +1,160 @@
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .collaborative_filtering import society_cooccurrence
+from .models import MaterializedRecommendation, Society, Student
+from .nlp_similarity import text_similarity_analyzer
+from .recommendation_service import POPULAR_EXPLANATION, SocietyRecommender
+from .society_profile_store import society_profile_store
+
+
+class RecommendationMaterializer:
+    """
+    Precomputes the top-N recommendations of every active student into the
+    MaterializedRecommendation table, so recommendation requests can read them
+    instead of scoring. A run loads the models and the approved societies (with
+    their recent event counts and semantic profiles) once and scores every
+    student against that shared catalog, optionally in several forked processes.
+    """
+
+    def __init__(self, count=20, max_age_hours=None):
+        self.count = count
+        self.max_age = datetime.timedelta(hours=max_age_hours if max_age_hours is not None else getattr(
+            settings, 'MATERIALIZED_RECOMMENDATION_MAX_AGE_HOURS', 26
+        ))
+
+    def get(self, student_id, limit, diversity_level='balanced'):
+        """
+        Fresh materialized rows covering the first `limit` recommendations of a
+        student, in rank order, or None if the student must be scored online.
+        """
+        rows = list(
+            MaterializedRecommendation.objects.filter(
+                student_id=student_id,
+                diversity_level=diversity_level,
+                computed_at__gte=timezone.now() - self.max_age
+            ).select_related('society').order_by('rank')
+        )
+        if not rows:
+            return None
+        # A full list may have been cut at the materialized count; a shorter one is exhaustive
+        if limit > len(rows) and len(rows) >= self.count:
+            return None
+        return [row for row in rows if row.society.status == "Approved"][:limit]
+
+    def materialize(self, student_ids=None, diversity_level='balanced', processes=1):
+        """
+        Recompute and store the recommendations of the given (default: all active)
+        students. Returns the number of students materialized.
+        """
+        if student_ids is None:
+            student_ids = list(Student.objects.filter(is_active=True).values_list('id', flat=True))
+        if not student_ids:
+            return 0
+
+        # Co-membership scores only come from a built model; lookups never build it
+        society_cooccurrence.refresh()
+
+        if processes > 1 and len(student_ids) > 1:
+            # Load the models before forking so every worker shares them
+            text_similarity_analyzer.warm_up()
+            chunks = [student_ids[i::processes] for i in range(processes)]
+            connections.close_all()
+            results = {}
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                for chunk_results in executor.map(self.compute, chunks, repeat(diversity_level)):
+                    results.update(chunk_results)
+        else:
+            results = self.compute(student_ids, diversity_level)
+
+        self.store(results, diversity_level)
+        return len(results)
+
+    def compute(self, student_ids, diversity_level='balanced'):
+        """
+        Recommendations of the given students as {student_id: [(society_id, score,
+        explanation_type, explanation_message), ...]} in rank order.
+        """
+        recommender = SocietyRecommender()
+        recommender.set_diversity_level(diversity_level)
+
+        thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
+        catalog = {
+            society.id: society
+            for society in Society.objects.filter(status="Approved").annotate(
+                recent_event_count=Count('events', filter=Q(events__date__gte=thirty_days_ago))
+            ).order_by('id')
+        }
+        try:
+            society_profile_store.get_profiles(catalog.values())
+        except Exception:
+            pass
+
+        popular = [
+            (society.id, float(society.popularity_score or 0), POPULAR_EXPLANATION["type"],
+             POPULAR_EXPLANATION["message"])
+            for society in recommender.get_popular_societies(self.count)
+        ]
+
+        results = {}
+        students = Student.objects.filter(id__in=student_ids).prefetch_related('societies')
+        for student in students:
+            joined_societies = list(student.societies.all())
+            if not joined_societies:
+                results[student.id] = popular
+                continue
+
+            joined_ids = {society.id for society in joined_societies}
+            available_ids = [society_id for society_id in catalog if society_id not in joined_ids]
+            candidate_ids = recommender.nearest_candidate_ids(available_ids, joined_ids)
+            candidates = [
+                catalog[society_id] for society_id in available_ids
+                if candidate_ids is None or society_id in candidate_ids
+            ]
+
+            selected = recommender.recommend_from_candidates(
+                student, joined_societies, candidates, self.count
+            ) if candidates else []
+            results[student.id] = [
+                (item['society'].id, float(item['score']), item['explanation']['type'],
+                 item['explanation']['message'])
+                for item in selected
+            ]
+
+        return results
+
+    def store(self, results, diversity_level='balanced'):
+        """Replace the materialized rows of the students in results."""
+        computed_at = timezone.now()
+        rows = [
+            MaterializedRecommendation(
+                student_id=student_id,
+                diversity_level=diversity_level,
+                rank=rank,
+                society_id=society_id,
+                score=score,
+                explanation_type=explanation_type,
+                explanation_message=explanation_message[:255],
+                computed_at=computed_at
+            )
+            for student_id, recommendations in results.items()
+            for rank, (society_id, score, explanation_type, explanation_message)
+            in enumerate(recommendations, start=1)
+        ]
+        with transaction.atomic():
+            MaterializedRecommendation.objects.filter(
+                student_id__in=list(results), diversity_level=diversity_level
+            ).delete()
+            MaterializedRecommendation.objects.bulk_create(rows, batch_size=1000)
+
+
+# Create a singleton instance for reuse
+recommendation_materializer = RecommendationMaterializer()
@@ -1,14 +1,35 @@
 from django.db.models import Count, Sum, Q, Case, When, Value, IntegerField, F
 from collections import Counter, defaultdict
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 import numpy as np
 import datetime
 
-from .models import Society, Student
+from .models import Event, Society, Student, RecommendationFeedback, MaterializedRecommendation
 from .nlp_similarity import text_similarity_analyzer
+from .scoring_stats import scoring_stats, timed
 from .semantic_enhancer import semantic_enhancer
+from .society_similarity_matrix import society_similarity_matrix
+from .society_profile_store import society_profile_store
+from .society_stats import society_stats_store
+from .feature_scoring import FeatureScoringEngine
+from .mmr_reranker import MMRReranker
+from .similarity_cache import society_similarity_cache
+from .collaborative_filtering import society_cooccurrence
+from .matrix_factorization import factor_model
+from .recommendation_cache import recommendation_cache
+from .background_refresh import BackgroundRefresh
+from .vector_index import SocietyVectorIndex, RandomProjectionLSH, society_vector_index
+
+POPULAR_EXPLANATION = {
+    "type": "popular",
+    "message": "Popular society with many members"
+}
+FACTORIZATION_EXPLANATION = {
+    "type": "collaborative",
+    "message": "Popular with students who share your interests"
+}
 
 class SocietyRecommender:
     """
@@ -23,55 +44,31 @@ class SocietyRecommender:
         
         self.activity_half_life = 90  
         
-        self.society_similarities = {}
+        # Above candidate_pool_size unjoined societies, only the nearest ones are scored;
+        # above lsh_threshold indexed societies, the index uses approximate search
+        self.candidate_pool_size = 300
+        self.lsh_threshold = 5000
+        
+        self.scoring_engine = FeatureScoringEngine()
+    
+    @property
+    def vector_index(self):
+        """The process-wide nearest-society index (None until first built)."""
+        return society_vector_index.index
     
     def get_popular_societies(self, limit=5, with_recent_boost=True):
         """
         Get the most popular societies based on membership count, event count, and 
         event attendance. Now includes a recency boost factor for recent activities.
+        Reads the materialized SocietyStats, so this is one indexed ORDER BY.
         """
-        base_query = Society.objects.filter(status="Approved")
-        
-        societies = base_query.annotate(
-            total_members=Count("society_members"),
-            total_events=Count("events"),
-            total_event_attendance=Sum("events__current_attendees")
-        )
-        
-        if with_recent_boost:
-            thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
-            societies = societies.annotate(
-                recent_events=Count(
-                    'events', 
-                    filter=Q(events__date__gte=thirty_days_ago)
-                ),
-                recent_members=Count(
-                    'society_members',
-                    filter=Q(society_members__date_joined__gte=thirty_days_ago)
-                )
-            )
-            
-            popular_societies = societies.annotate(
-                popularity_score=(
-                    (2 * F('total_members')) +
-                    (3 * F('total_events')) +
-                    (4 * F('total_event_attendance')) +
-                    (5 * F('recent_events')) +  
-                    (3 * F('recent_members'))   
-                )
-            )
-        else:
-            popular_societies = societies.annotate(
-                popularity_score=(
-                    (2 * F('total_members')) +
-                    (3 * F('total_events')) +
-                    (4 * F('total_event_attendance'))
-                )
-            )
-        
-        return popular_societies.order_by("-popularity_score")[:limit]
+        return society_stats_store.popular_societies(
+            Society.objects.filter(status="Approved"), with_recent_boost=with_recent_boost
+        )[:limit]
     
-    def get_recommendations_for_student(self, student_id, limit=5, diversity_level='balanced'):
+    @timed('recommender.get_recommendations')
+    def get_recommendations_for_student(self, student_id, limit=5, diversity_level='balanced',
+                                         mode='content'):
         """
         Get society recommendations for a specific student using a multi-dimensional approach.
         Balances recommendations across different interest categories.
@@ -80,61 +77,202 @@ class SocietyRecommender:
             student_id: ID of the student
             limit: Maximum number of recommendations to return
             diversity_level: 'low', 'balanced', or 'high' to control recommendation diversity
+            mode: 'content' to score candidates, or 'factorization' to rank with the trained
+                  matrix factorization model (falling back to 'content' for students it lacks)
         """
+        if mode == 'factorization':
+            recommendations = self.get_factorization_recommendations(student_id, limit)
+            if recommendations is not None:
+                return recommendations
+        
         try:
             student = Student.objects.get(id=student_id)
             
-            if diversity_level == 'low':
-                self.mmr_lambda = 0.9  
-            elif diversity_level == 'high':
-                self.mmr_lambda = 0.5  
-            else:  
-                self.mmr_lambda = 0.7  
+            self.set_diversity_level(diversity_level)
             
-            if not student.societies.exists():
-                return self.get_popular_societies(limit)
+            joined_societies = list(student.societies.all())
             
-            joined_societies = student.societies.all()
-            
-            joined_categories = set(joined_societies.values_list('category', flat=True))
+            if not joined_societies:
+                return self._popular_with_explanations(limit)
             
             available_societies = Society.objects.filter(
                 status="Approved"
             ).exclude(
-                id__in=joined_societies.values_list('id', flat=True)
+                id__in=[society.id for society in joined_societies]
             )
             
             if not available_societies.exists():
                 return []
             
-            society_scores = []
-            
-            for society in available_societies:
-                score = self._calculate_similarity_score(society, joined_societies, student)
-                society_scores.append({
-                    'society': society,
-                    'score': score,
-                    'category': society.category
-                })
+            # One query for all candidates, with their recent event counts annotated
+            thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
+            available_societies = list(
+                self._limit_candidates(available_societies, joined_societies).annotate(
+                    recent_event_count=Count('events', filter=Q(events__date__gte=thirty_days_ago))
+                )
+            )
             
-            selected_societies = self._mmr_selection(society_scores, joined_societies, limit)
+            # Stored semantic profiles spare the scoring below from reparsing descriptions
+            try:
+                with scoring_stats.timer('recommender.profiles'):
+                    society_profile_store.load_profiles(available_societies + joined_societies)
+            except Exception:
+                scoring_stats.fallback('recommender.profiles')
             
-            for item in selected_societies:
-                explanation = self._get_recommendation_explanation_details(
-                    item['society'], joined_societies
-                )
-                item['explanation'] = explanation
-                setattr(item['society'], '_recommendation_explanation', explanation)
+            selected_societies = self.recommend_from_candidates(
+                student, joined_societies, available_societies, limit
+            )
             
             return [item['society'] for item in selected_societies]
             
         except Student.DoesNotExist:
-            return self.get_popular_societies(limit)
+            return self._popular_with_explanations(limit)
     
+    @timed('recommender.factorization')
+    def get_factorization_recommendations(self, student_id, limit=5):
+        """
+        Rank every approved society for a student with one product of the student's
+        factor vector and the society factor matrix (see train_matrix_factorization).
+        Returns None when no model is trained or the student was not part of it.
+        """
+        joined_ids = set(
+            Student.societies.through.objects.filter(student_id=student_id).values_list('society_id', flat=True)
+        )
+        ranked = factor_model.rank(
+            student_id, limit, exclude_ids=joined_ids,
+            candidate_ids=Society.objects.filter(status="Approved").values_list('id', flat=True)
+        )
+        if ranked is None:
+            return None
+        
+        societies = Society.objects.in_bulk([society_id for society_id, _ in ranked])
+        recommendations = []
+        for society_id, _ in ranked:
+            if society_id in societies:
+                society = societies[society_id]
+                society._recommendation_explanation = dict(FACTORIZATION_EXPLANATION)
+                recommendations.append(society)
+        return recommendations
+    
+    def _popular_with_explanations(self, limit):
+        """Popular societies, each carrying the explanation of a popularity-based recommendation."""
+        societies = list(self.get_popular_societies(limit))
+        for society in societies:
+            society._recommendation_explanation = dict(POPULAR_EXPLANATION)
+        return societies
+    
+    def set_diversity_level(self, diversity_level):
+        """Set the MMR relevance/diversity trade-off for 'low', 'balanced' or 'high' diversity."""
+        if diversity_level == 'low':
+            self.mmr_lambda = 0.9  
+        elif diversity_level == 'high':
+            self.mmr_lambda = 0.5  
+        else:  
+            self.mmr_lambda = 0.7  
+    
+    def recommend_from_candidates(self, student, joined_societies, candidates, limit=5):
+        """
+        Score, diversify and explain already loaded candidates (with their
+        recent_event_count annotation) for a student with joined societies.
+        Returns the selected items ({'society', 'score', 'category', 'explanation'})
+        in recommendation order. Batch jobs load the candidates once and call this
+        for every student. Explanations are built from the features computed while
+        scoring, so they cost no further queries or NLP calls.
+        """
+        society_scores = self._score_candidates(candidates, joined_societies, student)
+        
+        selected_societies = self._mmr_selection(society_scores, joined_societies, limit)
+        
+        for item in selected_societies:
+            explanation = self._get_recommendation_explanation_details(
+                item['society'], joined_societies, item.get('description_similarities')
+            )
+            item['explanation'] = explanation
+            setattr(item['society'], '_recommendation_explanation', explanation)
+        
+        return selected_societies
+    
+    def _score_candidates(self, candidates, joined_societies, student):
+        """
+        Score all candidates in a single pass. Per-student inputs (joined categories
+        and tags, attended-event categories) are computed once, descriptions are
+        compared in one batched call, and recent event counts come from the
+        recent_event_count annotation, so the number of queries does not grow
+        with the number of candidates. The scores themselves are one weighted
+        product over the candidates' feature matrix.
+        """
+        context = self._scoring_context(joined_societies, student)
+        
+        # Score every candidate description against the joined societies in one call; the
+        # per-joined-society scores are kept for the explanations
+        with scoring_stats.timer('recommender.description_similarity'):
+            desc_similarities, pair_similarities = (
+                text_similarity_analyzer.calculate_similarity_batch_with_pairs(
+                    [society.description for society in candidates],
+                    context['joined_descriptions']
+                )
+            )
+        
+        with scoring_stats.timer('recommender.scoring'):
+            scores = self.scoring_engine.score(candidates, context, desc_similarities)
+        
+        return [
+            {
+                'society': society,
+                'score': float(score),
+                'category': society.category,
+                'description_similarities': pair_similarities[i],
+            }
+            for i, (society, score) in enumerate(zip(candidates, scores))
+        ]
+    
+    def _scoring_context(self, joined_societies, student=None):
+        """Per-request inputs of _calculate_similarity_score that do not depend on the candidate."""
+        joined_societies = list(joined_societies)
+        joined_tags = set()
+        for s in joined_societies:
+            if s.tags:
+                joined_tags.update(s.tags)
+        
+        attended_event_categories = set()
+        if student and hasattr(student, 'attended_events'):
+            attended_event_categories = {
+                category for category in student.attended_events.filter(
+                    hosted_by__isnull=False
+                ).values_list('hosted_by__category', flat=True)
+                if category
+            }
+        
+        joined_descriptions = [
+            s.description for s in joined_societies
+            if hasattr(s, 'description') and s.description
+        ]
+        
+        # "Students who joined X also joined Y": O(k) precomputed neighbors per joined society
+        try:
+            with scoring_stats.timer('recommender.co_membership'):
+                co_membership_scores = society_cooccurrence.scores_for(s.id for s in joined_societies)
+        except Exception:
+            scoring_stats.fallback('recommender.co_membership')
+            co_membership_scores = {}
+        
+        return {
+            'joined_categories': {s.category for s in joined_societies},
+            'joined_tags': joined_tags,
+            'joined_descriptions': joined_descriptions,
+            'identical_descriptions': all(d == joined_descriptions[0] for d in joined_descriptions),
+            'semantic_texts': [s.name + " " + (s.category or "") for s in joined_societies],
+            'attended_event_categories': attended_event_categories,
+            'co_membership_scores': co_membership_scores,
+        }
+    
+    @timed('recommender.mmr')
     def _mmr_selection(self, society_scores, joined_societies, limit):
         """
         Selects recommendations using Maximal Marginal Relevance algorithm,
         which balances relevance with diversity.
+        Relevance is the score boosted for under-represented joined categories;
+        the incremental reranker fetches one similarity row per selected society.
         """
         if not society_scores:
             return []
@@ -155,131 +293,102 @@ class SocietyRecommender:
             else:
                 category_weights[category] = 1.0
         
-        selected = []
-        remaining = society_scores.copy()
-        
-        def compute_society_similarity(society1, society2):
-            pair_key = tuple(sorted([society1.id, society2.id]))
-            if pair_key in self.society_similarities:
-                return self.society_similarities[pair_key]
-                
-            if (hasattr(society1, 'description') and society1.description and 
-                hasattr(society2, 'description') and society2.description):
-                
-                similarity = text_similarity_analyzer.calculate_similarity(
-                    society1.description, [society2.description]
-                ) / 5.0  
-            else:
-                s1_tags = set(society1.tags or [])
-                s2_tags = set(society2.tags or [])
-                tag_sim = len(s1_tags.intersection(s2_tags)) / max(1, len(s1_tags.union(s2_tags)))
-                cat_sim = 1.0 if society1.category == society2.category else 0.0
-                similarity = 0.6 * cat_sim + 0.4 * tag_sim
-                
-            self.society_similarities[pair_key] = similarity
-            return similarity
-        
-        while len(selected) < limit and remaining:
-            max_mmr = -1
-            max_idx = -1
-            
-            for i, item in enumerate(remaining):
-                society = item['society']
-                score = item['score']
-                
-                if society.category in category_weights:
-                    score *= category_weights[society.category]
-                
-                relevance = score
-                
-                if not selected:
-                    mmr_score = relevance
-                else:
-                    max_similarity = max(
-                        compute_society_similarity(society, sel['society'])
-                        for sel in selected
-                    )
-                    
-                    mmr_score = (self.mmr_lambda * relevance) - ((1 - self.mmr_lambda) * max_similarity)
-                
-                if mmr_score > max_mmr:
-                    max_mmr = mmr_score
-                    max_idx = i
-            
-            if max_idx >= 0:
-                selected.append(remaining.pop(max_idx))
-            else:
-                break
+        relevance = [
+            item['score'] * category_weights.get(item['society'].category, 1.0)
+            for item in society_scores
+        ]
+        societies = [item['society'] for item in society_scores]
         
-        return selected
+        society_similarity_matrix.refresh()
+        society_similarity_cache.sync()
+        
+        def similarity_row(picked, remaining_indices):
+            return self._society_similarity_row(
+                societies[picked], [societies[i] for i in remaining_indices]
+            )
+        
+        selected = MMRReranker(self.mmr_lambda).rerank(relevance, similarity_row, limit)
+        return [society_scores[i] for i in selected]
     
-    def _calculate_similarity_score(self, society, joined_societies, student=None):
+    def _society_similarity_row(self, society, others):
+        """
+        0-1 similarities of one society to several others. Pairs come from the
+        process-wide pair cache, then the stored similarity matrix; the rest are
+        scored in one batched NLP call, or by shared category and tags when a
+        description is missing.
+        """
+        similarities = np.zeros(len(others))
+        uncached = []
+        
+        stored = society_similarity_matrix.get_row(society.id, [other.id for other in others])
+        for i, other in enumerate(others):
+            cached = society_similarity_cache.get(society.id, other.id)
+            if cached is not None:
+                similarities[i] = cached
+                continue
+            if not np.isnan(stored[i]):
+                scoring_stats.cache_hit('recommender.similarity_matrix')
+                similarities[i] = float(stored[i])
+            elif (hasattr(society, 'description') and society.description and
+                  hasattr(other, 'description') and other.description):
+                scoring_stats.cache_miss('recommender.similarity_matrix')
+                uncached.append(i)
+                continue
+            else:
+                scoring_stats.cache_miss('recommender.similarity_matrix')
+                similarities[i] = self._tag_category_similarity(society, other)
+            society_similarity_cache.set(society.id, other.id, similarities[i])
+        
+        if uncached:
+            scores = text_similarity_analyzer.calculate_similarity_matrix(
+                [society.description], [others[i].description for i in uncached]
+            )[0] / 5.0
+            for i, similarity in zip(uncached, scores):
+                similarities[i] = float(similarity)
+                society_similarity_cache.set(society.id, others[i].id, similarities[i])
+        
+        return similarities
+    
+    def _tag_category_similarity(self, society1, society2):
+        """Fallback 0-1 similarity from shared category and tags, for societies without descriptions."""
+        s1_tags = set(society1.tags or [])
+        s2_tags = set(society2.tags or [])
+        tag_sim = len(s1_tags.intersection(s2_tags)) / max(1, len(s1_tags.union(s2_tags)))
+        cat_sim = 1.0 if society1.category == society2.category else 0.0
+        return 0.6 * cat_sim + 0.4 * tag_sim
+    
+    def _calculate_similarity_score(self, society, joined_societies, student=None, desc_similarity=None,
+                                    context=None):
         """
         Calculate similarity score between a society and the societies a student has joined.
         Now includes temporal weighting and event attendance.
         Higher score means more similar/relevant.
+        Scores one society through the same feature engine as _score_candidates.
+        A precomputed desc_similarity (e.g. from calculate_similarity_batch) skips the
+        per-society NLP call, a context from _scoring_context skips the per-student
+        work, and a recent_event_count annotation on the society skips the event query.
         """
-        total_score = 0
-        
-        joined_categories = [s.category for s in joined_societies]
-        joined_tags = []
-        for s in joined_societies:
-            if s.tags:
-                joined_tags.extend(s.tags)
-        
-        if society.category in joined_categories:
-            total_score += 3
-        
-        society_tags = society.tags or []
-        matching_tags = sum(1 for tag in society_tags if tag in joined_tags)
-        total_score += matching_tags * 2
-        
-        if hasattr(society, 'description') and society.description:
-            joined_descriptions = [s.description for s in joined_societies if hasattr(s, 'description') and s.description]
-            
-            if joined_descriptions:
-                desc_similarity = text_similarity_analyzer.calculate_similarity(
-                    society.description, 
-                    joined_descriptions
-                )
-                
-                total_score += desc_similarity * 1.5
-                
-                if all(d == joined_descriptions[0] for d in joined_descriptions):
-                    for joined_society in joined_societies:
-                        semantic_boost = semantic_enhancer.calculate_semantic_boost(
-                            society.name + " " + (society.category or ""),
-                            joined_society.name + " " + (joined_society.category or "")
-                        )
-                        total_score += semantic_boost * 3
-        
-        if student and hasattr(student, 'attended_events') and student.attended_events.exists():
-            attended_event_categories = set()
-            for event in student.attended_events.all():
-                if event.hosted_by and event.hosted_by.category:
-                    attended_event_categories.add(event.hosted_by.category)
-                    
-            if society.category in attended_event_categories:
-                total_score += 2
-                
-        recent_activities = 0
-        society_age_boost = 1.0
-        
-        thirty_days_ago = timezone.now() - datetime.timedelta(days=30)
-        recent_events = society.events.filter(date__gte=thirty_days_ago).count()
-        recent_activities += recent_events
-            
-        if recent_activities > 0:
-            society_age_boost = 1.2  
-        
-        total_score *= society_age_boost
+        if context is None:
+            context = self._scoring_context(joined_societies, student)
+        
+        if (desc_similarity is None and context['joined_descriptions']
+                and hasattr(society, 'description') and society.description):
+            desc_similarity = text_similarity_analyzer.calculate_similarity(
+                society.description, 
+                context['joined_descriptions']
+            )
         
-        return total_score
+        return float(self.scoring_engine.score([society], context, [desc_similarity or 0.0])[0])
     
-    def _get_recommendation_explanation_details(self, society, joined_societies):
+    @timed('recommender.explanation')
+    def _get_recommendation_explanation_details(self, society, joined_societies,
+                                                description_similarities=None):
         """
         Generate detailed explanation data for why a society is recommended.
         Returns a dictionary with explanation details for later use.
+        description_similarities are the 0-5 similarities of the society's description
+        to each joined society with a description, in order, as computed while
+        scoring; without them they are computed here.
         """
         explanation = {
             "type": "general",
@@ -316,15 +425,22 @@ class SocietyRecommender:
         max_similarity = 0
         most_similar_society = None
         
-        for joined_society in joined_societies:
-            if hasattr(society, 'description') and society.description and hasattr(joined_society, 'description') and joined_society.description:
-                similarity = text_similarity_analyzer.calculate_similarity(
-                    society.description,
-                    [joined_society.description]
-                )
-                
+        described_joined = [
+            s for s in joined_societies if hasattr(s, 'description') and s.description
+        ]
+        if hasattr(society, 'description') and society.description and described_joined:
+            if description_similarities is None:
+                description_similarities = [
+                    text_similarity_analyzer.calculate_similarity(
+                        society.description,
+                        [joined_society.description]
+                    )
+                    for joined_society in described_joined
+                ]
+            
+            for joined_society, similarity in zip(described_joined, description_similarities):
                 if similarity > max_similarity:
-                    max_similarity = similarity
+                    max_similarity = float(similarity)
                     most_similar_society = joined_society
         
         if max_similarity > 1.5 and most_similar_society:
@@ -363,13 +479,10 @@ class SocietyRecommender:
                     "message": society._recommendation_explanation["message"]
                 }
             
-            if not student.societies.exists():
-                return {
-                    "type": "popular",
-                    "message": "Popular society with many members"
-                }
+            joined_societies = list(student.societies.all())
             
-            joined_societies = student.societies.all()
+            if not joined_societies:
+                return dict(POPULAR_EXPLANATION)
             
             explanation_data = self._get_recommendation_explanation_details(society, joined_societies)
             
@@ -384,12 +497,25 @@ class SocietyRecommender:
                 "message": "Recommended society for new members"
             }
 
+    def get_stats(self):
+        """
+        Per-stage timings and cache hit rates of recommendation requests, plus the
+        size and evictions of the process-wide pair similarity cache.
+        """
+        stats = scoring_stats.snapshot('recommender.')
+        stats['similarity_cache'] = society_similarity_cache.stats()
+        return stats
+
     def update_similarity_model(self):
         """
         Update the text similarity model with all society descriptions.
         This should be called periodically to keep the model up-to-date.
         """
-        all_descriptions = Society.objects.filter(status="Approved").values_list('description', flat=True)
+        approved_societies = list(
+            Society.objects.filter(status="Approved").values_list('id', 'description')
+        )
+        society_ids = [society_id for society_id, _ in approved_societies]
+        all_descriptions = [description for _, description in approved_societies]
         
         unique_descriptions = set(all_descriptions)
         
@@ -399,9 +525,289 @@ class SocietyRecommender:
                 "Film Club for cinema lovers. We watch and analyze classic and contemporary films together.",
                 "Hiking Club for outdoor enthusiasts who enjoy exploring nature and staying active."
             ]
+            society_ids = society_ids + [None] * 3
         
-        text_similarity_analyzer.update_corpus(all_descriptions)
+        text_similarity_analyzer.update_corpus(all_descriptions, society_ids=society_ids)
         
-        self.society_similarities = {}
+        text_similarity_analyzer.rebuild_society_embeddings(
+            Society.objects.filter(status="Approved").values_list('id', 'description')
+        )
+        
+        society_similarity_cache.clear()
+        
+        self.build_similarity_matrix()
         
-        return len(all_descriptions)
\ No newline at end of file
+        self.build_vector_index()
+        
+        return len(all_descriptions)
+
+    def build_vector_index(self):
+        """
+        Build the process-wide nearest-society index used to retrieve recommendation
+        candidates. Returns the number of indexed societies.
+        """
+        # Changes made while building mark the new index stale again
+        society_vector_index.stale = False
+        try:
+            societies = list(Society.objects.filter(status="Approved").order_by('id'))
+            search = RandomProjectionLSH() if len(societies) > self.lsh_threshold else None
+            
+            index = SocietyVectorIndex.from_societies(
+                societies, text_similarity_analyzer, search=search
+            )
+        except Exception:
+            society_vector_index.mark_stale()
+            raise
+        society_vector_index.set(index)
+        return len(index)
+    
+    def refresh_vector_index(self):
+        """
+        Rebuild the nearest-society index if societies changed since it was built.
+        Run in the background by vector_index_refresh, never by requests.
+        Returns True if it was rebuilt.
+        """
+        if not society_vector_index.stale:
+            return False
+        self.build_vector_index()
+        return True
+
+    @timed('recommender.candidates')
+    def _limit_candidates(self, available_societies, joined_societies):
+        """
+        For large catalogs, narrow the candidates to the societies nearest to the joined
+        ones in the vector index instead of scoring the whole Society table.
+        Societies missing from the index (e.g. approved after it was built) are always kept.
+        """
+        candidate_ids = self.nearest_candidate_ids(
+            list(available_societies.values_list('id', flat=True)),
+            [society.id for society in joined_societies]
+        )
+        if candidate_ids is None:
+            return available_societies
+        return available_societies.filter(id__in=candidate_ids)
+
+    def nearest_candidate_ids(self, available_ids, joined_ids):
+        """
+        Ids among available_ids worth scoring for a student with the given joined
+        societies, or None if all of them should be scored.
+        """
+        if len(available_ids) <= self.candidate_pool_size:
+            return None
+        
+        # Only catalogs this large use the index, so only they start building it;
+        # until the background build is done, score everything
+        if society_vector_index.stale:
+            vector_index_refresh.request()
+        vector_index = self.vector_index
+        if vector_index is None:
+            return None
+        
+        try:
+            nearest = vector_index.search_similar_to(list(joined_ids), self.candidate_pool_size)
+        except Exception:
+            return None
+        
+        if not nearest:
+            return None
+        
+        candidate_ids = {society_id for society_id, _ in nearest}
+        candidate_ids.update(
+            society_id for society_id in available_ids if society_id not in vector_index
+        )
+        # Societies often joined together are worth scoring even when their descriptions differ
+        try:
+            candidate_ids.update(society_cooccurrence.scores_for(joined_ids))
+        except Exception:
+            pass
+        return candidate_ids
+
+    def build_similarity_matrix(self):
+        """
+        Precompute the pairwise similarity of all approved societies and persist it
+        as a memory-mapped matrix, so recommendation requests can look pairs up
+        without running the NLP model.
+        Returns the number of societies in the matrix.
+        """
+        societies = list(Society.objects.filter(status="Approved").order_by('id'))
+        descriptions = [society.description for society in societies]
+        without_description = [j for j, description in enumerate(descriptions) if not description]
+        
+        def compute_rows(start, end):
+            rows = text_similarity_analyzer.calculate_similarity_matrix(
+                descriptions[start:end], descriptions
+            ) / 5.0
+            for i in range(start, end):
+                columns = range(len(societies)) if not descriptions[i] else without_description
+                for j in columns:
+                    rows[i - start, j] = self._tag_category_similarity(societies[i], societies[j])
+            return rows
+        
+        return society_similarity_matrix.save([society.id for society in societies], compute_rows)
+
+
+# Builds the shared nearest-society index lazily in each process, off the request path
+vector_index_refresh = BackgroundRefresh(
+    'recommender.vector_index', lambda: SocietyRecommender().refresh_vector_index()
+)
+
+
+def encode_stale_society_embeddings():
+    """
+    Encode the approved societies whose stored embedding is missing or older than
+    their description (in the NLP worker when one is configured).
+    Returns the number of embeddings written.
+    """
+    encoded = 0
+    societies = Society.objects.filter(status="Approved").exclude(description='')
+    for society_id, description in societies.values_list('id', 'description'):
+        if (text_similarity_analyzer.embedding_store.needs_update(society_id, description)
+                and text_similarity_analyzer.update_society_embedding(society_id, description)):
+            encoded += 1
+    return encoded
+
+
+# Encodes changed descriptions in the background, so saving a society never runs the model
+embedding_refresh = BackgroundRefresh('recommender.embeddings', encode_stale_society_embeddings)
+
+
+@receiver(post_save, sender=Society)
+def update_society_embedding(sender, instance, **kwargs):
+    """Queue re-encoding of an approved society's embedding when its description changes."""
+    # Other edits (icon, status, ...) leave the stored vector as it is, without touching the model
+    if (instance.status == "Approved" and instance.description
+            and text_similarity_analyzer.embedding_store.needs_update(instance.id, instance.description)):
+        embedding_refresh.request()
+
+
+@receiver(post_save, sender=Society)
+def update_society_text_model(sender, instance, **kwargs):
+    """Absorb an approved (or newly approved) society's description into the TF-IDF model."""
+    if instance.status == "Approved":
+        text_similarity_analyzer.update_society_text(instance.id, instance.description)
+    else:
+        text_similarity_analyzer.remove_society_text(instance.id)
+
+
+@receiver(post_save, sender=Society)
+def update_society_semantic_profile(sender, instance, **kwargs):
+    """Recompute an approved society's semantic profile when its description changes."""
+    if instance.status == "Approved":
+        society_profile_store.update(instance)
+
+
+@receiver(post_delete, sender=Society)
+def remove_society_embedding(sender, instance, **kwargs):
+    """Drop a deleted society from the embedding store and the TF-IDF model."""
+    text_similarity_analyzer.embedding_store.remove(instance.id)
+    text_similarity_analyzer.remove_society_text(instance.id)
+
+
+@receiver(post_save, sender=Society)
+@receiver(post_delete, sender=Society)
+def mark_vector_index_stale(sender, instance, **kwargs):
+    """
+    The index keeps serving meanwhile: societies it does not hold are always scored,
+    and the next large-catalog request starts a background rebuild.
+    """
+    society_vector_index.mark_stale()
+
+
+# Society fields that recommendations are computed from
+RECOMMENDATION_FIELDS = ('status', 'description', 'category', 'tags')
+
+
+@receiver(pre_save, sender=Society)
+def capture_recommendation_fields(sender, instance, update_fields=None, **kwargs):
+    """Remember the stored recommendation inputs of a society about to be saved."""
+    if update_fields is not None and not set(update_fields) & set(RECOMMENDATION_FIELDS):
+        # None of them can change
+        instance._previous_recommendation_fields = {
+            field: getattr(instance, field) for field in RECOMMENDATION_FIELDS
+        }
+        return
+    instance._previous_recommendation_fields = (
+        Society.objects.filter(pk=instance.pk).values(*RECOMMENDATION_FIELDS).first()
+        if instance.pk else None
+    )
+
+
+def changed_recommendation_fields(instance):
+    """
+    Recommendation inputs changed by the save of a society (all of them for a new one),
+    from the values captured before it.
+    """
+    previous = getattr(instance, '_previous_recommendation_fields', None)
+    if previous is None:
+        return set(RECOMMENDATION_FIELDS)
+    return {field for field in RECOMMENDATION_FIELDS if previous[field] != getattr(instance, field)}
+
+
+@receiver(post_save, sender=Society)
+def invalidate_society_similarities(sender, instance, created=False, **kwargs):
+    """Cached pair similarities of a society no longer hold once its description changed."""
+    if not created and 'description' in changed_recommendation_fields(instance):
+        society_similarity_cache.invalidate_society(instance.id)
+
+
+@receiver(post_delete, sender=Society)
+def drop_deleted_society_similarities(sender, instance, **kwargs):
+    """A deleted society's pairs are never looked up again."""
+    society_similarity_cache.invalidate_society(instance.id)
+
+
+@receiver(post_save, sender=Society)
+def invalidate_recommendations_for_catalog(sender, instance, **kwargs):
+    """A new society or a change to a recommendation input can alter every student's recommendations."""
+    if changed_recommendation_fields(instance):
+        recommendation_cache.invalidate_all()
+
+
+@receiver(post_delete, sender=Society)
+def invalidate_recommendations_for_deleted_society(sender, instance, **kwargs):
+    """A deleted society may be in any student's recommendations."""
+    recommendation_cache.invalidate_all()
+
+
+# Accessor of the students on the society/event side of each relation that shapes recommendations
+STUDENT_RELATIONS = {
+    Student.societies.through: 'members',
+    Society.society_members.through: 'society_members',
+    Student.attended_events.through: 'attendees',
+    Event.current_attendees.through: 'current_attendees',
+}
+
+
+@receiver(m2m_changed, sender=Student.societies.through)
+@receiver(m2m_changed, sender=Society.society_members.through)
+@receiver(m2m_changed, sender=Student.attended_events.through)
+@receiver(m2m_changed, sender=Event.current_attendees.through)
+def invalidate_recommendations_for_students(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop the cached and materialized recommendations of students whose memberships
+    or attended events changed.
+    """
+    if action == 'pre_clear' and not isinstance(instance, Student):
+        # The affected students are only known before they are cleared
+        instance._cleared_student_ids = list(
+            getattr(instance, STUDENT_RELATIONS[sender]).values_list('id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Student):
+        student_ids = [instance.pk]
+    elif action == 'post_clear':
+        student_ids = getattr(instance, '_cleared_student_ids', [])
+    else:
+        student_ids = list(pk_set or ())
+    if not student_ids:
+        return
+    recommendation_cache.invalidate_student(*student_ids)
+    MaterializedRecommendation.objects.filter(student_id__in=student_ids).delete()
+
+
+@receiver(post_save, sender=RecommendationFeedback)
+@receiver(post_delete, sender=RecommendationFeedback)
+def invalidate_recommendations_for_feedback(sender, instance, **kwargs):
+    recommendation_cache.invalidate_student(instance.student_id)
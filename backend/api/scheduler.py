@@ -1,7 +1,13 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 import datetime
+from django.conf import settings
 from django.utils import timezone
 from api.models import Event
+from api.major_affinity import major_affinity_store
+from api.matrix_factorization import ImplicitALSTrainer, factor_model
+from api.nlp_similarity import text_similarity_analyzer
+from api.recommendation_materializer import recommendation_materializer
+from api.society_stats import society_stats_store
 
 def auto_reject_events():
     now = timezone.now()
@@ -14,7 +20,35 @@ def auto_reject_events():
             event.save()
             count += 1
 
+def materialize_recommendations():
+    recommendation_materializer.materialize(
+        processes=getattr(settings, 'MATERIALIZED_RECOMMENDATION_PROCESSES', 1)
+    )
+
+def train_matrix_factorization():
+    trainer = ImplicitALSTrainer()
+    student_ids, student_factors, society_ids, society_factors = trainer.train()
+    factor_model.save(student_ids, student_factors, society_ids, society_factors, params=trainer.params())
+
+def reconcile_society_stats():
+    society_stats_store.reconcile()
+
+def rebuild_major_affinity():
+    major_affinity_store.rebuild()
+
+def save_text_models():
+    # In client mode the scoring worker owns the text models and saves them itself
+    if text_similarity_analyzer.worker_client is None:
+        text_similarity_analyzer.save_text_models()
+
 def start_scheduler():
     scheduler = BackgroundScheduler()
     scheduler.add_job(auto_reject_events, 'interval', minutes=30, next_run_time=timezone.now())
+    scheduler.add_job(train_matrix_factorization, 'cron', hour=2, minute=30)
+    scheduler.add_job(materialize_recommendations, 'cron', hour=3, minute=0)
+    scheduler.add_job(reconcile_society_stats, 'interval', hours=1, next_run_time=timezone.now())
+    scheduler.add_job(rebuild_major_affinity, 'interval', hours=1, next_run_time=timezone.now())
+    scheduler.add_job(
+        save_text_models, 'interval', seconds=getattr(settings, 'NLP_TEXT_MODEL_SAVE_INTERVAL', 300)
+    )
     scheduler.start()
@@ -0,0 +1,127 @@
+import functools
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+import numpy as np
+
+
+class ScoringStats:
+    """
+    Lightweight, thread-safe instrumentation for similarity scoring and recommendation.
+    Records per-component call counts, cumulative time and recent timing samples
+    (for percentiles), cache hits/misses and fallback counts. Component names are
+    dotted, e.g. 'analyzer.tfidf' or 'recommender.mmr'.
+    """
+
+    def __init__(self, max_samples=2048):
+        self.max_samples = max_samples
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, prefix=''):
+        """Clear the recorded statistics whose name starts with prefix (all by default)."""
+        with self._lock:
+            if not prefix:
+                self._calls = Counter()
+                self._total_seconds = defaultdict(float)
+                self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+                self._cache_hits = Counter()
+                self._cache_misses = Counter()
+                self._fallbacks = Counter()
+                return
+
+            for table in (self._calls, self._total_seconds, self._samples,
+                          self._cache_hits, self._cache_misses, self._fallbacks):
+                for name in [name for name in table if name.startswith(prefix)]:
+                    del table[name]
+
+    @contextmanager
+    def timer(self, component):
+        """Time the enclosed block as one call of the component."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(component, time.perf_counter() - start)
+
+    def record(self, component, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._calls[component] += 1
+            self._total_seconds[component] += seconds
+            self._samples[component].append(seconds)
+
+    def cache_hit(self, cache, count=1):
+        if self.enabled and count:
+            with self._lock:
+                self._cache_hits[cache] += count
+
+    def cache_miss(self, cache, count=1):
+        if self.enabled and count:
+            with self._lock:
+                self._cache_misses[cache] += count
+
+    def fallback(self, component):
+        if self.enabled:
+            with self._lock:
+                self._fallbacks[component] += 1
+
+    def snapshot(self, prefix=''):
+        """
+        Return the statistics of every component, cache and fallback whose name
+        starts with prefix. Timings are reported in milliseconds; percentiles are
+        computed over the most recent max_samples calls.
+        """
+        with self._lock:
+            components = {}
+            for name, calls in self._calls.items():
+                if not name.startswith(prefix):
+                    continue
+                samples = np.array(self._samples[name]) * 1000.0
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                components[name] = {
+                    'calls': calls,
+                    'total_ms': self._total_seconds[name] * 1000.0,
+                    'mean_ms': self._total_seconds[name] * 1000.0 / calls,
+                    'p50_ms': float(p50),
+                    'p95_ms': float(p95),
+                    'p99_ms': float(p99),
+                }
+
+            caches = {}
+            for name in set(self._cache_hits) | set(self._cache_misses):
+                if not name.startswith(prefix):
+                    continue
+                hits, misses = self._cache_hits[name], self._cache_misses[name]
+                caches[name] = {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                }
+
+            fallbacks = {
+                name: count for name, count in self._fallbacks.items() if name.startswith(prefix)
+            }
+
+        return {'components': components, 'caches': caches, 'fallbacks': fallbacks}
+
+
+def timed(component):
+    """Decorator recording every call of the function as one call of the component."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with scoring_stats.timer(component):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Create a singleton instance for reuse
+scoring_stats = ScoringStats()
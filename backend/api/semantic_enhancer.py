@@ -3,6 +3,11 @@ import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Distinct texts whose category/activity profile is memoized
+PROFILE_CACHE_SIZE = 10000
+
 class SemanticDomainEnhancer:
     """
     Enhances text similarity with domain-specific knowledge about student societies.
@@ -137,6 +142,51 @@ class SemanticDomainEnhancer:
             ("business", "media"): 0.4,
             ("social", "sports"): 0.4,
         }
+        
+        self.compile_lexicons()
+        self.build_relationship_table()
+    
+    def compile_lexicons(self):
+        """
+        Compile both lexicons into one term table mapping every term to a
+        (category bitmask, activity bitmask) pair, bit i standing for
+        category_names[i] / activity_names[i]. Single words are looked up per
+        token; multi-word terms are found by one precompiled phrase pattern.
+        """
+        self.category_names = list(self.domain_categories)
+        self.activity_names = list(self.related_activities)
+        category_bits = {name: 1 << i for i, name in enumerate(self.category_names)}
+        activity_bits = {name: 1 << i for i, name in enumerate(self.activity_names)}
+        
+        term_masks = {}
+        for term, category in self.term_to_category.items():
+            category_mask, activity_mask = term_masks.get(term, (0, 0))
+            term_masks[term] = (category_mask | category_bits[category], activity_mask)
+        for term, activity_type in self.term_to_activity.items():
+            category_mask, activity_mask = term_masks.get(term, (0, 0))
+            term_masks[term] = (category_mask, activity_mask | activity_bits[activity_type])
+        
+        self._word_masks = {term: masks for term, masks in term_masks.items() if ' ' not in term}
+        self._phrase_masks = {term: masks for term, masks in term_masks.items() if ' ' in term}
+        
+        # Zero-width lookahead so overlapping phrases are all found, as with `term in text`
+        phrases = sorted(self._phrase_masks, key=len, reverse=True)
+        self._phrase_pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(phrase) for phrase in phrases) + '))'
+        ) if phrases else None
+        self._profile_cache = {}
+    
+    def build_relationship_table(self):
+        """
+        Precompute the dense relationship matrix of every category pair, indexed
+        like category_names (1.0 on the diagonal, 0.2 for unrelated categories).
+        """
+        self.relationship_matrix = np.array([
+            [self.get_related_score(category1, category2) for category2 in self.category_names]
+            for category1 in self.category_names
+        ])
+        self._relationship_scores = self.relationship_matrix.tolist()
+        self._category_score_cache = {}
     
     def get_related_score(self, category1, category2):
         """Get relationship score between two categories."""
@@ -153,79 +203,163 @@ class SemanticDomainEnhancer:
         else:
             return 0.2  
     
-    def extract_categories(self, text):
-        """Extract domain categories from text."""
+    def extract_profile(self, text):
+        """
+        Extract the (category bitmask, activity bitmask) of a text in a single pass
+        over its tokens plus one phrase scan. Results are memoized per text.
+        """
         if not text:
-            return []
-            
-        text = text.lower()
-        words = re.findall(r'\b\w+\b', text)
+            return 0, 0
         
-        categories = []
-        for word in words:
-            if word in self.term_to_category:
-                categories.append(self.term_to_category[word])
-                
-        for term in self.term_to_category:
-            if ' ' in term and term in text:
-                categories.append(self.term_to_category[term])
-                
-        return list(set(categories))
+        profile = self._profile_cache.get(text)
+        if profile is not None:
+            return profile
+        
+        lowered = text.lower()
+        category_mask = activity_mask = 0
+        word_masks = self._word_masks
+        for word in set(WORD_PATTERN.findall(lowered)):
+            masks = word_masks.get(word)
+            if masks is not None:
+                category_mask |= masks[0]
+                activity_mask |= masks[1]
+        
+        if self._phrase_pattern is not None:
+            for phrase in set(self._phrase_pattern.findall(lowered)):
+                masks = self._phrase_masks[phrase]
+                category_mask |= masks[0]
+                activity_mask |= masks[1]
+        
+        if len(self._profile_cache) >= PROFILE_CACHE_SIZE:
+            self._profile_cache.clear()
+        profile = (category_mask, activity_mask)
+        self._profile_cache[text] = profile
+        return profile
+    
+    def prime_profile(self, text, category_mask, activity_mask):
+        """Seed the profile memo with a stored profile, e.g. from SocietySemanticProfile."""
+        if not text:
+            return
+        if len(self._profile_cache) >= PROFILE_CACHE_SIZE:
+            self._profile_cache.clear()
+        self._profile_cache[text] = (category_mask, activity_mask)
+    
+    def extract_categories(self, text):
+        """Extract domain categories from text."""
+        return self.categories_from_mask(self.extract_profile(text)[0])
     
     def extract_activities(self, text):
         """Extract activity types from text."""
-        if not text:
-            return []
-            
-        text = text.lower()
-        words = re.findall(r'\b\w+\b', text)
-        
-        activities = []
-        for word in words:
-            if word in self.term_to_activity:
-                activities.append(self.term_to_activity[word])
-                
-        for term in self.term_to_activity:
-            if ' ' in term and term in text:
-                activities.append(self.term_to_activity[term])
-                
-        return list(set(activities))
+        return self.activities_from_mask(self.extract_profile(text)[1])
+    
+    def categories_from_mask(self, mask):
+        return self._names_from_mask(mask, self.category_names)
+    
+    def activities_from_mask(self, mask):
+        return self._names_from_mask(mask, self.activity_names)
+    
+    @staticmethod
+    def _names_from_mask(mask, names):
+        return [name for i, name in enumerate(names) if mask >> i & 1]
     
     def calculate_semantic_boost(self, text1, text2):
         """
         Calculate a semantic similarity boost based on domain knowledge.
         Returns a value between 0 and 1 to enhance base similarity.
         """
-        categories1 = self.extract_categories(text1)
-        categories2 = self.extract_categories(text2)
+        categories1, activities1 = self.extract_profile(text1)
+        categories2, activities2 = self.extract_profile(text2)
         
-        activities1 = self.extract_activities(text1)
-        activities2 = self.extract_activities(text2)
+        return self._boost_from_masks(categories1, activities1, categories2, activities2)
+    
+    def calculate_semantic_boost_matrix(self, texts_a, texts_b):
+        """
+        Calculate the semantic boost for every pair of texts from two lists.
+        Categories and activities are extracted once per text instead of once per pair.
+        Returns an array of shape (len(texts_a), len(texts_b)).
+        """
+        return self.semantic_boost_matrix(
+            self.profile_vectors(texts_a), self.profile_vectors(texts_b)
+        )
+    
+    def profile_vectors(self, texts):
+        """
+        Category and activity indicator matrices of the texts, of shape
+        (len(texts), len(category_names)) and (len(texts), len(activity_names)).
+        """
+        masks = np.array([self.extract_profile(t) for t in texts], dtype=np.int64).reshape(-1, 2)
+        categories = (masks[:, :1] >> np.arange(len(self.category_names))) & 1
+        activities = (masks[:, 1:] >> np.arange(len(self.activity_names))) & 1
+        return categories.astype(np.float64), activities.astype(np.float64)
+    
+    def semantic_boost_matrix(self, profiles_a, profiles_b):
+        """
+        Semantic boost of every pair of profiles, as returned by profile_vectors:
+        0.7 * mean of the top 3 category relationship scores plus 0.3 * activity
+        Jaccard, and 0 where either side has no category.
+        Returns an array of shape (len(profiles_a[0]), len(profiles_b[0])).
+        """
+        categories_a, activities_a = profiles_a
+        categories_b, activities_b = profiles_b
+        
+        category_scores = self._top_category_scores(categories_a, categories_b)
         
+        common = activities_a @ activities_b.T
+        union = activities_a.sum(axis=1)[:, None] + activities_b.sum(axis=1)[None, :] - common
+        activity_similarity = np.divide(
+            common, union, out=np.zeros_like(common), where=union > 0
+        )
+        
+        boosts = 0.7 * category_scores + 0.3 * activity_similarity
+        has_categories = (categories_a.sum(axis=1) > 0)[:, None] & (categories_b.sum(axis=1) > 0)[None, :]
+        return np.where(has_categories, boosts, 0.0)
+    
+    def _top_category_scores(self, categories_a, categories_b):
+        """
+        Mean of the top 3 relationship scores over the category pairs of every
+        indicator row pair. The matrix only holds a few distinct scores, so for each
+        score level (highest first) the number of pairs scoring at least that much
+        is one matrix product; the top 3 are then filled level by level.
+        """
+        top_sum = np.zeros((len(categories_a), len(categories_b)))
+        taken = np.zeros_like(top_sum)
+        for level in np.unique(self.relationship_matrix)[::-1]:
+            at_least = categories_a @ (self.relationship_matrix >= level) @ categories_b.T
+            count = np.minimum(at_least, 3)
+            top_sum += level * (count - taken)
+            taken = count
+        return np.divide(top_sum, taken, out=np.zeros_like(top_sum), where=taken > 0)
+    
+    def _category_score(self, categories1, categories2):
+        """Mean of the top 3 relationship scores over all category pairs of two bitmasks, memoized per pair."""
+        key = (categories1, categories2)
+        score = self._category_score_cache.get(key)
+        if score is None:
+            indices1 = [i for i in range(len(self.category_names)) if categories1 >> i & 1]
+            indices2 = [j for j in range(len(self.category_names)) if categories2 >> j & 1]
+            category_scores = sorted(
+                (self._relationship_scores[i][j] for i in indices1 for j in indices2),
+                reverse=True
+            )[:3]
+            score = sum(category_scores) / len(category_scores)
+            self._category_score_cache[key] = score
+        return score
+    
+    def _boost_from_masks(self, categories1, activities1, categories2, activities2):
+        """Combine the category and activity bitmasks of two texts into a boost value."""
         if not categories1 or not categories2:
             return 0
             
-        category_scores = []
-        for cat1 in categories1:
-            for cat2 in categories2:
-                category_scores.append(self.get_related_score(cat1, cat2))
-                
-        if category_scores:
-            category_scores.sort(reverse=True)
-            top_category_score = sum(category_scores[:min(3, len(category_scores))]) / min(3, len(category_scores))
-        else:
-            top_category_score = 0
+        top_category_score = self._category_score(categories1, categories2)
             
         activity_similarity = 0
         if activities1 and activities2:
-            common_activities = set(activities1).intersection(set(activities2))
-            all_activities = set(activities1).union(set(activities2))
-            
-            if all_activities:
-                activity_similarity = len(common_activities) / len(all_activities)
+            activity_similarity = (
+                bin(activities1 & activities2).count('1') / bin(activities1 | activities2).count('1')
+            )
         
         boost = (0.7 * top_category_score) + (0.3 * activity_similarity)
         
         return boost
 
-semantic_enhancer = SemanticDomainEnhancer()
\ No newline at end of file
+semantic_enhancer = SemanticDomainEnhancer()
@@ -0,0 +1,133 @@
+import threading
+import uuid
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import caches
+
+from .bounded_cache import BoundedCache
+from .society_similarity_matrix import society_similarity_matrix
+
+
+class SocietySimilarityCache:
+    """
+    Process-wide cache of 0-1 society pair similarities, shared by every
+    SocietyRecommender in the process, so repeated requests reuse pairwise scores.
+    Entries are dropped as a whole when the similarity model version (the stored
+    matrix's modification time) changes, and per society when its description
+    changed, using an index of the cached pairs of each society. With
+    SIMILARITY_CACHE_ALIAS set, pairs are also shared between processes through
+    that Django cache, under a generation token every process checks before
+    using its local entries. Invalidating one society keeps the generation, so
+    other processes drop their local copies of its pairs when they expire.
+    """
+
+    def __init__(self, maxsize=None, ttl=None, alias=None):
+        self.local = BoundedCache(
+            'recommender.pair_cache',
+            maxsize=maxsize if maxsize is not None else getattr(settings, 'SIMILARITY_CACHE_SIZE', 100000),
+            ttl=ttl if ttl is not None else getattr(settings, 'SIMILARITY_CACHE_TTL', 3600)
+        )
+        self.alias = alias if alias is not None else getattr(settings, 'SIMILARITY_CACHE_ALIAS', '')
+        self.version = None
+        self._society_pairs = defaultdict(set)  # society id -> pair keys cached with it
+        self._pairs_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias] if self.alias else None
+
+    def _generation(self):
+        if self.shared is None:
+            return None
+        generation = self.shared.get('society_similarity:generation')
+        if generation is None:
+            self.shared.add('society_similarity:generation', uuid.uuid4().hex, None)
+            generation = self.shared.get('society_similarity:generation')
+        return generation
+
+    def _shared_key(self, pair_key):
+        return f'society_similarity:{self.version[0]}:{self.version[1]}:{pair_key[0]}:{pair_key[1]}'
+
+    def sync(self):
+        """Drop every entry if the model version (or the shared generation) changed."""
+        try:
+            version = (society_similarity_matrix.model_version(), self._generation())
+        except Exception:
+            version = (society_similarity_matrix.model_version(), None)
+        if version != self.version:
+            self.clear_local()
+            self.version = version
+
+    def clear_local(self):
+        """Drop the pairs cached in this process only."""
+        with self._pairs_lock:
+            self.local.clear()
+            self._society_pairs.clear()
+
+    def _set_local(self, pair_key, similarity):
+        with self._pairs_lock:
+            self.local.set(pair_key, similarity)
+            for society_id in pair_key:
+                self._society_pairs[society_id].add(pair_key)
+
+    def get(self, society_id1, society_id2):
+        """Cached similarity of a pair of societies, or None."""
+        pair_key = tuple(sorted([society_id1, society_id2]))
+        similarity = self.local.get(pair_key)
+        if similarity is None and self.shared is not None and self.version is not None:
+            try:
+                similarity = self.shared.get(self._shared_key(pair_key))
+            except Exception:
+                similarity = None
+            if similarity is not None:
+                self._set_local(pair_key, similarity)
+        return similarity
+
+    def set(self, society_id1, society_id2, similarity):
+        pair_key = tuple(sorted([society_id1, society_id2]))
+        self._set_local(pair_key, similarity)
+        if self.shared is not None and self.version is not None:
+            try:
+                self.shared.set(self._shared_key(pair_key), similarity, self.local.ttl)
+            except Exception:
+                pass
+
+    def invalidate_society(self, society_id):
+        """
+        Drop the pairs of one society (e.g. after its description changed), here and
+        in the shared cache. Other societies' pairs and the generation are kept.
+        """
+        with self._pairs_lock:
+            pair_keys = self._society_pairs.pop(society_id, set())
+            for pair_key in pair_keys:
+                for other_id in pair_key:
+                    if other_id != society_id:
+                        self._society_pairs.get(other_id, set()).discard(pair_key)
+            self.local.discard(pair_keys)
+
+        if pair_keys and self.shared is not None and self.version is not None:
+            try:
+                self.shared.delete_many([self._shared_key(pair_key) for pair_key in pair_keys])
+            except Exception:
+                pass
+
+    def clear(self):
+        """Drop every pair, e.g. after the similarity model was rebuilt."""
+        self.clear_local()
+        self._new_generation()
+
+    def _new_generation(self):
+        # Other processes cannot be reached directly; a new generation makes them resync
+        if self.shared is not None:
+            try:
+                self.shared.set('society_similarity:generation', uuid.uuid4().hex, None)
+            except Exception:
+                pass
+            self.version = None
+
+    def stats(self):
+        return self.local.stats()
+
+
+# Create a singleton instance for reuse
+society_similarity_cache = SocietySimilarityCache()
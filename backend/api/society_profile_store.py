@@ -0,0 +1,112 @@
+import hashlib
+from .models import SocietySemanticProfile
+from .nlp_similarity import text_similarity_analyzer
+from .semantic_enhancer import semantic_enhancer
+
+# Bump when the lexicons or keyword extraction change, so every stored profile is recomputed
+PROFILE_VERSION = 1
+
+
+class SocietyProfileStore:
+    """
+    Reads and maintains the SocietySemanticProfile rows: category/activity bitmasks
+    and top keywords of each society description. Loading profiles also primes the
+    semantic enhancer and the analyzer's keywords, so scoring those descriptions
+    does not reparse them.
+    """
+
+    def __init__(self, keyword_count=15):
+        self.keyword_count = keyword_count
+
+    def description_hash(self, description):
+        return hashlib.sha1(f"{PROFILE_VERSION}:{description or ''}".encode('utf-8')).hexdigest()
+
+    def compute(self, description):
+        """Profile field values of a description."""
+        category_mask, activity_mask = semantic_enhancer.extract_profile(description)
+        keywords = []
+        if description:
+            try:
+                keywords = text_similarity_analyzer.extract_keywords(
+                    text_similarity_analyzer.preprocess_text(description), top_n=self.keyword_count
+                )
+            except Exception:
+                keywords = []
+        return {
+            'category_mask': category_mask,
+            'activity_mask': activity_mask,
+            'keywords': list(keywords),
+            'description_hash': self.description_hash(description),
+        }
+
+    def update(self, society, force=False):
+        """
+        Recompute and store the profile of a society if its description changed
+        since the profile was computed. Returns True if the profile was written.
+        """
+        profile = SocietySemanticProfile.objects.filter(society_id=society.id).first()
+        if (not force and profile is not None
+                and profile.description_hash == self.description_hash(society.description)):
+            return False
+
+        SocietySemanticProfile.objects.update_or_create(
+            society_id=society.id, defaults=self.compute(society.description)
+        )
+        return True
+
+    def load_profiles(self, societies):
+        """
+        Stored profiles of the societies that are up to date, keyed by society id,
+        read in one query and never written (safe inside a request). Their masks and
+        keywords prime the semantic enhancer and the analyzer; societies with a
+        missing or stale profile are left to be parsed as usual.
+        """
+        societies = list(societies)
+        stored = {
+            profile.society_id: profile
+            for profile in SocietySemanticProfile.objects.filter(
+                society_id__in=[society.id for society in societies]
+            )
+        }
+
+        profiles = {}
+        for society in societies:
+            profile = stored.get(society.id)
+            if profile is not None and profile.description_hash == self.description_hash(society.description):
+                profiles[society.id] = profile
+                self._prime(society.description, profile)
+        return profiles
+
+    def get_profiles(self, societies):
+        """
+        Up-to-date profiles of the societies, keyed by society id, read in one query.
+        Missing or stale profiles are recomputed and stored.
+        """
+        societies = list(societies)
+        profiles = self.load_profiles(societies)
+
+        for society in societies:
+            if society.id not in profiles:
+                profiles[society.id], _ = SocietySemanticProfile.objects.update_or_create(
+                    society_id=society.id, defaults=self.compute(society.description)
+                )
+                self._prime(society.description, profiles[society.id])
+
+        return profiles
+
+    def _prime(self, description, profile):
+        if description:
+            semantic_enhancer.prime_profile(description, profile.category_mask, profile.activity_mask)
+            text_similarity_analyzer.prime_keywords(description, profile.keywords)
+
+    def categories(self, profile):
+        """Domain category names of a profile."""
+        return semantic_enhancer.categories_from_mask(profile.category_mask)
+
+    def activities(self, profile):
+        """Activity type names of a profile."""
+        return semantic_enhancer.activities_from_mask(profile.activity_mask)
+
+
+# Create a singleton instance for reuse
+society_profile_store = SocietyProfileStore()
@@ -0,0 +1,160 @@
+import glob
+import json
+import os
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+
+class SocietySimilarityMatrix:
+    """
+    Precomputed pairwise similarity between approved societies.
+    The matrix is stored as a float32 .npy file that is opened memory-mapped,
+    so every worker shares the same pages and lookups need no model inference.
+    A JSON index maps society ids to matrix rows. Each build writes both under
+    a new version, then atomically points society_similarity.json at it, so a
+    reader never pairs a matrix with the index of another build.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(getattr(settings, 'BASE_DIR', ''), 'api', 'ml_models')
+        self.pointer_path = os.path.join(self.directory, 'society_similarity.json')
+
+        self.version = None
+        self.matrix = None
+        self.row_index = {}
+        self._loaded_mtime = None
+
+    def _path(self, version, name):
+        return os.path.join(self.directory, f'society_similarity_{version}_{name}')
+
+    def save(self, society_ids, compute_rows, chunk_size=256, keep=2):
+        """
+        Build and persist the matrix for the given society ids as the current version,
+        keeping the last `keep` versions.
+        compute_rows(start, end) must return the similarity rows for
+        society_ids[start:end] against all society_ids, scaled to 0-1.
+        Rows are written in chunks so the full matrix never has to fit in memory twice.
+        Returns the number of societies in the matrix.
+        """
+        society_ids = [int(society_id) for society_id in society_ids]
+        size = len(society_ids)
+        os.makedirs(self.directory, exist_ok=True)
+        version = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+
+        matrix = np.lib.format.open_memmap(
+            self._path(version, 'matrix.npy'), mode='w+', dtype=np.float32, shape=(size, size)
+        )
+        for start in range(0, size, chunk_size):
+            end = min(start + chunk_size, size)
+            matrix[start:end] = compute_rows(start, end)
+        matrix.flush()
+        del matrix
+
+        with open(self._path(version, 'index.json'), 'w') as f:
+            json.dump({'society_ids': society_ids}, f)
+
+        # Only the pointer is swapped in, so the matrix and its index change together
+        tmp_pointer_path = self.pointer_path + '.tmp'
+        with open(tmp_pointer_path, 'w') as f:
+            json.dump({'version': version}, f)
+        os.replace(tmp_pointer_path, self.pointer_path)
+
+        for old_version in self.versions()[:-keep]:
+            for path in glob.glob(self._path(old_version, '*')):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        self._loaded_mtime = None
+        self.refresh()
+        return size
+
+    def versions(self):
+        """Stored versions, oldest first."""
+        suffix = '_index.json'
+        prefix = 'society_similarity_'
+        return sorted(
+            os.path.basename(path)[len(prefix):-len(suffix)]
+            for path in glob.glob(os.path.join(self.directory, f'{prefix}*{suffix}'))
+        )
+
+    def model_version(self):
+        """Modification time of the version pointer (None if there is none); changes on every rebuild."""
+        try:
+            return os.path.getmtime(self.pointer_path)
+        except OSError:
+            return None
+
+    def refresh(self):
+        """
+        (Re)open the current version if the pointer changed since it was last loaded.
+        Returns True when a matrix is available.
+        """
+        try:
+            mtime = os.path.getmtime(self.pointer_path)
+        except OSError:
+            self._reset()
+            return False
+
+        if mtime == self._loaded_mtime:
+            return self.matrix is not None
+
+        try:
+            with open(self.pointer_path, 'r') as f:
+                version = json.load(f)['version']
+            with open(self._path(version, 'index.json'), 'r') as f:
+                society_ids = json.load(f)['society_ids']
+            matrix = np.load(self._path(version, 'matrix.npy'), mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            self._reset()
+            return False
+
+        if matrix.shape != (len(society_ids), len(society_ids)):
+            self._reset()
+            return False
+
+        self.version = version
+        self.matrix = matrix
+        self.row_index = {society_id: row for row, society_id in enumerate(society_ids)}
+        self._loaded_mtime = mtime
+        return True
+
+    def _reset(self):
+        self.version = None
+        self.matrix = None
+        self.row_index = {}
+        self._loaded_mtime = None
+
+    def get(self, society_id1, society_id2):
+        """Return the stored 0-1 similarity for a pair of societies, or None if unknown."""
+        if self.matrix is None:
+            return None
+
+        row = self.row_index.get(society_id1)
+        col = self.row_index.get(society_id2)
+        if row is None or col is None:
+            return None
+
+        return float(self.matrix[row, col])
+
+    def get_row(self, society_id, other_ids):
+        """
+        Stored 0-1 similarities of one society to several others as a float array
+        aligned with other_ids, NaN where a pair is unknown.
+        """
+        similarities = np.full(len(other_ids), np.nan)
+        row = self.row_index.get(society_id) if self.matrix is not None else None
+        if row is None:
+            return similarities
+
+        columns = np.array([self.row_index.get(other_id, -1) for other_id in other_ids], dtype=np.int64)
+        known = columns >= 0
+        if known.any():
+            similarities[known] = self.matrix[row, columns[known]]
+        return similarities
+
+
+# Create a singleton instance for reuse
+society_similarity_matrix = SocietySimilarityMatrix()
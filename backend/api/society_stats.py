@@ -0,0 +1,218 @@
+import datetime
+from collections import Counter
+from django.db.models import Count, F
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Event, Society, SocietyStats, Student
+
+# Weights of the popularity score (see SocietyStats)
+MEMBER_WEIGHT = 2
+EVENT_WEIGHT = 3
+ATTENDANCE_WEIGHT = 4
+RECENT_EVENT_WEIGHT = 5
+RECENT_JOIN_WEIGHT = 3
+
+RECENT_DAYS = 30
+
+Membership = Society.society_members.through
+Attendance = Event.current_attendees.through
+
+
+class SocietyStatsStore:
+    """
+    Maintains the SocietyStats rows. Membership and attendance additions are
+    applied as in-place increments; removals and event changes recompute the
+    affected societies, and reconcile() recomputes every society (which also
+    ages events and joins out of the 30-day window).
+    """
+
+    def _cutoff(self):
+        return timezone.now() - datetime.timedelta(days=RECENT_DAYS)
+
+    def _grouped_counts(self, queryset, field, society_ids):
+        if society_ids is not None:
+            queryset = queryset.filter(**{f'{field}__in': society_ids})
+        return Counter(dict(
+            queryset.values_list(field).annotate(count=Count('pk')).values_list(field, 'count')
+        ))
+
+    def refresh(self, society_ids=None, create=True):
+        """
+        Recompute the stats of the given societies (default: all) from scratch,
+        with one grouped query per statistic. With create=False only existing rows
+        are updated (signals of a society being deleted must not recreate its row).
+        Returns the number of rows written.
+        """
+        if society_ids is not None:
+            society_ids = [society_id for society_id in set(society_ids) if society_id is not None]
+            if not society_ids:
+                return 0
+        cutoff = self._cutoff()
+        cutoff_date = cutoff.date()
+
+        members = self._grouped_counts(Membership.objects.all(), 'society_id', society_ids)
+        recent_joins = self._grouped_counts(
+            Membership.objects.filter(student__date_joined__gte=cutoff), 'society_id', society_ids
+        )
+        events = self._grouped_counts(Event.objects.all(), 'hosted_by_id', society_ids)
+        recent_events = self._grouped_counts(
+            Event.objects.filter(date__gte=cutoff_date), 'hosted_by_id', society_ids
+        )
+        attendance = self._grouped_counts(Attendance.objects.all(), 'event__hosted_by_id', society_ids)
+
+        societies = Society.objects.all()
+        if society_ids is not None:
+            societies = societies.filter(id__in=society_ids)
+        existing = {
+            stats.society_id: stats
+            for stats in SocietyStats.objects.filter(society_id__in=societies.values('id'))
+        }
+
+        to_create, to_update = [], []
+        for society_id in societies.values_list('id', flat=True):
+            stats = existing.get(society_id) or SocietyStats(society_id=society_id)
+            stats.member_count = members[society_id]
+            stats.event_count = events[society_id]
+            stats.total_attendance = attendance[society_id]
+            stats.recent_event_count = recent_events[society_id]
+            stats.recent_join_count = recent_joins[society_id]
+            stats.base_popularity_score = (
+                MEMBER_WEIGHT * stats.member_count
+                + EVENT_WEIGHT * stats.event_count
+                + ATTENDANCE_WEIGHT * stats.total_attendance
+            )
+            stats.popularity_score = (
+                stats.base_popularity_score
+                + RECENT_EVENT_WEIGHT * stats.recent_event_count
+                + RECENT_JOIN_WEIGHT * stats.recent_join_count
+            )
+            stats.updated_at = timezone.now()
+            if stats.pk:
+                to_update.append(stats)
+            elif create:
+                to_create.append(stats)
+
+        SocietyStats.objects.bulk_create(to_create, batch_size=1000)
+        SocietyStats.objects.bulk_update(to_update, [
+            'member_count', 'event_count', 'total_attendance', 'recent_event_count',
+            'recent_join_count', 'base_popularity_score', 'popularity_score', 'updated_at',
+        ], batch_size=1000)
+        return len(to_create) + len(to_update)
+
+    def reconcile(self):
+        """Recompute every society's stats, correcting any drift. Returns the number of rows."""
+        return self.refresh()
+
+    def _increment(self, society_id, members=0, recent_joins=0, attendance=0):
+        updated = SocietyStats.objects.filter(society_id=society_id).update(
+            member_count=F('member_count') + members,
+            recent_join_count=F('recent_join_count') + recent_joins,
+            total_attendance=F('total_attendance') + attendance,
+            base_popularity_score=F('base_popularity_score')
+            + MEMBER_WEIGHT * members + ATTENDANCE_WEIGHT * attendance,
+            popularity_score=F('popularity_score')
+            + MEMBER_WEIGHT * members + ATTENDANCE_WEIGHT * attendance
+            + RECENT_JOIN_WEIGHT * recent_joins,
+            updated_at=timezone.now()
+        )
+        if not updated:
+            self.refresh([society_id])
+
+    def add_members(self, society_id, student_ids):
+        """Count students who just joined a society."""
+        recent = Student.objects.filter(
+            id__in=student_ids, date_joined__gte=self._cutoff()
+        ).count()
+        self._increment(society_id, members=len(student_ids), recent_joins=recent)
+
+    def add_memberships(self, student_id, society_ids):
+        """Count one student who just joined several societies."""
+        recent = Student.objects.filter(id=student_id, date_joined__gte=self._cutoff()).exists()
+        for society_id in society_ids:
+            self._increment(society_id, members=1, recent_joins=int(recent))
+
+    def add_attendance(self, attendees_by_event):
+        """Count new attendees, given as {event_id: number of new attendees}."""
+        hosts = dict(
+            Event.objects.filter(id__in=list(attendees_by_event)).values_list('id', 'hosted_by_id')
+        )
+        per_society = Counter()
+        for event_id, attendees in attendees_by_event.items():
+            if hosts.get(event_id) is not None:
+                per_society[hosts[event_id]] += attendees
+        for society_id, attendees in per_society.items():
+            self._increment(society_id, attendance=attendees)
+
+    def popular_societies(self, queryset=None, with_recent_boost=True):
+        """
+        Societies (default: all) ordered by their stored popularity, annotated with
+        total_members, total_events, total_event_attendance and popularity_score.
+        """
+        queryset = Society.objects.all() if queryset is None else queryset
+        score = 'stats__popularity_score' if with_recent_boost else 'stats__base_popularity_score'
+        return queryset.annotate(
+            total_members=F('stats__member_count'),
+            total_events=F('stats__event_count'),
+            total_event_attendance=F('stats__total_attendance'),
+            popularity_score=F(score)
+        ).order_by(F(score).desc(nulls_last=True), 'id')
+
+
+# Create a singleton instance for reuse
+society_stats_store = SocietyStatsStore()
+
+
+@receiver(post_save, sender=Society)
+def create_society_stats(sender, instance, created, **kwargs):
+    if created:
+        society_stats_store.refresh([instance.id])
+
+
+@receiver(m2m_changed, sender=Membership)
+def update_society_member_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    """Count added members in place; recount societies that lost members."""
+    if action == 'post_add' and pk_set:
+        if isinstance(instance, Society):
+            society_stats_store.add_members(instance.pk, pk_set)
+        else:
+            society_stats_store.add_memberships(instance.pk, pk_set)
+    elif action == 'pre_clear' and not isinstance(instance, Society):
+        # The student's societies are only known before they are cleared
+        instance._cleared_society_ids = list(instance.societies_belongs_to.values_list('id', flat=True))
+    elif action in ('post_remove', 'post_clear'):
+        if isinstance(instance, Society):
+            society_ids = [instance.pk]
+        elif action == 'post_clear':
+            society_ids = getattr(instance, '_cleared_society_ids', [])
+        else:
+            society_ids = pk_set
+        society_stats_store.refresh(society_ids, create=False)
+
+
+@receiver(m2m_changed, sender=Attendance)
+def update_society_attendance_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    """Count added attendees in place; recount the hosts of events that lost attendees."""
+    if action == 'post_add' and pk_set:
+        if isinstance(instance, Event):
+            society_stats_store.add_attendance({instance.pk: len(pk_set)})
+        else:
+            society_stats_store.add_attendance({event_id: 1 for event_id in pk_set})
+    elif action == 'pre_clear' and not isinstance(instance, Event):
+        # The student's events are only known before they are cleared
+        instance._cleared_event_ids = list(instance.event_set.values_list('id', flat=True))
+    elif action in ('post_remove', 'post_clear'):
+        if isinstance(instance, Event):
+            society_ids = [instance.hosted_by_id]
+        else:
+            event_ids = getattr(instance, '_cleared_event_ids', []) if action == 'post_clear' else pk_set
+            society_ids = Event.objects.filter(id__in=event_ids).values_list('hosted_by_id', flat=True)
+        society_stats_store.refresh(society_ids, create=False)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def update_society_event_stats(sender, instance, **kwargs):
+    """Recount the host of a created, changed or deleted event."""
+    society_stats_store.refresh([instance.hosted_by_id], create=False)
@@ -0,0 +1,39 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from api import recommendation_service  # noqa: F401 - connects the Society receivers
+from api.models import Society, SocietySemanticProfile, Student
+
+
+class BackfillSemanticProfilesTest(TestCase):
+    """Tests for the backfill_semantic_profiles management command."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.out = StringIO()
+        student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        for name, description in [
+            ('Chess Club', 'Weekly chess games and tournaments'),
+            ('Film Club', 'Screenings and discussions of classic films'),
+        ]:
+            Society.objects.create(
+                name=name, description=description, category='General', status='Approved',
+                president=student
+            )
+
+    def test_backfills_missing_profiles(self):
+        """Test that only missing profiles are computed unless forced."""
+        SocietySemanticProfile.objects.filter(society__name='Film Club').delete()
+
+        call_command('backfill_semantic_profiles', stdout=self.out)
+
+        self.assertIn('Updated 1 of 2 society semantic profiles', self.out.getvalue())
+        self.assertEqual(SocietySemanticProfile.objects.count(), 2)
+
+    def test_force_recomputes_every_profile(self):
+        """Test that --force rewrites every profile."""
+        call_command('backfill_semantic_profiles', '--force', stdout=self.out)
+
+        self.assertIn('Updated 2 of 2 society semantic profiles', self.out.getvalue())
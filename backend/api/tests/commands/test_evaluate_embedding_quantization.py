@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from unittest.mock import patch, MagicMock
+import numpy as np
+from api.models import Society, Student, User
+
+
+class EvaluateEmbeddingQuantizationTest(TestCase):
+    """Tests for the evaluate_embedding_quantization management command."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.out = StringIO()
+
+        admin = User.objects.create_user(
+            username='admin123', email='admin@example.com', password='password', role='admin'
+        )
+        self.student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        for name, description in [
+            ('Chess Club', 'Weekly chess games and tournaments'),
+            ('Film Club', 'Screenings and discussions of classic films'),
+            ('Hiking Club', 'Weekend hikes in the countryside'),
+        ]:
+            Society.objects.create(
+                name=name, description=description, category='General', status='Approved',
+                president=self.student, approved_by=admin
+            )
+        self.student.societies.add(Society.objects.get(name='Chess Club'))
+
+    @patch('api.management.commands.evaluate_embedding_quantization.text_similarity_analyzer')
+    def test_without_sentence_model(self, mock_analyzer):
+        """Test that nothing is evaluated when embeddings are unavailable."""
+        mock_analyzer.sentence_model = None
+
+        call_command('evaluate_embedding_quantization', stdout=self.out)
+
+        self.assertIn('Sentence embeddings are unavailable', self.out.getvalue())
+
+    @patch('api.management.commands.evaluate_embedding_quantization.SocietyRecommender')
+    @patch('api.management.commands.evaluate_embedding_quantization.text_similarity_analyzer')
+    def test_reports_memory_drift_and_overlap(self, mock_analyzer, mock_recommender_class):
+        """Test that each precision reports memory saved, similarity drift and overlap."""
+        rng = np.random.default_rng(0)
+        mock_analyzer.sentence_model.encode.side_effect = (
+            lambda texts, convert_to_numpy=True: rng.standard_normal((len(texts), 384))
+        )
+        # Score with the store the command swapped in, as the real analyzer does
+        mock_analyzer.calculate_similarity_matrix.side_effect = (
+            lambda texts_a, texts_b: mock_analyzer.embedding_store.similarity_matrix(texts_a, texts_b) * 5
+        )
+        film_club = Society.objects.get(name='Film Club')
+        mock_recommender_class.return_value.get_recommendations_for_student.return_value = [film_club]
+
+        call_command('evaluate_embedding_quantization', stdout=self.out)
+
+        output = self.out.getvalue()
+        self.assertIn('float32: 4608 bytes for 3 society embeddings', output)
+        self.assertIn('=== int8 ===', output)
+        self.assertIn('Memory: 1164 bytes (saved 3444 bytes, 74.7%)', output)
+        self.assertIn('=== float16 ===', output)
+        self.assertIn('Memory: 2304 bytes (saved 2304 bytes, 50.0%)', output)
+        self.assertIn('Recommendation overlap: 1.0000 over 1 students', output)
+
+        drift_lines = [line for line in output.splitlines() if 'Similarity drift' in line]
+        self.assertEqual(len(drift_lines), 2)
+        for line in drift_lines:
+            self.assertLess(float(line.rsplit('max ', 1)[1]), 0.05)
@@ -0,0 +1,27 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from api.models import MaterializedRecommendation, Society, Student
+
+
+class MaterializeRecommendationsTest(TestCase):
+    """Tests for the materialize_recommendations management command."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.out = StringIO()
+        self.student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        for name in ['Chess Club', 'Film Club', 'Hiking Club']:
+            Society.objects.create(
+                name=name, description=f'{name} meetings', category='General', status='Approved',
+                president=self.student
+            )
+
+    def test_materializes_every_active_student(self):
+        """Test that the command stores up to --count recommendations per student."""
+        call_command('materialize_recommendations', '--count', '2', stdout=self.out)
+
+        self.assertIn('Materialized recommendations of 1 students', self.out.getvalue())
+        self.assertEqual(MaterializedRecommendation.objects.filter(student=self.student).count(), 2)
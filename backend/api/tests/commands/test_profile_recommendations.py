@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from unittest.mock import patch
+from api.models import Society, Student, User
+from api.scoring_stats import scoring_stats
+
+
+class ProfileRecommendationsTest(TestCase):
+    """Tests for the profile_recommendations management command."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.out = StringIO()
+
+        admin = User.objects.create_user(
+            username='admin123', email='admin@example.com', password='password', role='admin'
+        )
+        self.student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        for name, description in [
+            ('Chess Club', 'Weekly chess games and tournaments'),
+            ('Film Club', 'Screenings and discussions of classic films'),
+            ('Hiking Club', 'Weekend hikes in the countryside'),
+        ]:
+            Society.objects.create(
+                name=name, description=description, category='General', status='Approved',
+                president=self.student, approved_by=admin
+            )
+
+    def test_without_students(self):
+        """Test that nothing is profiled when no student has joined a society."""
+        call_command('profile_recommendations', stdout=self.out)
+
+        self.assertIn('No students with societies to profile', self.out.getvalue())
+
+    @patch('api.management.commands.profile_recommendations.SocietyRecommender')
+    def test_replays_requests_and_reports_stats(self, mock_recommender_class):
+        """Test that every request is replayed and recorded timings are reported."""
+        self.student.societies.add(Society.objects.get(name='Chess Club'))
+
+        def recommend(student_id, limit, diversity_level):
+            scoring_stats.record('recommender.get_recommendations', 0.002)
+            scoring_stats.cache_hit('recommender.pair_cache')
+            scoring_stats.fallback('analyzer.worker')
+            return []
+
+        mock_recommender_class.return_value.get_recommendations_for_student.side_effect = recommend
+
+        call_command('profile_recommendations', '--requests', '3', stdout=self.out)
+
+        output = self.out.getvalue()
+        self.assertEqual(
+            mock_recommender_class.return_value.get_recommendations_for_student.call_count, 3
+        )
+        self.assertIn('Profiled 3 requests over 1 students', output)
+        self.assertIn('recommender.get_recommendations', output)
+        self.assertIn('recommender.pair_cache', output)
+        self.assertIn('analyzer.worker', output)
+        scoring_stats.reset()
@@ -0,0 +1,24 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from api.models import MajorSocietyAffinity, Society, Student
+
+
+class RebuildMajorAffinityTest(TestCase):
+    """Tests for the rebuild_major_affinity management command."""
+
+    def test_rebuilds_every_affinity(self):
+        """Test that the command recomputes the affinities of every major."""
+        student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password', major='Physics'
+        )
+        society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', status='Approved', president=student
+        )
+        MajorSocietyAffinity.objects.all().delete()
+        out = StringIO()
+
+        call_command('rebuild_major_affinity', stdout=out)
+
+        self.assertIn('Rebuilt 1 major to society affinities', out.getvalue())
+        self.assertEqual(MajorSocietyAffinity.objects.get(major='Physics', society=society).member_count, 1)
@@ -0,0 +1,22 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from api.models import Society, SocietyStats, Student
+
+
+class ReconcileSocietyStatsTest(TestCase):
+    """Tests for the reconcile_society_stats management command."""
+
+    def test_reconciles_every_society(self):
+        """Test that the command recomputes the stats of every society."""
+        student = Student.objects.create(username='student1', email='student1@example.com', password='password')
+        society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', status='Approved', president=student
+        )
+        SocietyStats.objects.filter(society=society).update(member_count=0)
+        out = StringIO()
+
+        call_command('reconcile_society_stats', stdout=out)
+
+        self.assertIn('Reconciled the stats of 1 societies', out.getvalue())
+        self.assertEqual(SocietyStats.objects.get(society=society).member_count, 1)
@@ -0,0 +1,30 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from unittest.mock import patch
+
+
+class RunNLPWorkerTest(TestCase):
+    """Tests for the run_nlp_worker management command."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.out = StringIO()
+
+    @patch('api.management.commands.run_nlp_worker.NLPScoringServer')
+    @patch('api.management.commands.run_nlp_worker.text_similarity_analyzer')
+    def test_serves_until_interrupted(self, mock_analyzer, mock_server_class):
+        """Test that the worker warms up, serves on the socket and cleans up on exit."""
+        mock_analyzer.warm_up.return_value = {'tfidf_vectorizer': 0.25}
+        mock_server_class.return_value.serve_forever.side_effect = KeyboardInterrupt
+
+        call_command('run_nlp_worker', socket='/tmp/test_nlp.sock', stdout=self.out)
+
+        mock_server_class.assert_called_once_with('/tmp/test_nlp.sock', mock_analyzer, save_interval=300)
+        mock_server_class.return_value.server_close.assert_called_once()
+        self.assertIsNone(mock_analyzer.worker_client)
+
+        output = self.out.getvalue()
+        self.assertIn('Loaded tfidf_vectorizer in 0.250s', output)
+        self.assertIn('NLP scoring worker listening on /tmp/test_nlp.sock', output)
+        self.assertIn('NLP scoring worker stopped', output)
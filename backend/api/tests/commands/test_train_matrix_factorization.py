@@ -0,0 +1,31 @@
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase
+from api.matrix_factorization import FactorModel
+from api.models import Society, Student
+
+
+class TrainMatrixFactorizationTest(TestCase):
+    """Tests for the train_matrix_factorization management command."""
+
+    def test_trains_a_new_version(self):
+        """Test that the command stores factors of every interacting student and society."""
+        student = Student.objects.create(username='student1', email='student1@example.com', password='password')
+        society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', status='Approved', president=student
+        )
+        student.societies.add(society)
+        out = StringIO()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model = FactorModel(directory=tmp_dir)
+            with patch('api.management.commands.train_matrix_factorization.factor_model', model), \
+                    patch('api.matrix_factorization.feedback_processor.feedback_data', {'user_feedback': []}):
+                call_command('train_matrix_factorization', '--factors', '4', '--iterations', '2', stdout=out)
+
+            self.assertIn('Trained factors of 1 students and 1 societies', out.getvalue())
+            self.assertEqual(model.versions(), [model.version])
+            self.assertEqual(model.student_factors.shape, (1, 4))
+            self.assertEqual([society_id for society_id, _ in model.rank(student.id, 5)], [society.id])
@@ -6,7 +6,9 @@ from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
 
-from api.models import Society, Student, User
+from django.utils import timezone
+
+from api.models import MaterializedRecommendation, Society, Student, User
 from api.recommendation_service import SocietyRecommender
 
 User = get_user_model()
@@ -74,6 +76,14 @@ class RecommendationAPITestCase(TestCase):
         self.text_similarity_patcher = unittest.mock.patch('api.recommendation_service.text_similarity_analyzer')
         self.mock_text_similarity = self.text_similarity_patcher.start()
         self.mock_text_similarity.calculate_similarity.return_value = 0.75
+        self.mock_text_similarity.calculate_similarity_batch.side_effect = (
+            lambda texts, comparison_texts: [0.75] * len(texts)
+        )
+        self.mock_text_similarity.calculate_similarity_batch_with_pairs.side_effect = (
+            lambda texts, comparison_texts: (
+                [0.75] * len(texts), [[0.75] * len(comparison_texts) for _ in texts]
+            )
+        )
         
         self.semantic_enhancer_patcher = unittest.mock.patch('api.recommendation_service.semantic_enhancer')
         self.mock_semantic_enhancer = self.semantic_enhancer_patcher.start()
@@ -117,6 +127,67 @@ class RecommendationAPITestCase(TestCase):
         self.assertIn('type', explanation)
         self.assertIn('message', explanation)
 
+    def test_recommended_societies_explained_during_scoring(self):
+        """Test that explanations come with the ranked list instead of being recomputed per item"""
+        with unittest.mock.patch.object(SocietyRecommender, 'get_recommendation_explanation') as mock_explain:
+            response = self.client.get(reverse('recommended_societies'))
+
+        mock_explain.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data)
+        for item in response.data:
+            self.assertEqual(item['explanation']['type'], 'similarity')
+
+    def test_recommended_societies_served_from_cache(self):
+        """Test that repeat loads reuse the cached recommendations until memberships change"""
+        with unittest.mock.patch.object(
+            SocietyRecommender, 'get_recommendations_for_student', return_value=[self.societies[1]]
+        ) as mock_recommend:
+            first = self.client.get(reverse('recommended_societies'))
+            second = self.client.get(reverse('recommended_societies'))
+            self.assertEqual(mock_recommend.call_count, 1)
+            self.assertEqual(
+                [item['society']['id'] for item in first.data],
+                [item['society']['id'] for item in second.data]
+            )
+
+            self.student.societies.add(self.societies[2])
+            self.client.get(reverse('recommended_societies'))
+            self.assertEqual(mock_recommend.call_count, 2)
+
+    def test_recommended_societies_served_from_materialized_rows(self):
+        """Test that fresh materialized recommendations are served without scoring"""
+        MaterializedRecommendation.objects.create(
+            student=self.student, rank=1, society=self.societies[3], score=4.2,
+            explanation_type='category', explanation_message='Similar to your societies',
+            computed_at=timezone.now()
+        )
+
+        with unittest.mock.patch.object(SocietyRecommender, 'get_recommendations_for_student') as mock_recommend:
+            response = self.client.get(reverse('recommended_societies'))
+
+        mock_recommend.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['society']['id'] for item in response.data], [self.societies[3].id])
+        self.assertEqual(response.data[0]['explanation']['type'], 'category')
+
+    def test_recommended_societies_factorization_mode(self):
+        """Test that the factorization mode is ranked by the factor model, bypassing cached results"""
+        MaterializedRecommendation.objects.create(
+            student=self.student, rank=1, society=self.societies[3], score=4.2,
+            explanation_type='category', explanation_message='Similar to your societies',
+            computed_at=timezone.now()
+        )
+
+        with unittest.mock.patch(
+            'api.recommendation_service.factor_model.rank', return_value=[(self.societies[2].id, 0.9)]
+        ):
+            response = self.client.get(reverse('recommended_societies'), {'mode': 'factorization'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['society']['id'] for item in response.data], [self.societies[2].id])
+        self.assertEqual(response.data[0]['explanation']['type'], 'collaborative')
+
     def test_explanation_endpoint(self):
         """Test that the explanation endpoint works properly"""
         non_member_society = self.societies[1]
@@ -118,6 +118,14 @@ class RecommendationServiceTestCase(TestCase):
         text_similarity_patcher = unittest.mock.patch('api.recommendation_service.text_similarity_analyzer')
         self.mock_text_similarity = text_similarity_patcher.start()
         self.mock_text_similarity.calculate_similarity.return_value = 0.75
+        self.mock_text_similarity.calculate_similarity_batch.side_effect = (
+            lambda texts, comparison_texts: [0.75] * len(texts)
+        )
+        self.mock_text_similarity.calculate_similarity_batch_with_pairs.side_effect = (
+            lambda texts, comparison_texts: (
+                [0.75] * len(texts), [[0.75] * len(comparison_texts) for _ in texts]
+            )
+        )
         self.addCleanup(text_similarity_patcher.stop)
         
         semantic_enhancer_patcher = unittest.mock.patch('api.recommendation_service.semantic_enhancer')
@@ -0,0 +1,58 @@
+import threading
+from unittest.mock import Mock
+from django.test import TestCase
+from api.background_refresh import BackgroundRefresh
+from api.scoring_stats import scoring_stats
+
+
+class BackgroundRefreshTest(TestCase):
+    """Tests for the per-process background refresh."""
+
+    def test_refresh_runs_in_a_thread_after_commit(self):
+        """Test that a request only starts the refresh once the transaction commits."""
+        refresh = Mock()
+        background = BackgroundRefresh('test.refresh', refresh)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            background.request()
+            refresh.assert_not_called()
+        self.assertEqual(callbacks, [background._start])
+
+        callbacks[0]()
+        background.join(timeout=5)
+        refresh.assert_called_once()
+        self.assertFalse(background.running)
+
+    def test_requests_during_a_run_rerun_once(self):
+        """Test that requests made while a refresh runs start no thread but one more run."""
+        started, release = threading.Event(), threading.Event()
+
+        def refresh():
+            started.set()
+            release.wait(timeout=5)
+
+        refresh_mock = Mock(side_effect=refresh)
+        background = BackgroundRefresh('test.refresh', refresh_mock)
+
+        background._start()
+        started.wait(timeout=5)
+        thread = background._thread
+        background._start()
+        background._start()
+        self.assertIs(background._thread, thread)
+
+        release.set()
+        background.join(timeout=5)
+        self.assertEqual(refresh_mock.call_count, 2)
+        self.assertFalse(background.running)
+
+    def test_failed_refresh_is_counted(self):
+        """Test that an exception in the thread is recorded as a fallback."""
+        scoring_stats.reset('test.')
+        background = BackgroundRefresh('test.refresh', Mock(side_effect=ValueError))
+
+        background._start()
+        background.join(timeout=5)
+
+        self.assertEqual(scoring_stats.snapshot('test.')['fallbacks'], {'test.refresh': 1})
+        self.assertFalse(background.running)
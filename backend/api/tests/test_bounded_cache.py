@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import patch
+from api.bounded_cache import BoundedCache
+
+
+class TestBoundedCache(unittest.TestCase):
+    """Test suite for the bounded LRU/TTL cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently read entry is evicted first."""
+        cache = BoundedCache('test.cache', maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_entries_expire(self):
+        """Test that entries are not served after their time to live."""
+        cache = BoundedCache('test.cache', ttl=10)
+        with patch('api.bounded_cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with patch('api.bounded_cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('api.bounded_cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        """Test that hits and misses are counted."""
+        cache = BoundedCache('test.cache')
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_discard(self):
+        """Test that only the given keys are dropped."""
+        cache = BoundedCache('test.cache')
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.discard(['a', 'c']), 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
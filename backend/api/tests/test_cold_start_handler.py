@@ -2,6 +2,7 @@ from django.test import TestCase
 from django.db.models import Count
 from unittest.mock import patch, MagicMock, PropertyMock
 from api.cold_start_handler import ColdStartHandler
+from api.society_profile_store import society_profile_store
 from api.models import Society, Student, User
 
 
@@ -97,16 +98,14 @@ class ColdStartHandlerTest(TestCase):
         self.assertEqual(recommendations, [])
 
     def test_get_major_based_recommendations(self):
-        """Test that major-based recommendations are retrieved correctly."""
-        with patch('api.models.Society.objects.filter') as mock_filter:
-            mock_filter.return_value.annotate.return_value.order_by.return_value = [self.society1, self.society2]
-            
-            recommendations = self.handler._get_major_based_recommendations('Computer Science')
-            
-            mock_filter.assert_called_once()
-            self.assertEqual(len(recommendations), 2)
-            self.assertEqual(recommendations[0], self.society1)
-            self.assertEqual(recommendations[1], self.society2)
+        """Test that major-based recommendations are ranked by the precomputed affinities."""
+        self.society2.society_members.add(self.student1)
+        self.society3.society_members.add(self.student2)
+        
+        recommendations = self.handler._get_major_based_recommendations('Computer Science')
+        
+        self.assertEqual(recommendations, [self.society1, self.society2, self.society3])
+        self.assertEqual(self.handler._get_major_based_recommendations('Computer Science', 1), [self.society1])
 
     def test_get_major_based_recommendations_empty_major(self):
         """Test that empty major returns empty list."""
@@ -130,42 +129,74 @@ class ColdStartHandlerTest(TestCase):
         recommendations = self.handler._get_social_based_recommendations([])
         self.assertEqual(recommendations, [])
 
-    @patch('api.cold_start_handler.Society.objects')
-    def test_get_diverse_popular_societies(self, mock_society_objects):
-        """Test that diverse popular societies are retrieved correctly."""
-        handler = ColdStartHandler()
-        
-        mock_categories_query = MagicMock()
-        mock_society_objects.filter.return_value = mock_categories_query
-        mock_categories_query.values.return_value.annotate.return_value.order_by.return_value = [
-            {'category': 'tech'},
-            {'category': 'academic'},
-            {'category': 'social'}
-        ]
+    def test_get_diverse_popular_societies(self):
+        """Test that every category's leader comes first, then the runners-up, most members first."""
+        runner_up = Society.objects.create(
+            name='Robotics Club',
+            description='Building robots',
+            category='tech',
+            status='Approved',
+            president=self.student2
+        )
+        third = Society.objects.create(
+            name='Coding Club',
+            description='Competitive programming',
+            category='tech',
+            status='Approved',
+            president=self.student2
+        )
+        self.society1.society_members.add(self.student2)
         
-        def side_effect_filter(*args, **kwargs):
-            if 'category' in kwargs:
-                mock_result = MagicMock()
-                if kwargs['category'] == 'tech':
-                    mock_result.annotate.return_value.order_by.return_value.first.return_value = self.society1
-                    mock_result.annotate.return_value.order_by.return_value.__getitem__.return_value.first.return_value = None
-                elif kwargs['category'] == 'academic':
-                    mock_result.annotate.return_value.order_by.return_value.first.return_value = self.society2
-                    mock_result.annotate.return_value.order_by.return_value.__getitem__.return_value.first.return_value = None
-                elif kwargs['category'] == 'social':
-                    mock_result.annotate.return_value.order_by.return_value.first.return_value = self.society3
-                    mock_result.annotate.return_value.order_by.return_value.__getitem__.return_value.first.return_value = None
-                return mock_result
-            return mock_categories_query
-        
-        mock_society_objects.filter.side_effect = side_effect_filter
-        
-        result = handler._get_diverse_popular_societies()
-        
-        self.assertEqual(len(result), 3)
-        self.assertIn(self.society1, result)
-        self.assertIn(self.society2, result)
-        self.assertIn(self.society3, result)
+        result = self.handler._get_diverse_popular_societies()
+        
+        self.assertEqual(result, [self.society1, self.society2, self.society3, runner_up])
+        self.assertNotIn(third, result)
+        self.assertEqual(self.handler._get_diverse_popular_societies(2), [self.society1, self.society2])
+
+    def test_rankings_are_cached(self):
+        """Test that the category leaders and major rankings are reused until they expire."""
+        self.society1.society_members.add(self.student2)
+        self.handler._get_diverse_popular_societies(5)
+        self.handler._get_major_based_recommendations('Engineering', 5)
+        
+        with self.assertNumQueries(0):
+            leaders = self.handler._get_diverse_popular_societies(5)
+            ranking = self.handler._get_major_based_recommendations('Engineering', 5)
+        
+        self.assertEqual(leaders[0], self.society1)
+        self.assertEqual(ranking, [self.society1, self.society2])
+        
+        # The major's own affinities, then those of its similar majors
+        self.handler.major_rankings.clear()
+        with self.assertNumQueries(2):
+            self.handler._get_major_based_recommendations('Engineering', 5)
+
+    def test_initial_recommendations_use_constant_queries(self):
+        """Test that a new user's recommendations take the same few queries however many societies exist."""
+        new_student = Student.objects.create(
+            username='newstudent',
+            email='newstudent@example.com',
+            major='Engineering',
+            status='Approved'
+        )
+        new_student.following.add(self.student1)
+        for i in range(20):
+            Society.objects.create(
+                name=f'Extra Society {i}',
+                description='Another society',
+                category=f'category {i % 7}',
+                status='Approved',
+                president=self.student2
+            )
+        
+        # Student, followed users, major ranking, friends' societies and category leaders
+        with self.assertNumQueries(5):
+            recommendations = self.handler.get_initial_recommendations(new_student.id, 5)
+        self.assertEqual(len(recommendations), 5)
+        
+        # The major ranking and the category leaders are cached for the next new user
+        with self.assertNumQueries(3):
+            self.handler.get_initial_recommendations(new_student.id, 5)
 
     def test_ensure_category_diversity(self):
         """Test that category diversity is ensured in recommendations."""
@@ -222,4 +253,20 @@ class ColdStartHandlerTest(TestCase):
         with patch('builtins.hasattr', return_value=False):
             explanation = self.handler.get_explanation_for_cold_start(category_society)
             self.assertEqual(explanation['type'], 'category')
-            self.assertIn('technology', explanation['message'])
\ No newline at end of file
+            self.assertIn('technology', explanation['message'])
+
+    def test_get_explanation_for_cold_start_uses_semantic_profile(self):
+        """Test that a free-form category is described by the society's stored semantic profile."""
+        society = Society.objects.create(
+            name='Trail Society',
+            description='Weekend hiking and camping trips',
+            category='Weekend trips',
+            status='Approved',
+            president=self.student1
+        )
+        society_profile_store.update(society)
+
+        explanation = self.handler.get_explanation_for_cold_start(Society.objects.get(id=society.id))
+
+        self.assertEqual(explanation['type'], 'category')
+        self.assertIn('outdoor activities', explanation['message'])
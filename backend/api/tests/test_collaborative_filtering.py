@@ -0,0 +1,133 @@
+import math
+from unittest.mock import patch
+from django.test import TestCase
+from api import recommendation_service  # noqa: F401 - connects the co-occurrence receivers
+from api.collaborative_filtering import SocietyCoOccurrence, society_cooccurrence
+from api.models import Event, Society, Student
+
+
+class SocietyCoOccurrenceTest(TestCase):
+    """Tests for the item-item collaborative filtering engine."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.students = [
+            Student.objects.create(
+                username=f'student{i}', email=f'student{i}@example.com', password='password'
+            )
+            for i in range(4)
+        ]
+        president = Student.objects.create(
+            username='president', email='president@example.com', password='password'
+        )
+        self.chess, self.go, self.film, self.hiking = [
+            Society.objects.create(
+                name=name, description=f'{name} society', status='Approved', president=president
+            )
+            for name in ('Chess', 'Go', 'Film', 'Hiking')
+        ]
+        # The president joins every society on creation; leave them out of the co-occurrences
+        Society.society_members.through.objects.filter(student=president).delete()
+        # Chess and Go share two of their members; Film shares one with Chess
+        self.students[0].societies.add(self.chess, self.go)
+        self.students[1].societies.add(self.chess, self.go, self.film)
+        self.students[2].societies.add(self.chess)
+        self.film.society_members.add(self.students[3])
+        self.engine = SocietyCoOccurrence(k=2, max_age=3600)
+        self.engine.build()
+        self.built_at = self.engine.built_at
+        patcher = patch('api.collaborative_filtering.society_cooccurrence', self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(society_cooccurrence.invalidate)
+
+    def assertMatchesRebuild(self):
+        """The incrementally updated neighbor lists equal a full rebuild."""
+        # Updated in place, not rebuilt
+        self.assertFalse(self.engine.refresh())
+        self.assertEqual(self.engine.built_at, self.built_at)
+        rebuilt = SocietyCoOccurrence(k=self.engine.k, metric=self.engine.metric)
+        rebuilt.build()
+        self.assertEqual(self.engine.neighbors, rebuilt.neighbors)
+        self.assertEqual(self.engine.student_societies, rebuilt.student_societies)
+
+    def test_cosine_neighbors(self):
+        """Test that neighbors are ranked by cosine similarity of their co-membership."""
+        neighbors = dict(self.engine.get_neighbors(self.chess.id))
+
+        self.assertEqual(list(neighbors), [self.go.id, self.film.id])
+        self.assertAlmostEqual(neighbors[self.go.id], 2 / math.sqrt(3 * 2))
+        self.assertAlmostEqual(neighbors[self.film.id], 1 / math.sqrt(3 * 2))
+        self.assertEqual(self.engine.get_neighbors(self.hiking.id), [])
+
+    def test_jaccard_neighbors(self):
+        """Test that the Jaccard metric divides by the union of the member sets."""
+        engine = SocietyCoOccurrence(metric='jaccard')
+        engine.build()
+
+        self.assertEqual(dict(engine.get_neighbors(self.go.id)), {self.chess.id: 2 / 3, self.film.id: 1 / 3})
+
+    def test_attendance_counts_as_interaction(self):
+        """Test that attending a society's event links the student to the society."""
+        event = Event.objects.create(title='Trail walk', hosted_by=self.hiking)
+        event.current_attendees.add(self.students[3])
+        self.students[2].attended_events.add(event)
+
+        self.assertIn(self.hiking.id, dict(self.engine.get_neighbors(self.film.id)))
+        self.assertMatchesRebuild()
+
+    def test_incremental_updates_match_rebuild(self):
+        """Test that joins, leaves and clears keep the lists exact without a rebuild."""
+        self.students[3].societies.add(self.hiking, self.go)
+        self.assertMatchesRebuild()
+
+        self.chess.society_members.add(self.students[3])
+        self.go.members.remove(self.students[0])
+        self.assertMatchesRebuild()
+
+        self.students[1].societies.clear()
+        self.assertMatchesRebuild()
+
+    def test_clear_from_society_side_updates_in_place(self):
+        """Test that a clear from the society side updates the students it removed."""
+        self.film.society_members.clear()
+
+        self.assertEqual(dict(self.engine.get_neighbors(self.film.id)), {
+            self.chess.id: 1 / math.sqrt(3), self.go.id: 1 / math.sqrt(2)
+        })
+        self.assertMatchesRebuild()
+
+    def test_unseen_changes_are_picked_up_by_refresh(self):
+        """Test that changes made without signals only show once refresh() rebuilds the stale state."""
+        Student.societies.through.objects.filter(society=self.film).delete()
+        Society.society_members.through.objects.all().delete()
+        self.assertIn(self.film.id, dict(self.engine.get_neighbors(self.chess.id)))
+
+        self.engine.built_at -= self.engine.max_age + 1
+        self.assertTrue(self.engine.refresh())
+        self.assertEqual(dict(self.engine.get_neighbors(self.chess.id)), {self.go.id: 2 / math.sqrt(3 * 2)})
+
+    def test_lookups_never_build(self):
+        """Test that lookups read the built state only, leaving the build to a background refresh."""
+        engine = SocietyCoOccurrence()
+        with self.assertNumQueries(0), self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(engine.get_neighbors(self.chess.id), [])
+            self.assertEqual(engine.scores_for([self.chess.id]), {})
+            self.assertEqual(self.engine.scores_for([self.go.id]), {
+                self.chess.id: 2 / math.sqrt(3 * 2), self.film.id: 1 / math.sqrt(2 * 2)
+            })
+        self.assertIsNone(engine.built_at)
+        # Only the unbuilt engine asks for a refresh, once the transaction commits
+        self.assertEqual(set(callbacks), {engine._background_refresh._start})
+
+    def test_scores_for_joined_societies(self):
+        """Test that scores are summed over the joined societies, excluding them."""
+        scores = self.engine.scores_for([self.chess.id, self.go.id])
+
+        self.assertEqual(list(scores), [self.film.id])
+        self.assertAlmostEqual(scores[self.film.id], 1 / math.sqrt(6) + 1 / math.sqrt(4))
+
+    def test_unknown_metric(self):
+        """Test that only cosine and Jaccard scores are supported."""
+        with self.assertRaises(ValueError):
+            SocietyCoOccurrence(metric='pearson')
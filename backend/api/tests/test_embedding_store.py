@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+from api.embedding_store import SocietyEmbeddingStore
+
+
+class TestSocietyEmbeddingStore(unittest.TestCase):
+    """Test suite for the memory-mapped society embedding store."""
+
+    def setUp(self):
+        """Point the store at a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = self._make_store()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _make_store(self, precision='float32'):
+        store = SocietyEmbeddingStore(precision=precision)
+        store.vectors_path = os.path.join(self.tmp_dir, 'society_embeddings.f32')
+        store.index_path = os.path.join(self.tmp_dir, 'society_embeddings_index.json')
+        return store
+
+    def test_empty_store(self):
+        """Test lookups on a store that has not been written yet."""
+        self.assertIsNone(self.store.get(1))
+        self.assertIsNone(self.store.get_by_text("Chess club"))
+        self.assertTrue(self.store.needs_update(1, "Chess club"))
+
+    def test_update_appends_and_overwrites(self):
+        """Test that new societies are appended and edited ones overwritten in place."""
+        self.store.update(1, "Chess club", [1.0, 0.0, 0.0])
+        self.store.update(2, "Film club", [0.0, 1.0, 0.0])
+        self.assertEqual(self.store.row_count, 2)
+        self.assertFalse(self.store.needs_update(1, "Chess club"))
+        self.assertTrue(self.store.needs_update(1, "Chess and go club"))
+
+        self.store.update(1, "Chess and go club", [0.0, 0.0, 1.0])
+        self.assertEqual(self.store.row_count, 2)
+        np.testing.assert_array_equal(self.store.get(1), [0.0, 0.0, 1.0])
+        np.testing.assert_array_equal(self.store.get_by_text("Chess and go club"), [0.0, 0.0, 1.0])
+        self.assertIsNone(self.store.get_by_text("Chess club"))
+
+    def test_vectors_are_memory_mapped_float32(self):
+        """Test that vectors are opened as a float32 memory map."""
+        self.store.update(1, "Chess club", [0.5, 0.25])
+        self.assertIsInstance(self.store.vectors, np.memmap)
+        self.assertEqual(self.store.vectors.dtype, np.float32)
+
+    def test_other_instance_sees_updates(self):
+        """Test that another instance (e.g. another worker) reads the persisted vectors."""
+        self.store.update(7, "Debate society", [0.1, 0.2, 0.3])
+        reader = self._make_store()
+        np.testing.assert_allclose(reader.get(7), [0.1, 0.2, 0.3], rtol=1e-6)
+
+    def test_concurrent_writers_keep_every_update(self):
+        """Test that writers with their own store instances (like separate processes) lose no rows."""
+        writers = [self._make_store() for _ in range(2)]
+
+        def append(store, offset):
+            for i in range(offset, offset + 20):
+                store.update(i, f"Society {i}", [float(i), 1.0])
+
+        threads = [
+            threading.Thread(target=append, args=(store, offset))
+            for store, offset in zip(writers, (0, 100))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reader = self._make_store()
+        reader.refresh()
+        self.assertEqual(reader.row_count, 40)
+        for i in list(range(20)) + list(range(100, 120)):
+            np.testing.assert_array_equal(reader.get(i), [float(i), 1.0])
+
+    def test_remove(self):
+        """Test that removed societies are no longer returned."""
+        self.store.update(1, "Chess club", [1.0, 0.0])
+        self.store.remove(1)
+        self.assertIsNone(self.store.get(1))
+        self.assertTrue(self.store.needs_update(1, "Chess club"))
+
+    def test_rebuild_reuses_unchanged_vectors(self):
+        """Test that rebuild only encodes new or changed descriptions and compacts the file."""
+        self.store.update(1, "Chess club", [1.0, 0.0])
+        self.store.update(2, "Film club", [0.0, 1.0])
+        encoded_texts = []
+
+        def encode(texts):
+            encoded_texts.extend(texts)
+            return np.ones((len(texts), 2))
+
+        count = self.store.rebuild([(1, "Chess club"), (3, "Hiking club"), (4, "")], encode)
+        self.assertEqual(count, 2)
+        self.assertEqual(encoded_texts, ["Hiking club"])
+        self.assertEqual(self.store.row_count, 2)
+        self.assertIsNone(self.store.get(2))
+        np.testing.assert_array_equal(self.store.get(1), [1.0, 0.0])
+        np.testing.assert_array_equal(self.store.get(3), [1.0, 1.0])
+
+    def test_int8_storage_round_trip(self):
+        """Test that int8 vectors are stored with a per-vector scale and dequantized on read."""
+        store = self._make_store('int8')
+        store.update(1, "Chess club", [0.5, -0.25, 0.1])
+        self.assertEqual(store.vectors.dtype, np.int8)
+        self.assertEqual(store.nbytes, 3 + 4)
+        np.testing.assert_allclose(store.get(1), [0.5, -0.25, 0.1], atol=0.5 / 127)
+
+        reader = self._make_store()
+        np.testing.assert_allclose(reader.get(1), [0.5, -0.25, 0.1], atol=0.5 / 127)
+
+    def test_float16_storage(self):
+        """Test that float16 storage halves the vector bytes."""
+        store = self._make_store('float16')
+        store.rebuild([(1, "Chess club"), (2, "Film club")], lambda texts: np.ones((len(texts), 4)))
+        self.assertEqual(store.vectors.dtype, np.float16)
+        self.assertEqual(store.nbytes, 2 * 4 * 2)
+
+    def test_quantized_similarity_matches_full_precision(self):
+        """Test that similarity computed on int8/float16 rows stays close to float32."""
+        rng = np.random.default_rng(0)
+        texts = [f"Society {i}" for i in range(20)]
+        vectors = rng.standard_normal((20, 64))
+        societies = list(enumerate(texts))
+
+        self.store.rebuild(societies, lambda batch: vectors[[texts.index(t) for t in batch]])
+        full = self.store.similarity_matrix(texts, texts + [""])
+        self.assertTrue(np.all(full[:, -1] == 0))
+
+        for precision in ('int8', 'float16'):
+            store = self._make_store(precision)
+            store.rebuild(societies, lambda batch: vectors[[texts.index(t) for t in batch]])
+            quantized = store.similarity_matrix(texts, texts + [""])
+            np.testing.assert_allclose(quantized, full, atol=0.01)
+
+    def test_precision_change_rewrites_store(self):
+        """Test that updating a store written in another precision converts every row."""
+        self.store.update(1, "Chess club", [1.0, 0.0])
+        store = self._make_store('int8')
+        store.update(2, "Film club", [0.0, 1.0])
+
+        self.assertEqual(store.vectors.dtype, np.int8)
+        self.assertFalse(store.needs_update(1, "Chess club"))
+        np.testing.assert_allclose(store.get(1), [1.0, 0.0])
+        np.testing.assert_allclose(store.get(2), [0.0, 1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
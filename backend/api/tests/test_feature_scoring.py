@@ -0,0 +1,83 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from api.feature_scoring import FeatureScoringEngine, FEATURES
+
+
+def make_society(name, category, tags=None, description='', recent_event_count=0):
+    return SimpleNamespace(
+        name=name, category=category, tags=tags, description=description,
+        recent_event_count=recent_event_count
+    )
+
+
+class TestFeatureScoringEngine(unittest.TestCase):
+    """Test suite for the feature-matrix recommendation scoring."""
+
+    def setUp(self):
+        self.engine = FeatureScoringEngine()
+        self.context = {
+            'joined_categories': {'Technology'},
+            'joined_tags': {'coding', 'ai'},
+            'joined_descriptions': ['A society for programmers'],
+            'identical_descriptions': True,
+            'semantic_texts': ['Tech Society Technology'],
+            'attended_event_categories': {'Arts'},
+        }
+
+    def test_feature_matrix_columns(self):
+        """Test that every feature column is filled from the candidate attributes."""
+        candidates = [
+            make_society('Code Club', 'Technology', ['coding', 'ai', 'web'], 'Coding together'),
+            make_society('Art Club', 'Arts', None, ''),
+        ]
+        with patch('api.feature_scoring.semantic_enhancer.calculate_semantic_boost_matrix',
+                   return_value=np.array([[0.4]])) as mock_boost:
+            features = self.engine.feature_matrix(candidates, self.context, [2.0, 5.0])
+
+        mock_boost.assert_called_once_with(['Code Club Technology'], ['Tech Society Technology'])
+        self.assertEqual(features.shape, (2, len(FEATURES)))
+        np.testing.assert_allclose(features[0], [1, 2, 2.0, 0.4, 0, 0])
+        # Undescribed candidates get no description-based features
+        np.testing.assert_allclose(features[1], [0, 0, 0, 0, 1, 0])
+
+    def test_default_weights_match_original_scoring(self):
+        """Test the original formula: (3 + 2/tag + 1.5 x similarity + 2 attended) x 1.2 if recent."""
+        self.context['identical_descriptions'] = False
+        candidates = [
+            make_society('Code Club', 'Technology', ['coding'], 'Coding together', recent_event_count=2),
+            make_society('Art Club', 'Arts', ['painting'], 'Painting together'),
+        ]
+
+        scores = self.engine.score(candidates, self.context, [2.0, 1.0])
+
+        np.testing.assert_allclose(scores, [(3 + 2 + 1.5 * 2.0) * 1.2, 1.5 * 1.0 + 2])
+
+    def test_custom_weights(self):
+        """Test that weights can be overridden per feature."""
+        engine = FeatureScoringEngine(weights={'category_match': 10.0}, recency_boost=1.0)
+        self.context['identical_descriptions'] = False
+        scores = engine.score(
+            [make_society('Code Club', 'Technology', recent_event_count=1)], self.context
+        )
+        np.testing.assert_allclose(scores, [10.0])
+
+    def test_co_membership_scores(self):
+        """Test that co-occurrence scores of the joined societies are blended in by society id."""
+        self.context['identical_descriptions'] = False
+        self.context['co_membership_scores'] = {7: 0.5}
+        candidates = [make_society('Art Club', 'Arts'), make_society('Film Club', 'Film')]
+        candidates[0].id, candidates[1].id = 7, 8
+
+        scores = self.engine.score(candidates, self.context)
+
+        np.testing.assert_allclose(scores, [2 + 2.0 * 0.5, 0])
+
+    def test_no_candidates(self):
+        """Test that an empty candidate list scores to an empty array."""
+        self.assertEqual(len(self.engine.score([], self.context)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
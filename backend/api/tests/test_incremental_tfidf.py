@@ -0,0 +1,116 @@
+import pickle
+import unittest
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from api.incremental_tfidf import IncrementalTfidfModel
+
+
+class TestIncrementalTfidfModel(unittest.TestCase):
+    """Test suite for the incremental TF-IDF model."""
+
+    def setUp(self):
+        """Set up a small corpus of society descriptions."""
+        self.documents = [
+            "computer science society programming competitions tech talks",
+            "cs club coding contests technology presentations",
+            "photography club workshops digital film photography techniques",
+            "film club cinema lovers classic films",
+        ]
+        self.queries = ["film photography club cinema", "programming club", ""]
+
+    def _similarities(self, vectorizer):
+        return (vectorizer.transform(self.queries) @ vectorizer.transform(self.documents).T).toarray()
+
+    def test_full_fit_matches_scikit_learn(self):
+        """Test that a full fit gives the same cosine similarities as TfidfVectorizer."""
+        expected = self._similarities(
+            TfidfVectorizer(max_df=0.95, stop_words='english', ngram_range=(1, 3)).fit(self.documents)
+        )
+        model = IncrementalTfidfModel(max_df=0.95, stop_words='english', ngram_range=(1, 3))
+        np.testing.assert_allclose(self._similarities(model.fit(self.documents)), expected, atol=1e-12)
+
+    def test_incremental_updates_match_full_fit(self):
+        """Test that adding, editing and removing documents matches refitting from scratch."""
+        model = IncrementalTfidfModel(max_df=0.95, ngram_range=(1, 3))
+        model.fit([])
+        model.add_document('a', self.documents[0])
+        model.add_document('b', "an unrelated description about chess")
+        model.add_document('c', self.documents[2])
+        model.add_document('b', self.documents[1])
+        model.add_document('d', self.documents[3])
+        model.add_document('e', "a society that will be removed")
+        self.assertTrue(model.remove_document('e'))
+        self.assertFalse(model.remove_document('missing'))
+
+        full = IncrementalTfidfModel(max_df=0.95, ngram_range=(1, 3)).fit(self.documents)
+        self.assertEqual(model.document_count, 4)
+        np.testing.assert_allclose(self._similarities(model), self._similarities(full), atol=1e-12)
+
+    def test_unchanged_document_is_not_re_added(self):
+        """Test that re-adding the same text for a key reports no change."""
+        model = IncrementalTfidfModel()
+        self.assertTrue(model.add_document(1, "chess club"))
+        self.assertFalse(model.add_document(1, "club chess"))
+        self.assertTrue(model.add_document(1, "chess and draughts club"))
+
+    def test_term_counts_match_count_vectorizer(self):
+        """Test that the count mode gives the same counts as CountVectorizer."""
+        expected = CountVectorizer(stop_words='english').fit(self.documents)
+        model = IncrementalTfidfModel(use_idf=False, norm=None).fit(self.documents)
+
+        counts = model.transform(["photography photography film"]).toarray()[0]
+        names = model.get_feature_names_out()
+        self.assertEqual(
+            {name: count for name, count in zip(names, counts) if count},
+            {'photography': 2, 'film': 1}
+        )
+        self.assertEqual(sorted(model.vocabulary_), sorted(expected.vocabulary_))
+        self.assertEqual(
+            [names[i] for i in np.argsort(model.feature_rank_)],
+            list(expected.get_feature_names_out())
+        )
+
+    def test_vocabulary_marks_fitted_state(self):
+        """Test that vocabulary_ is only available once the model has been fitted."""
+        model = IncrementalTfidfModel()
+        self.assertFalse(hasattr(model, 'vocabulary_'))
+        with self.assertRaises(ValueError):
+            model.transform(["chess"])
+
+        model.fit(self.documents)
+        self.assertTrue(hasattr(model, 'vocabulary_'))
+        del model.vocabulary_
+        self.assertFalse(hasattr(model, 'vocabulary_'))
+
+    def test_pickle_round_trip(self):
+        """Test that a pickled model keeps its state and can still transform."""
+        model = IncrementalTfidfModel(ngram_range=(1, 2)).fit(self.documents)
+        restored = pickle.loads(pickle.dumps(model))
+        np.testing.assert_allclose(
+            restored.transform(["film club"]).toarray(), model.transform(["film club"]).toarray()
+        )
+        restored.add_document('new', "board games night")
+        self.assertEqual(restored.document_count, 5)
+
+    def test_prune_drops_unused_terms(self):
+        """Test that terms of removed documents leave the vocabulary and similarities are unchanged."""
+        model = IncrementalTfidfModel().fit(self.documents)
+        model.add_document('gone', "chess draughts backgammon")
+        model.remove_document('gone')
+        before = self._similarities(model)
+
+        self.assertEqual(model.prune(), 3)
+        self.assertNotIn('chess', model.vocabulary_)
+        np.testing.assert_allclose(self._similarities(model), before, atol=1e-12)
+
+    def test_max_features_bounds_vocabulary(self):
+        """Test that the vocabulary is pruned to the most common terms once it doubles the cap."""
+        model = IncrementalTfidfModel(max_features=3).fit(self.documents)
+        self.assertEqual(sorted(model.vocabulary_), ['cinema', 'club', 'film'])
+
+        for i in range(3):
+            model.add_document(f'new{i}', f"club term{i}a term{i}b")
+            self.assertLessEqual(len(model.vocabulary_), 6)
+        self.assertIn('club', model.vocabulary_)
+        # A document whose pruned terms are unchanged is still recognized
+        self.assertFalse(model.add_document(0, self.documents[0]))
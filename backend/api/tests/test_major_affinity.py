@@ -0,0 +1,94 @@
+from django.test import TestCase
+from api.major_affinity import MajorAffinityStore, major_affinity_store
+from api.models import MajorSimilarity, MajorSocietyAffinity, Society, Student
+
+
+class MajorAffinityTest(TestCase):
+    """Tests for the precomputed major to society affinities."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.president = Student.objects.create(
+            username='president', email='president@example.com', password='password'
+        )
+        self.physics = [
+            Student.objects.create(
+                username=f'physics{i}', email=f'physics{i}@example.com', password='password', major='Physics'
+            )
+            for i in range(3)
+        ]
+        self.maths = Student.objects.create(
+            username='maths', email='maths@example.com', password='password', major='Mathematics'
+        )
+        self.history = Student.objects.create(
+            username='history', email='history@example.com', password='password', major='History'
+        )
+        self.chess, self.go, self.film = [
+            Society.objects.create(
+                name=name, description=f'{name} society', status='Approved', president=self.president
+            )
+            for name in ('Chess', 'Go', 'Film')
+        ]
+        self.physics[0].societies_belongs_to.add(self.chess, self.go)
+        self.chess.society_members.add(self.physics[1], self.maths)
+        self.film.society_members.add(self.history)
+
+    def affinities(self):
+        return {
+            (row.major, row.society_id): (row.member_count, row.score)
+            for row in MajorSocietyAffinity.objects.all()
+        }
+
+    def assertMatchesRebuild(self):
+        """The incrementally maintained rows equal a full rebuild."""
+        maintained = self.affinities()
+        major_affinity_store.rebuild()
+        self.assertEqual(maintained, self.affinities())
+
+    def test_smoothed_scores(self):
+        """Test that the score is the major's member share, smoothed for small majors."""
+        MajorAffinityStore(smoothing=5).rebuild()
+
+        self.assertEqual(self.affinities(), {
+            ('Physics', self.chess.id): (2, 2 / 8),
+            ('Physics', self.go.id): (1, 1 / 8),
+            ('Mathematics', self.chess.id): (1, 1 / 6),
+            ('History', self.film.id): (1, 1 / 6),
+        })
+
+    def test_joins_and_leaves_update_affinities(self):
+        """Test that joining and leaving, from either side, keeps the rows exact."""
+        self.physics[2].societies_belongs_to.add(self.film)
+        self.go.society_members.add(self.physics[1], self.history)
+        self.assertEqual(self.affinities()[('Physics', self.go.id)][0], 2)
+        self.assertMatchesRebuild()
+
+        self.chess.society_members.remove(self.physics[0])
+        self.physics[1].societies_belongs_to.clear()
+        self.assertNotIn(('Physics', self.chess.id), self.affinities())
+        self.assertMatchesRebuild()
+
+        self.film.society_members.clear()
+        self.assertMatchesRebuild()
+
+    def test_major_similarities(self):
+        """Test that majors are similar by the cosine of their member counts per society."""
+        major_affinity_store.rebuild()
+
+        similarities = {
+            (row.major, row.similar_major): row.score for row in MajorSimilarity.objects.all()
+        }
+        self.assertEqual(set(similarities), {('Physics', 'Mathematics'), ('Mathematics', 'Physics')})
+        self.assertAlmostEqual(similarities[('Physics', 'Mathematics')], 2 / 5 ** 0.5)
+
+    def test_societies_for_major_falls_back_to_similar_majors(self):
+        """Test that a major's own societies come first, then its similar majors' societies."""
+        self.maths.societies_belongs_to.add(self.film)
+        major_affinity_store.rebuild()
+        Society.objects.filter(id=self.go.id).update(status='Pending')
+
+        self.assertEqual(major_affinity_store.societies_for_major('Mathematics', 1), [self.chess])
+        self.assertEqual(major_affinity_store.societies_for_major('Physics', 3), [self.chess, self.film])
+        with self.assertNumQueries(2):
+            self.assertEqual(major_affinity_store.societies_for_major('History', 3), [self.film, self.chess])
+        self.assertEqual(major_affinity_store.societies_for_major('Art', 3), [])
@@ -0,0 +1,212 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from django.test import TestCase
+from scipy.sparse import csr_matrix
+from api.matrix_factorization import FactorModel, ImplicitALSTrainer
+from api.models import Event, RecommendationFeedback, Society, Student
+from api.recommendation_service import SocietyRecommender
+
+
+def clustered_preferences():
+    """Students 0-3 share societies 0-2, students 4-7 share societies 3-5; student 0 has not joined society 2."""
+    rows, columns = [], []
+    for student in range(8):
+        cluster = range(0, 3) if student < 4 else range(3, 6)
+        for society in cluster:
+            if (student, society) != (0, 2):
+                rows.append(student)
+                columns.append(society)
+    return csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(8, 6))
+
+
+class TestImplicitALSTrainer(unittest.TestCase):
+    """Test suite for the implicit-feedback ALS trainer."""
+
+    def test_conjugate_gradient_matches_exact_solve(self):
+        """Test that enough conjugate gradient steps reach the exact least-squares factors."""
+        rng = np.random.default_rng(0)
+        trainer = ImplicitALSTrainer(factors=4, threads=2, block_size=3, cg_steps=20)
+        confidence = clustered_preferences() * trainer.alpha
+        fixed = rng.normal(size=(6, 4))
+        solved = rng.normal(size=(8, 4))
+        gram = fixed.T @ fixed + trainer.regularization * np.eye(4)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            trainer._solve(confidence, fixed, solved, executor)
+
+        for student in range(8):
+            row = slice(confidence.indptr[student], confidence.indptr[student + 1])
+            observed = fixed[confidence.indices[row]]
+            weights = confidence.data[row]
+            exact = np.linalg.solve(
+                gram + (observed.T * weights) @ observed, ((1 + weights)[:, None] * observed).sum(axis=0)
+            )
+            np.testing.assert_allclose(solved[student], exact, atol=1e-8)
+
+    def test_blocks_are_bounded(self):
+        """Test that blocks cover every row and hold at most block_size interactions, or a single row."""
+        trainer = ImplicitALSTrainer(block_size=4)
+        indptr = np.array([0, 3, 4, 9, 9, 10])
+
+        self.assertEqual(trainer._blocks(indptr), [(0, 2), (2, 3), (3, 5)])
+
+    def test_learns_co_membership(self):
+        """Test that a student's unjoined society of their own cluster outranks the other cluster."""
+        trainer = ImplicitALSTrainer(factors=4, iterations=10, threads=1)
+        student_factors, society_factors = trainer.fit(clustered_preferences())
+
+        scores = society_factors @ student_factors[0]
+        self.assertEqual(student_factors.dtype, np.float32)
+        self.assertGreater(scores[2], scores[3:].max())
+
+    def test_threads_and_blocks_do_not_change_the_model(self):
+        """Test that training is independent of how the rows are split across threads."""
+        matrix = clustered_preferences()
+        single = ImplicitALSTrainer(factors=4, iterations=3, threads=1, block_size=100).fit(matrix)
+        split = ImplicitALSTrainer(factors=4, iterations=3, threads=3, block_size=2).fit(matrix)
+
+        np.testing.assert_allclose(single[0], split[0], rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(single[1], split[1], rtol=1e-5, atol=1e-6)
+
+
+class TestFactorModel(unittest.TestCase):
+    """Test suite for the versioned factor arrays."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.model = FactorModel(directory=self.tmp_dir.name)
+        self.student_factors = np.array([[1.0, 0.0], [0.0, 1.0]])
+        self.society_factors = np.array([[0.9, 0.1], [0.2, 0.8], [0.5, 0.5], [0.95, 0.0]])
+
+    def test_rank_scores_every_society(self):
+        """Test that societies are ranked by the dot product with the student's factors."""
+        self.model.save([7, 8], self.student_factors, [1, 2, 3, 4], self.society_factors)
+
+        ranked = self.model.rank(7, 3)
+
+        self.assertEqual([society_id for society_id, _ in ranked], [4, 1, 3])
+        self.assertAlmostEqual(ranked[0][1], 0.95, places=5)
+
+    def test_rank_filters(self):
+        """Test that excluded societies and societies outside the candidates are skipped."""
+        self.model.save([7, 8], self.student_factors, [1, 2, 3, 4], self.society_factors)
+
+        ranked = self.model.rank(7, 5, exclude_ids={4}, candidate_ids=[1, 2, 4])
+
+        self.assertEqual([society_id for society_id, _ in ranked], [1, 2])
+
+    def test_unknown_student_or_missing_model(self):
+        """Test that students outside the model, or a missing model, rank nothing."""
+        self.assertIsNone(self.model.rank(7, 3))
+
+        self.model.save([7, 8], self.student_factors, [1, 2, 3, 4], self.society_factors)
+        self.assertIsNone(self.model.rank(9, 3))
+
+    def test_versions(self):
+        """Test that each save becomes the current version and old versions are pruned."""
+        versions = [
+            self.model.save([7], self.student_factors[:1] * i, [1, 2, 3, 4], self.society_factors, keep=2)
+            for i in range(1, 4)
+        ]
+
+        self.assertEqual(self.model.versions(), versions[1:])
+        self.assertEqual(self.model.version, versions[2])
+        self.assertFalse(any(versions[0] in name for name in os.listdir(self.tmp_dir.name)))
+
+        # Other processes pick the new version up
+        reader = FactorModel(directory=self.tmp_dir.name)
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.version, versions[2])
+
+
+class MatrixFactorizationRecommendationTest(TestCase):
+    """Tests for training from the database and the factorization recommender mode."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.students = [
+            Student.objects.create(username=f'student{i}', email=f'student{i}@example.com', password='password')
+            for i in range(2)
+        ]
+        self.chess, self.go, self.film = [
+            Society.objects.create(
+                name=name, description=f'{name} society', category='Games', status='Approved',
+                president=self.students[0]
+            )
+            for name in ('Chess', 'Go', 'Film')
+        ]
+
+    def test_preferences(self):
+        """Test that memberships, RSVPs, ratings and recorded events all become preferences."""
+        Society.society_members.through.objects.all().delete()
+        self.students[0].societies.add(self.chess)
+        self.chess.society_members.add(self.students[0])
+        event = Event.objects.create(title='Screening', hosted_by=self.film)
+        event.current_attendees.add(self.students[1])
+        self.students[1].attended_events.add(event)
+        RecommendationFeedback.objects.create(student=self.students[1], society=self.go, rating=5)
+        RecommendationFeedback.objects.create(student=self.students[0], society=self.go, rating=2)
+        feedback_data = {'user_feedback': [
+            {'student_id': self.students[0].id, 'society_id': self.film.id, 'feedback_type': 'click',
+             'timestamp': datetime.now().isoformat(), 'value': None},
+            {'student_id': self.students[0].id, 'society_id': None, 'feedback_type': 'recommendation_request',
+             'timestamp': datetime.now().isoformat(), 'value': None},
+        ]}
+
+        with patch('api.matrix_factorization.feedback_processor.feedback_data', feedback_data):
+            matrix, student_ids, society_ids = ImplicitALSTrainer().preference_matrix()
+
+        preferences = {
+            (student_ids[row], society_ids[column]): matrix[row, column]
+            for row, column in zip(*matrix.nonzero())
+        }
+        self.assertEqual(preferences, {
+            (self.students[0].id, self.chess.id): 3.0,
+            (self.students[0].id, self.film.id): 0.5,
+            (self.students[1].id, self.film.id): 1.0,
+            (self.students[1].id, self.go.id): 2.0,
+        })
+
+    def test_factorization_mode(self):
+        """Test that the factorization mode ranks unjoined approved societies by the trained factors."""
+        model = FactorModel(directory=self.tmp_dir.name)
+        model.save(
+            [self.students[0].id], np.array([[1.0, 0.0]]),
+            [self.chess.id, self.go.id, self.film.id], np.array([[2.0, 0.0], [0.5, 0.5], [1.0, 0.0]])
+        )
+        Society.objects.filter(id=self.go.id).update(status='Pending')
+        self.students[0].societies.add(self.chess)
+
+        with patch('api.recommendation_service.factor_model', model):
+            recommendations = SocietyRecommender().get_recommendations_for_student(
+                self.students[0].id, limit=5, mode='factorization'
+            )
+
+        self.assertEqual(recommendations, [self.film])
+        self.assertEqual(recommendations[0]._recommendation_explanation['type'], 'collaborative')
+
+    def test_factorization_mode_falls_back_to_content(self):
+        """Test that students without trained factors get content-based recommendations."""
+        model = FactorModel(directory=self.tmp_dir.name)
+        recommender = SocietyRecommender()
+
+        with patch('api.recommendation_service.factor_model', model), \
+                patch.object(recommender, '_popular_with_explanations', return_value=[self.go]) as popular:
+            recommendations = recommender.get_recommendations_for_student(
+                self.students[1].id, limit=5, mode='factorization'
+            )
+
+        popular.assert_called_once_with(5)
+        self.assertEqual(recommendations, [self.go])
+
+
+if __name__ == '__main__':
+    unittest.main()
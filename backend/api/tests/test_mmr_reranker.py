@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from api.mmr_reranker import MMRReranker
+
+
+class TestMMRReranker(unittest.TestCase):
+    """Test suite for the incremental Maximal Marginal Relevance reranker."""
+
+    def setUp(self):
+        self.relevance = [5.0, 4.9, 4.5, 1.0]
+        # Items 0 and 1 are near-duplicates; 2 is different from both
+        self.similarity = np.array([
+            [1.0, 0.95, 0.1, 0.2],
+            [0.95, 1.0, 0.1, 0.2],
+            [0.1, 0.1, 1.0, 0.3],
+            [0.2, 0.2, 0.3, 1.0],
+        ])
+        self.rows = []
+
+    def similarity_row(self, picked, remaining):
+        self.rows.append((picked, list(remaining)))
+        return self.similarity[picked, remaining]
+
+    def test_pure_relevance(self):
+        """Test that lambda 1 keeps the relevance order."""
+        selected = MMRReranker(1.0).rerank(self.relevance, self.similarity_row, 3)
+        self.assertEqual(selected, [0, 1, 2])
+
+    def test_diversity_skips_near_duplicates(self):
+        """Test that a diverse item is picked before a near-duplicate of a picked one."""
+        selected = MMRReranker(0.5).rerank(self.relevance, self.similarity_row, 3)
+        self.assertEqual(selected, [0, 2, 1])
+
+    def test_one_similarity_row_per_pick(self):
+        """Test that only the remaining items are compared, once per pick but the last."""
+        MMRReranker(0.7).rerank(self.relevance, self.similarity_row, 3)
+        self.assertEqual(len(self.rows), 2)
+        self.assertEqual(self.rows[0], (0, [1, 2, 3]))
+        self.assertNotIn(self.rows[1][0], self.rows[1][1])
+
+    def test_limit_larger_than_items(self):
+        """Test that every item is returned once when the limit exceeds the list."""
+        selected = MMRReranker().rerank(self.relevance, self.similarity_row, 10)
+        self.assertEqual(sorted(selected), [0, 1, 2, 3])
+
+    def test_empty(self):
+        """Test that an empty list selects nothing without similarity lookups."""
+        self.assertEqual(MMRReranker().rerank([], self.similarity_row, 5), [])
+        self.assertEqual(self.rows, [])
+
+    def test_ties_go_to_earlier_item(self):
+        """Test that equal scores keep the input order."""
+        selected = MMRReranker(1.0).rerank([2.0, 2.0, 2.0], self.similarity_row, 2)
+        self.assertEqual(selected, [0, 1])
@@ -1,3 +1,6 @@
+import os
+import pickle
+import tempfile
 import unittest
 from unittest.mock import patch, Mock, MagicMock
 import numpy as np
@@ -20,8 +23,14 @@ class TestTextSimilarityAnalyzer(unittest.TestCase):
             print(f"Warning: Could not download NLTK resources: {e}")
 
     def setUp(self):
-        """Set up test fixtures."""
-        self.analyzer = TextSimilarityAnalyzer()
+        """Set up test fixtures, with the analyzer's model files in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.analyzer = TextSimilarityAnalyzer(lazy=True)
+        self.analyzer.model_path = os.path.join(self.tmp_dir.name, 'tfidf_model.pkl')
+        self.analyzer.count_model_path = os.path.join(self.tmp_dir.name, 'count_model.pkl')
+        self.analyzer.normalized_cache_path = os.path.join(self.tmp_dir.name, 'normalized_texts.json')
+        self.analyzer.warm_up()
         
         self.text1 = "The Computer Science Society organizes programming competitions and tech talks."
         self.text2 = "Our CS club holds coding contests and technology presentations regularly."
@@ -243,18 +252,41 @@ class TestTextSimilarityAnalyzer(unittest.TestCase):
     def test_calculate_similarity_vectorizers_not_fitted(self):
         """
         Force vectorizers to appear unfitted by deleting their vocabulary_ attribute.
-        Then call calculate_similarity and verify that vectorizers are re-fitted.
+        Then call calculate_similarity and verify that they are fitted from the
+        approved society descriptions, not from the texts being scored.
         """
-        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x if x else ""):
-            if hasattr(self.analyzer.tfidf_vectorizer, "vocabulary_"):
-                del self.analyzer.tfidf_vectorizer.vocabulary_
-            if hasattr(self.analyzer.count_vectorizer, "vocabulary_"):
-                del self.analyzer.count_vectorizer.vocabulary_
-            _ = self.analyzer.calculate_similarity("text1", ["text2"])
+        societies = [(1, "chess club weekly games"), (2, "film society screenings")]
+        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x if x else ""), \
+             patch.object(self.analyzer, "_approved_society_texts", return_value=societies):
+            del self.analyzer.tfidf_vectorizer.vocabulary_
+            del self.analyzer.count_vectorizer.vocabulary_
+            _ = self.analyzer.calculate_similarity("rowing crew", ["sailing crew"])
             self.assertTrue(hasattr(self.analyzer.tfidf_vectorizer, "vocabulary_"),
                             "Expected TF-IDF vectorizer to be re-fitted and have vocabulary_")
             self.assertTrue(hasattr(self.analyzer.count_vectorizer, "vocabulary_"),
                             "Expected Count vectorizer to be re-fitted and have vocabulary_")
+            self.assertEqual(self.analyzer.tfidf_vectorizer.document_count, 2)
+            self.assertNotIn("crew", self.analyzer.tfidf_vectorizer.vocabulary_)
+            self.assertTrue(self.analyzer._text_models_dirty)
+
+    def test_unfitted_vectorizers_without_societies_fall_back(self):
+        """Test that without a society corpus scoring uses the other components and fits nothing."""
+        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x.lower() if x else ""), \
+             patch.object(self.analyzer, "_approved_society_texts", return_value=[]):
+            del self.analyzer.tfidf_vectorizer.vocabulary_
+            del self.analyzer.count_vectorizer.vocabulary_
+            texts = [self.text1, self.text2]
+            matrix = self.analyzer.calculate_similarity_matrix(texts, texts)
+            self.assertEqual(matrix.shape, (2, 2))
+            self.assertGreater(matrix[0, 1], 0)
+            self.assertAlmostEqual(matrix[0, 1], self.analyzer.calculate_similarity(self.text1, [self.text2]))
+            self.assertFalse(hasattr(self.analyzer.tfidf_vectorizer, "vocabulary_"))
+            self.assertFalse(hasattr(self.analyzer.count_vectorizer, "vocabulary_"))
+
+        weights = self.analyzer._component_weights(fitted=False)
+        self.assertNotIn("tfidf", weights)
+        self.assertNotIn("keyword", weights)
+        self.assertAlmostEqual(sum(weights.values()), 1.0)
 
     def test_update_corpus_save_exception(self):
         """
@@ -262,7 +294,7 @@ class TestTextSimilarityAnalyzer(unittest.TestCase):
         Patch word_tokenize to avoid NLTK LookupError.
         """
         with patch("api.nlp_similarity.word_tokenize", return_value=self.text1.split()), \
-             patch("pickle.dump", side_effect=Exception("Dump error")):
+             patch("pickle.dump", side_effect=OSError("Dump error")):
             self.analyzer.update_corpus([self.text1, self.text2, self.text3])
             self.assertIsInstance(self.analyzer.corpus, list,
                                   "Expected corpus to be a list even if saving fails")
@@ -274,6 +306,260 @@ class TestTextSimilarityAnalyzer(unittest.TestCase):
         self.assertEqual(self.analyzer.calculate_similarity("nonempty", []), 0,
                          "Expected similarity to be 0 when comparison_texts is empty")
 
+    def test_calculate_similarity_matrix_matches_scalar(self):
+        """Test that every matrix entry equals the pairwise calculate_similarity score."""
+        texts = [self.text1, self.text2, self.text3, ""]
+        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x.lower() if x else ""):
+            self.analyzer.tfidf_vectorizer.fit([self.text1, self.text2, self.text3])
+            self.analyzer.count_vectorizer.fit([self.text1, self.text2, self.text3])
+            matrix = self.analyzer.calculate_similarity_matrix(texts, texts[:3])
+            self.assertEqual(matrix.shape, (4, 3))
+            for i, text_a in enumerate(texts):
+                for j, text_b in enumerate(texts[:3]):
+                    self.assertAlmostEqual(
+                        matrix[i, j], self.analyzer.calculate_similarity(text_a, [text_b])
+                    )
+            self.assertEqual(matrix[0, 0], 5.0)
+            self.assertTrue(np.all(matrix[3] == 0))
+
+    def test_calculate_similarity_batch_matches_scalar(self):
+        """Test that batch scores equal calculate_similarity against the whole comparison list."""
+        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x.lower() if x else ""):
+            self.analyzer.tfidf_vectorizer.fit([self.text1, self.text2, self.text3])
+            self.analyzer.count_vectorizer.fit([self.text1, self.text2, self.text3])
+            scores = self.analyzer.calculate_similarity_batch(
+                [self.text1, self.text3, ""], [self.text2, self.text3]
+            )
+            self.assertEqual(len(scores), 3)
+            self.assertAlmostEqual(
+                scores[0], self.analyzer.calculate_similarity(self.text1, [self.text2, self.text3])
+            )
+            self.assertEqual(scores[1], 5.0)
+            self.assertEqual(scores[2], 0)
+
+    def test_calculate_similarity_batch_with_pairs(self):
+        """Test that one pass returns both the batch scores and the pairwise matrix."""
+        texts = [self.text1, self.text3, ""]
+        comparison_texts = [self.text2, "", self.text3]
+        with patch.object(self.analyzer, "preprocess_text", side_effect=lambda x: x.lower() if x else ""):
+            self.analyzer.tfidf_vectorizer.fit([self.text1, self.text2, self.text3])
+            self.analyzer.count_vectorizer.fit([self.text1, self.text2, self.text3])
+            scores, pairs = self.analyzer.calculate_similarity_batch_with_pairs(texts, comparison_texts)
+            np.testing.assert_allclose(
+                scores, self.analyzer.calculate_similarity_batch(texts, comparison_texts)
+            )
+            np.testing.assert_allclose(
+                pairs, self.analyzer.calculate_similarity_matrix(texts, comparison_texts)
+            )
+            self.assertEqual(pairs.shape, (3, 3))
+
+    def test_calculate_similarity_matrix_empty_inputs(self):
+        """Test that empty inputs produce correctly shaped zero matrices."""
+        self.assertEqual(self.analyzer.calculate_similarity_matrix([], [self.text1]).shape, (0, 1))
+        self.assertEqual(self.analyzer.calculate_similarity_matrix([self.text1], None).shape, (1, 0))
+        self.assertEqual(len(self.analyzer.calculate_similarity_batch([self.text1], [])), 1)
+
+    def test_transform_similarity_matrix(self):
+        """Test that the vectorized transform agrees with the scalar transform."""
+        values = np.linspace(0, 1, 21)
+        transformed = self.analyzer._transform_similarity_matrix(values)
+        for value, result in zip(values, transformed):
+            self.assertAlmostEqual(result, self.analyzer._transform_similarity_score(value))
+
+    def test_update_society_embedding_uses_store(self):
+        """Test that society embeddings are persisted once and then read back from the store."""
+        store = Mock()
+        store.needs_update.return_value = True
+        store.get_by_text.return_value = None
+        mock_model = Mock()
+        mock_model.encode.return_value = np.array([0.1, 0.2, 0.3])
+        self.analyzer.embedding_store = store
+        self.analyzer.sentence_model = mock_model
+
+        self.assertTrue(self.analyzer.update_society_embedding(1, "Chess club for all levels"))
+        store.update.assert_called_once()
+
+        store.needs_update.return_value = False
+        self.assertFalse(self.analyzer.update_society_embedding(1, "Chess club for all levels"))
+        self.assertEqual(store.update.call_count, 1)
+
+        store.get_by_text.return_value = np.array([0.4, 0.5, 0.6])
+        np.testing.assert_array_equal(
+            self.analyzer.get_embedding("Stored description"), [0.4, 0.5, 0.6]
+        )
+
+    def test_update_society_embedding_unchanged_text_skips_model(self):
+        """Test that an up-to-date stored vector is detected without loading the sentence model."""
+        analyzer = TextSimilarityAnalyzer(lazy=True)
+        analyzer.embedding_store = Mock()
+        analyzer.embedding_store.needs_update.return_value = False
+
+        self.assertFalse(analyzer.update_society_embedding(1, "Chess club"))
+        self.assertNotIn('sentence_model', analyzer._loaded_components)
+        analyzer.embedding_store.update.assert_not_called()
+
+    def test_update_society_embedding_without_model(self):
+        """Test that no embedding is stored when the sentence model is unavailable."""
+        self.analyzer.embedding_store = Mock()
+        self.analyzer.sentence_model = None
+        self.assertFalse(self.analyzer.update_society_embedding(1, "Chess club"))
+        self.assertEqual(self.analyzer.rebuild_society_embeddings([(1, "Chess club")]), 0)
+        self.analyzer.embedding_store.update.assert_not_called()
+
+    def test_lazy_initialization_defers_loading(self):
+        """Test that a lazy analyzer loads nothing until a component is first used."""
+        with patch.object(TextSimilarityAnalyzer, '_initialize_sentence_model') as mock_init_model:
+            analyzer = TextSimilarityAnalyzer(lazy=True)
+            self.assertEqual(analyzer.load_timings, {})
+            mock_init_model.assert_not_called()
+
+            self.assertIsNotNone(analyzer.tfidf_vectorizer)
+            self.assertIn('tfidf_vectorizer', analyzer.load_timings)
+            self.assertNotIn('count_vectorizer', analyzer.load_timings)
+            mock_init_model.assert_not_called()
+
+    def test_lazy_component_assignment_skips_loading(self):
+        """Test that assigning a component marks it as loaded."""
+        with patch.object(TextSimilarityAnalyzer, '_initialize_sentence_model') as mock_init_model:
+            analyzer = TextSimilarityAnalyzer(lazy=True)
+            mock_model = Mock()
+            analyzer.sentence_model = mock_model
+            self.assertIs(analyzer.sentence_model, mock_model)
+            mock_init_model.assert_not_called()
+
+    def test_warm_up_reports_timings(self):
+        """Test that warm_up loads every component and reports its load time."""
+        analyzer = TextSimilarityAnalyzer(lazy=True)
+        timings = analyzer.warm_up()
+        self.assertEqual(
+            set(timings),
+            {'nltk_resources', 'tfidf_vectorizer', 'count_vectorizer',
+             'sentence_model', 'lemmatizer', 'stop_words', 'normalized_text_cache'}
+        )
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        self.assertEqual(sum(analyzer.weights.values()), 1.0)
+
+    def test_preprocess_many_normalizes_each_text_once(self):
+        """Test that preprocess_many keeps order and preprocesses duplicates once."""
+        with patch.object(self.analyzer, '_normalize_text', side_effect=lambda x: x.lower()) as mock_normalize:
+            self.analyzer.normalized_text_cache = {}
+            processed = self.analyzer.preprocess_many(["Chess Club", "Film Club", "Chess Club", ""])
+            self.assertEqual(processed, ["chess club", "film club", "chess club", ""])
+            self.assertEqual(mock_normalize.call_count, 2)
+
+            self.analyzer.preprocess_text("Film Club")
+            self.assertEqual(mock_normalize.call_count, 2)
+
+    def test_preprocess_memoizes_lemmas(self):
+        """Test that each distinct token is lemmatized only once."""
+        self.analyzer.normalized_text_cache = {}
+        self.analyzer.lemmatizer = Mock()
+        self.analyzer.lemmatizer.lemmatize.side_effect = lambda token: token
+        with patch('api.nlp_similarity.word_tokenize', side_effect=lambda text: text.split()):
+            self.analyzer.preprocess_many(["coding coding society", "coding workshops"])
+        lemmatized = [call.args[0] for call in self.analyzer.lemmatizer.lemmatize.call_args_list]
+        self.assertEqual(sorted(lemmatized), ["coding", "society", "workshops"])
+
+    def test_lemma_cache_is_bounded(self):
+        """Test that memoized lemmas are capped, evicting the least recently used tokens."""
+        self.analyzer.normalized_text_cache = {}
+        self.analyzer._lemma_cache.maxsize = 2
+        self.analyzer.lemmatizer = Mock()
+        self.analyzer.lemmatizer.lemmatize.side_effect = lambda token: token
+        with patch('api.nlp_similarity.word_tokenize', side_effect=lambda text: text.split()):
+            self.analyzer.preprocess_many(["chess society debates", "film workshops"])
+        self.assertEqual(len(self.analyzer._lemma_cache), 2)
+        self.assertEqual(self.analyzer._lemma_cache.get("workshops"), "workshops")
+        self.assertIsNone(self.analyzer._lemma_cache.get("chess"))
+
+    def test_normalized_text_cache_persisted_by_update_corpus(self):
+        """Test that update_corpus persists normalized descriptions for other analyzers."""
+        self.analyzer.normalized_text_cache = {}
+        with patch.object(self.analyzer, '_normalize_text', side_effect=lambda x: x.lower()):
+            self.analyzer.update_corpus([self.text1, self.text2, self.text3])
+
+        reader = TextSimilarityAnalyzer(lazy=True)
+        reader.normalized_cache_path = self.analyzer.normalized_cache_path
+        with patch.object(reader, '_normalize_text') as mock_normalize:
+            self.assertEqual(reader.preprocess_text(self.text1), self.text1.lower())
+            mock_normalize.assert_not_called()
+
+    def test_update_society_text_is_incremental(self):
+        """Test that one society is absorbed into the text models without refitting them."""
+        with patch.object(self.analyzer, 'preprocess_text', side_effect=lambda x: x.lower() if x else ""), \
+             patch('pickle.dump', MagicMock()) as mock_dump:
+            self.analyzer.update_corpus([self.text1, self.text2], society_ids=[1, 2])
+            # Two societies plus the three placeholder descriptions
+            self.assertEqual(self.analyzer.tfidf_vectorizer.document_count, 5)
+
+            with patch.object(self.analyzer.tfidf_vectorizer, 'fit') as mock_fit:
+                self.assertTrue(self.analyzer.update_society_text(3, self.text3))
+                self.assertFalse(self.analyzer.update_society_text(3, self.text3))
+                mock_fit.assert_not_called()
+            self.assertEqual(self.analyzer.tfidf_vectorizer.document_count, 6)
+            self.assertIn("photography", self.analyzer.extract_keywords(self.text3))
+
+            self.assertTrue(self.analyzer.update_society_text(1, self.text3))
+            self.assertTrue(self.analyzer.remove_society_text(2))
+            self.assertFalse(self.analyzer.remove_society_text(2))
+            self.assertEqual(self.analyzer.tfidf_vectorizer.document_count, 5)
+            self.assertGreater(mock_dump.call_count, 0)
+
+    def test_incremental_updates_are_saved_by_save_text_models(self):
+        """Test that society edits are persisted by the scheduled save, once, instead of per edit."""
+        with patch.object(self.analyzer, 'preprocess_text', side_effect=lambda x: x.lower() if x else ""):
+            self.analyzer.update_corpus([self.text1, self.text2], society_ids=[1, 2])
+            self.assertFalse(self.analyzer.save_text_models())
+
+            with patch('pickle.dump', wraps=pickle.dump) as mock_dump:
+                self.analyzer.update_society_text(3, self.text3)
+                self.analyzer.remove_society_text(2)
+                mock_dump.assert_not_called()
+                self.assertTrue(self.analyzer.save_text_models())
+                self.assertEqual(mock_dump.call_count, 2)
+                self.assertFalse(self.analyzer.save_text_models())
+
+        reader = TextSimilarityAnalyzer(lazy=True)
+        reader.model_path = self.analyzer.model_path
+        self.assertEqual(reader.tfidf_vectorizer.document_count, 5)
+
+    def test_failed_save_keeps_previous_text_models(self):
+        """Test that a save failing halfway leaves the previous model file intact."""
+        with patch.object(self.analyzer, 'preprocess_text', side_effect=lambda x: x.lower() if x else ""):
+            self.analyzer.update_corpus([self.text1, self.text2], society_ids=[1, 2])
+        with open(self.analyzer.model_path, 'rb') as f:
+            previous = f.read()
+        files = sorted(os.listdir(self.tmp_dir.name))
+
+        self.analyzer.update_society_text(3, self.text3)
+        with patch('pickle.dump', side_effect=pickle.PicklingError('unpicklable')):
+            self.assertFalse(self.analyzer.save_text_models())
+        with open(self.analyzer.model_path, 'rb') as f:
+            self.assertEqual(f.read(), previous)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), files)
+        # Still dirty, so the next scheduled save retries
+        self.assertTrue(self.analyzer.save_text_models())
+
+    def test_text_models_cap_their_vocabulary(self):
+        """Test that the analyzer's text models are created with a bounded vocabulary."""
+        self.assertEqual(self.analyzer.tfidf_vectorizer.max_features, 1000)
+        self.assertEqual(self.analyzer.count_vectorizer.max_features, 500)
+
+    def test_primed_keywords_match_counted_keywords(self):
+        """Test that keywords primed from a stored profile give the same indicators as counting."""
+        texts = [self.text1, self.text2, self.text3]
+        processed = [text.lower() for text in texts]
+        self.analyzer.count_vectorizer.fit(processed)
+        counted = self.analyzer._keyword_indicator_matrix(processed, top_n=15, texts=texts)
+
+        for text, processed_text in zip(texts, processed):
+            self.analyzer.prime_keywords(text, self.analyzer.extract_keywords(processed_text, top_n=15))
+        with patch.object(self.analyzer.count_vectorizer, 'transform') as mock_transform:
+            primed = self.analyzer._keyword_indicator_matrix(processed, top_n=15, texts=texts)
+            mock_transform.assert_not_called()
+
+        self.assertTrue(np.array_equal(primed.toarray(), counted.toarray()))
+
 class TestSingleton(unittest.TestCase):
     """Test the singleton instance."""
     
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+import numpy as np
+from api.nlp_similarity import TextSimilarityAnalyzer
+from api.nlp_worker import NLPScoringClient, NLPScoringServer, NLPWorkerUnavailable
+
+
+class TestNLPScoringWorker(unittest.TestCase):
+    """Test suite for the Unix socket NLP scoring worker and its client."""
+
+    def setUp(self):
+        """Start a scoring server around a mocked analyzer in a background thread."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmp_dir, 'nlp.sock')
+
+        self.worker_analyzer = Mock()
+        self.worker_analyzer.calculate_similarity_matrix.side_effect = (
+            lambda texts_a, texts_b: np.full((len(texts_a), len(texts_b)), 2.5)
+        )
+        self.worker_analyzer.get_embedding.return_value = np.array([0.1, 0.2], dtype=np.float32)
+        self.worker_analyzer.calculate_similarity.side_effect = Exception("Scoring error")
+
+        self.server = NLPScoringServer(self.socket_path, self.worker_analyzer)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = NLPScoringClient(self.socket_path, timeout=5)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        """Test that batched requests are answered by the worker's analyzer."""
+        self.assertTrue(self.client.ping())
+        result = self.client.call('calculate_similarity_matrix', ['a', 'b'], ['c'])
+        self.assertEqual(result, [[2.5], [2.5]])
+        self.worker_analyzer.calculate_similarity_matrix.assert_called_once_with(['a', 'b'], ['c'])
+
+        embedding = self.client.call('get_embedding', 'chess club')
+        np.testing.assert_allclose(embedding, [0.1, 0.2], rtol=1e-6)
+
+    def test_errors_raise_unavailable(self):
+        """Test that unknown methods and scoring errors are reported to the client."""
+        with self.assertRaises(NLPWorkerUnavailable):
+            self.client.call('update_corpus', ['text'])
+        with self.assertRaises(NLPWorkerUnavailable):
+            self.client.call('calculate_similarity', 'a', ['b'])
+        # The connection stays usable after an error response
+        self.assertTrue(self.client.ping())
+
+    def test_unreachable_worker_is_skipped_for_a_while(self):
+        """Test that a missing socket fails fast and is not retried immediately."""
+        client = NLPScoringClient(os.path.join(self.tmp_dir, 'missing.sock'), retry_interval=60)
+        with self.assertRaises(NLPWorkerUnavailable):
+            client.call('ping')
+        with patch.object(client, '_connection') as mock_connection:
+            self.assertFalse(client.ping())
+            mock_connection.assert_not_called()
+
+    def test_analyzer_client_mode_and_fallback(self):
+        """Test that the analyzer delegates to the worker and falls back in-process."""
+        analyzer = TextSimilarityAnalyzer(lazy=True)
+        analyzer.worker_client = self.client
+
+        matrix = analyzer.calculate_similarity_matrix(['a'], ['b', 'c'])
+        self.assertIsInstance(matrix, np.ndarray)
+        np.testing.assert_array_equal(matrix, [[2.5, 2.5]])
+
+        # Results come back as the same types as in-process scoring
+        self.worker_analyzer.calculate_similarity_batch.return_value = np.array([1.5, 3.0])
+        scores = analyzer.calculate_similarity_batch(['a', 'b'], ['c'])
+        self.assertIsInstance(scores, np.ndarray)
+        self.assertEqual(scores.shape, (2,))
+        self.assertEqual(analyzer.load_timings, {})  # Nothing was loaded locally
+
+        # The worker fails to score: the analyzer computes the result itself
+        self.assertEqual(analyzer.calculate_similarity("", ["b"]), 0)
+
+        analyzer.worker_client = NLPScoringClient(os.path.join(self.tmp_dir, 'missing.sock'))
+        self.assertEqual(analyzer.calculate_similarity("", ["b"]), 0)
+
+
+    def test_text_model_updates_are_serialized(self):
+        """Test that concurrent connections never update the shared text models at the same time."""
+        analyzer = TextSimilarityAnalyzer(lazy=True)
+        analyzer.tfidf_vectorizer = Mock()
+        analyzer.count_vectorizer = Mock()
+        active = []
+        overlaps = []
+
+        def add_document(society_id, text):
+            active.append(society_id)
+            overlaps.append(len(active) > 1)
+            time.sleep(0.01)
+            active.remove(society_id)
+            return True
+
+        analyzer.tfidf_vectorizer.add_document.side_effect = add_document
+        analyzer.count_vectorizer.add_document.return_value = True
+        self.server.analyzer = analyzer
+        clients = [NLPScoringClient(self.socket_path, timeout=5) for _ in range(4)]
+        threads = [
+            threading.Thread(target=client.call, args=('update_society_text', i, f'society {i}'))
+            for i, client in enumerate(clients)
+        ]
+
+        with patch.object(analyzer, 'preprocess_text', side_effect=str.lower):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(overlaps), 4)
+        self.assertFalse(any(overlaps))
+
+    def test_server_saves_text_models_periodically(self):
+        """Test that the worker persists incremental text model changes on its interval and on close."""
+        self.server.shutdown()  # Drive service_actions() from the test only
+        self.server.save_interval = 60
+        self.server._next_save = time.monotonic() + 60
+        self.server.service_actions()
+        self.worker_analyzer.save_text_models.assert_not_called()
+
+        self.server._next_save = time.monotonic() - 1
+        self.server.service_actions()
+        self.worker_analyzer.save_text_models.assert_called_once_with()
+
+        self.server.server_close()
+        self.assertEqual(self.worker_analyzer.save_text_models.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
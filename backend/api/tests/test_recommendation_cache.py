@@ -0,0 +1,115 @@
+import uuid
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from api import recommendation_service  # noqa: F401 - connects the invalidation receivers
+from api.models import Event, RecommendationFeedback, Society, Student
+from api.recommendation_cache import recommendation_cache
+
+
+class RecommendationCacheTest(TestCase):
+    """Tests for the per-student recommendation cache and its invalidation."""
+
+    def setUp(self):
+        """Set up test environment."""
+        cache.clear()
+        self.student = Student.objects.create(
+            username=f'student_{uuid.uuid4().hex[:8]}', email='student1@example.com', password='password'
+        )
+        self.society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', category='Games',
+            status='Approved', president=self.student
+        )
+        self.results = [{'society': {'id': self.society.id}, 'explanation': {'type': 'general'}}]
+        recommendation_cache.set(self.student.id, 5, 'balanced', self.results)
+
+    def test_get_by_limit_and_diversity(self):
+        """Test that entries are keyed by limit and diversity level."""
+        self.assertEqual(recommendation_cache.get(self.student.id, 5, 'balanced'), self.results)
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'high'))
+        self.assertIsNone(recommendation_cache.get(self.student.id, 10, 'balanced'))
+
+    def test_membership_change_invalidates_student(self):
+        """Test that joining a society, from either side, drops the cached results."""
+        other = Student.objects.create(
+            username=f'student_{uuid.uuid4().hex[:8]}', email='student2@example.com', password='password'
+        )
+        recommendation_cache.set(other.id, 5, 'balanced', self.results)
+
+        self.student.societies.add(self.society)
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+        self.assertEqual(recommendation_cache.get(other.id, 5, 'balanced'), self.results)
+
+        self.society.society_members.add(other)
+        self.assertIsNone(recommendation_cache.get(other.id, 5, 'balanced'))
+
+    def test_attended_events_change_invalidates_student(self):
+        """Test that attending an event drops the cached results."""
+        event = Event.objects.create(title='Blitz night', hosted_by=self.society, date=timezone.now())
+        recommendation_cache.set(self.student.id, 5, 'balanced', self.results)
+
+        self.student.attended_events.add(event)
+
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+    def test_current_attendees_change_invalidates_student(self):
+        """Test that being added to an event's current attendees drops the cached results."""
+        event = Event.objects.create(title='Blitz night', hosted_by=self.society, date=timezone.now())
+        recommendation_cache.set(self.student.id, 5, 'balanced', self.results)
+
+        event.current_attendees.add(self.student)
+
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+    def test_clear_from_society_side_invalidates_only_its_members(self):
+        """Test that clearing a society's members drops the results of those members only."""
+        other = Student.objects.create(
+            username=f'student_{uuid.uuid4().hex[:8]}', email='student2@example.com', password='password'
+        )
+        self.society.society_members.add(self.student)
+        recommendation_cache.set(self.student.id, 5, 'balanced', self.results)
+        recommendation_cache.set(other.id, 5, 'balanced', self.results)
+
+        self.society.society_members.clear()
+
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+        self.assertEqual(recommendation_cache.get(other.id, 5, 'balanced'), self.results)
+
+    def test_feedback_invalidates_student(self):
+        """Test that new recommendation feedback drops the cached results."""
+        RecommendationFeedback.objects.create(student=self.student, society=self.society, rating=4)
+
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+    def test_model_version_change_invalidates_all(self):
+        """Test that a rebuilt similarity model invalidates every entry."""
+        with patch.object(recommendation_cache, 'model_version', return_value=12345.0):
+            self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+    def test_society_change_invalidates_all(self):
+        """Test that editing the catalog invalidates every entry."""
+        self.society.description = 'Weekly chess and draughts games'
+        self.society.save()
+
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+    def test_unrelated_society_change_keeps_entries(self):
+        """Test that saving a society without touching a recommendation input keeps the cached results."""
+        self.society.name = 'Chess Society'
+        self.society.save()
+        self.society.description = 'Weekly chess and draughts games'
+        self.society.save(update_fields=['name'])
+
+        self.assertEqual(recommendation_cache.get(self.student.id, 5, 'balanced'), self.results)
+
+    def test_new_and_deleted_societies_invalidate_all(self):
+        """Test that adding or deleting a society invalidates every entry."""
+        Society.objects.create(
+            name='Go Club', description='Go games', category='Games', status='Pending', president=self.student
+        )
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
+
+        recommendation_cache.set(self.student.id, 5, 'balanced', self.results)
+        self.society.delete()
+        self.assertIsNone(recommendation_cache.get(self.student.id, 5, 'balanced'))
@@ -0,0 +1,115 @@
+import datetime
+import numpy as np
+from unittest.mock import patch
+from django.test import TestCase
+from django.utils import timezone
+from api import recommendation_service  # noqa: F401 - connects the invalidation receivers
+from api.models import MaterializedRecommendation, Society, Student
+from api.recommendation_materializer import RecommendationMaterializer
+
+
+class RecommendationMaterializerTest(TestCase):
+    """Tests for the nightly materialization of student recommendations."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        self.newcomer = Student.objects.create(
+            username='student2', email='student2@example.com', password='password'
+        )
+        self.societies = [
+            Society.objects.create(
+                name=name, description=description, category=category, tags=tags,
+                status='Approved', president=self.student
+            )
+            for name, description, category, tags in [
+                ('Chess Club', 'Weekly chess games and tournaments', 'Games', ['chess']),
+                ('Go Club', 'Weekly go games for strategy lovers', 'Games', ['strategy']),
+                ('Film Club', 'Screenings and discussions of classic films', 'Arts', ['film']),
+                ('Poker Society', 'Card games and chess variants', 'Games', ['chess', 'cards']),
+            ]
+        ]
+        self.student.societies.add(self.societies[0])
+        self.materializer = RecommendationMaterializer(count=2)
+
+        self.similarity_patcher = patch(
+            'api.recommendation_service.text_similarity_analyzer.calculate_similarity_batch_with_pairs',
+            side_effect=lambda texts, comparison_texts: (
+                [1.0] * len(texts), [[1.0] * len(comparison_texts) for _ in texts]
+            )
+        )
+        self.similarity_patcher.start()
+        self.addCleanup(self.similarity_patcher.stop)
+        # MMR scores pairs missing from the stored matrix through the analyzer: keep it off NLTK
+        self.matrix_patcher = patch(
+            'api.recommendation_service.text_similarity_analyzer.calculate_similarity_matrix',
+            side_effect=lambda texts_a, texts_b: np.full((len(texts_a), len(texts_b)), 2.5)
+        )
+        self.matrix_patcher.start()
+        self.addCleanup(self.matrix_patcher.stop)
+
+    def test_materializes_ranked_rows(self):
+        """Test that every active student gets its top recommendations stored in rank order."""
+        materialized = self.materializer.materialize()
+
+        self.assertEqual(materialized, 2)
+        rows = list(MaterializedRecommendation.objects.filter(student=self.student))
+        self.assertEqual([row.rank for row in rows], [1, 2])
+        self.assertNotIn(self.societies[0].id, [row.society_id for row in rows])
+        self.assertEqual(rows[0].society, self.societies[3])
+        self.assertEqual(rows[0].explanation_type, 'category')
+        self.assertGreaterEqual(rows[0].score, rows[1].score)
+
+        newcomer_rows = MaterializedRecommendation.objects.filter(student=self.newcomer)
+        self.assertEqual({row.explanation_type for row in newcomer_rows}, {'popular'})
+
+    def test_matches_online_recommendations(self):
+        """Test that batch scoring selects the same societies as a recommendation request."""
+        self.materializer.materialize([self.student.id])
+
+        online = recommendation_service.SocietyRecommender().get_recommendations_for_student(
+            self.student.id, 2
+        )
+        self.assertEqual(
+            [row.society for row in self.materializer.get(self.student.id, 2)], online
+        )
+
+    def test_rematerializing_replaces_rows(self):
+        """Test that a new run replaces a student's rows instead of adding to them."""
+        self.materializer.materialize([self.student.id])
+        self.materializer.materialize([self.student.id])
+
+        self.assertEqual(MaterializedRecommendation.objects.filter(student=self.student).count(), 2)
+
+    def test_get_only_serves_fresh_covering_rows(self):
+        """Test that stale rows, or a limit beyond the stored rows, fall back to online scoring."""
+        self.materializer.materialize([self.student.id])
+
+        self.assertEqual(len(self.materializer.get(self.student.id, 1)), 1)
+        self.assertIsNone(self.materializer.get(self.student.id, 5))
+        self.assertIsNone(self.materializer.get(self.student.id, 1, 'high'))
+
+        MaterializedRecommendation.objects.update(
+            computed_at=timezone.now() - datetime.timedelta(days=2)
+        )
+        self.assertIsNone(self.materializer.get(self.student.id, 1))
+
+    def test_membership_change_drops_rows(self):
+        """Test that joining a society drops the student's materialized rows."""
+        self.materializer.materialize()
+
+        self.student.societies.add(self.societies[2])
+
+        self.assertFalse(MaterializedRecommendation.objects.filter(student=self.student).exists())
+        self.assertTrue(MaterializedRecommendation.objects.filter(student=self.newcomer).exists())
+
+    def test_clearing_society_members_drops_only_their_rows(self):
+        """Test that clearing a society's members keeps the rows of students who were not members."""
+        self.materializer.materialize()
+
+        self.societies[0].members.clear()
+
+        self.assertFalse(MaterializedRecommendation.objects.filter(student=self.student).exists())
+        self.assertTrue(MaterializedRecommendation.objects.filter(student=self.newcomer).exists())
@@ -1,12 +1,23 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from unittest.mock import patch, MagicMock
 import datetime
 import unittest
+import numpy as np
+import os
+import tempfile
+from api.embedding_store import SocietyEmbeddingStore
+from api.incremental_tfidf import IncrementalTfidfModel
 from api.models import Student, Society, User, Event
-from api.recommendation_service import SocietyRecommender
+from api.recommendation_service import (
+    SocietyRecommender, embedding_refresh, encode_stale_society_embeddings, vector_index_refresh
+)
 from api.nlp_similarity import text_similarity_analyzer
 from api.semantic_enhancer import semantic_enhancer
+from api.society_similarity_matrix import SocietySimilarityMatrix
+from api.vector_index import SocietyVectorIndex, society_vector_index
 
 class SocietyRecommenderTests(TestCase):
     def setUp(self):
@@ -19,6 +30,22 @@ class SocietyRecommenderTests(TestCase):
         })
         self.nltk_patcher.start()
 
+        # Societies saved below update the shared analyzer through signals: keep its files out of ml_models
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        embedding_store = SocietyEmbeddingStore()
+        embedding_store.vectors_path = os.path.join(tmp_dir.name, 'society_embeddings.f32')
+        embedding_store.index_path = os.path.join(tmp_dir.name, 'society_embeddings_index.json')
+        for name, value in (
+            ('model_path', os.path.join(tmp_dir.name, 'tfidf_model.pkl')),
+            ('count_model_path', os.path.join(tmp_dir.name, 'count_model.pkl')),
+            ('normalized_cache_path', os.path.join(tmp_dir.name, 'normalized_texts.json')),
+            ('embedding_store', embedding_store),
+        ):
+            patcher = patch.object(text_similarity_analyzer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
         self.admin_user = User.objects.create_user(
             username='admin123', 
             email='admin@example.com', 
@@ -82,10 +109,27 @@ class SocietyRecommenderTests(TestCase):
 
         # Globally mock NLP dependencies
         self.text_similarity_patcher = patch.object(text_similarity_analyzer, 'calculate_similarity', return_value=3.0)
+        self.text_similarity_batch_patcher = patch.object(
+            text_similarity_analyzer, 'calculate_similarity_batch',
+            side_effect=lambda texts, comparison_texts: [3.0] * len(texts)
+        )
+        self.text_similarity_pairs_patcher = patch.object(
+            text_similarity_analyzer, 'calculate_similarity_batch_with_pairs',
+            side_effect=lambda texts, comparison_texts: (
+                np.full(len(texts), 3.0), np.full((len(texts), len(comparison_texts)), 3.0)
+            )
+        )
+        self.text_similarity_matrix_patcher = patch.object(
+            text_similarity_analyzer, 'calculate_similarity_matrix',
+            side_effect=lambda texts_a, texts_b: np.full((len(texts_a), len(texts_b)), 3.0)
+        )
         self.text_preprocess_patcher = patch.object(text_similarity_analyzer, 'preprocess_text', side_effect=lambda x: x.split())
         self.semantic_boost_patcher = patch.object(semantic_enhancer, 'calculate_semantic_boost', return_value=1.0)
         
         self.text_similarity_patcher.start()
+        self.text_similarity_batch_patcher.start()
+        self.text_similarity_pairs_patcher.start()
+        self.text_similarity_matrix_patcher.start()
         self.text_preprocess_patcher.start()
         self.semantic_boost_patcher.start()
     
@@ -94,6 +138,9 @@ class SocietyRecommenderTests(TestCase):
         self.nltk_patcher.stop()
         
         self.text_similarity_patcher.stop()
+        self.text_similarity_batch_patcher.stop()
+        self.text_similarity_pairs_patcher.stop()
+        self.text_similarity_matrix_patcher.stop()
         self.text_preprocess_patcher.stop()
         self.semantic_boost_patcher.stop()
     
@@ -162,6 +209,33 @@ class SocietyRecommenderTests(TestCase):
         self.assertTrue(len(high_diversity_recs) > 0)
         self.assertTrue(len(balanced_diversity_recs) > 0)
     
+    def test_explanations_reuse_scoring_similarities(self):
+        """Test that explanations come from the scoring pass without further NLP calls."""
+        recommender = SocietyRecommender()
+        
+        with patch.object(text_similarity_analyzer, 'calculate_similarity') as mock_similarity:
+            recommendations = recommender.get_recommendations_for_student(self.student1.id)
+        
+        mock_similarity.assert_not_called()
+        explanations = {
+            society.id: society._recommendation_explanation for society in recommendations
+        }
+        self.assertEqual(explanations[self.art_society.id]['type'], 'content')
+        self.assertEqual(explanations[self.art_society.id]['matched_society'], 'Tech Society')
+        self.assertEqual(explanations[self.art_society.id]['details']['similarity_score'], 3.0)
+    
+    def test_popular_recommendations_carry_explanations(self):
+        """Test that popularity-based recommendations are explained as such."""
+        new_student = Student.objects.create(
+            username='newstudent', email='new@example.com', password='password'
+        )
+        
+        recommendations = SocietyRecommender().get_recommendations_for_student(new_student.id)
+        
+        self.assertTrue(all(
+            society._recommendation_explanation['type'] == 'popular' for society in recommendations
+        ))
+    
     def test_recommendation_explanation(self):
         """Test generating recommendation explanation."""
         recommender = SocietyRecommender()
@@ -182,11 +256,117 @@ class SocietyRecommenderTests(TestCase):
         """Test updating the similarity model."""
         recommender = SocietyRecommender()
         
-        with patch.object(text_similarity_analyzer, 'update_corpus') as mock_update:
+        with patch.object(text_similarity_analyzer, 'update_corpus') as mock_update, \
+             patch.object(recommender, 'build_similarity_matrix') as mock_build, \
+             patch.object(recommender, 'build_vector_index') as mock_index:
             updated_count = recommender.update_similarity_model()
             mock_update.assert_called_once()
+            mock_build.assert_called_once()
+            mock_index.assert_called_once()
             self.assertGreater(updated_count, 0)
     
+    def test_build_similarity_matrix(self):
+        """Test that the approved-society similarity matrix is built and stored."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SocietySimilarityMatrix(directory=tmp_dir)
+            self.art_society.description = ''
+            Society.objects.filter(pk=self.art_society.pk).update(description='')
+
+            with patch('api.recommendation_service.society_similarity_matrix', store):
+                recommender = SocietyRecommender()
+                size = recommender.build_similarity_matrix()
+
+            self.assertEqual(size, 3)
+            self.assertAlmostEqual(store.get(self.tech_society.id, self.sports_society.id), 0.6, places=5)
+            self.assertAlmostEqual(
+                store.get(self.tech_society.id, self.art_society.id),
+                recommender._tag_category_similarity(self.tech_society, self.art_society),
+                places=5
+            )
+
+    def test_limit_candidates_uses_vector_index(self):
+        """Test that large catalogs only score the societies nearest to the joined ones."""
+        recommender = SocietyRecommender()
+        recommender.candidate_pool_size = 1
+        index = SocietyVectorIndex(
+            [self.tech_society.id, self.art_society.id, self.sports_society.id],
+            np.array([[1.0, 0.0], [0.0, 1.0], [0.9, 0.1]])
+        )
+        joined_societies = self.student1.societies.all()
+        available_societies = Society.objects.exclude(id=self.tech_society.id)
+        
+        with patch('api.recommendation_service.society_cooccurrence.scores_for', return_value={}):
+            with patch.object(society_vector_index, 'index', index):
+                candidates = recommender._limit_candidates(available_societies, joined_societies)
+                self.assertEqual(list(candidates), [self.sports_society])
+            
+            # Societies approved after the index was built are always kept
+            index = SocietyVectorIndex(
+                [self.tech_society.id, self.sports_society.id], np.array([[1.0, 0.0], [0.9, 0.1]])
+            )
+            with patch.object(society_vector_index, 'index', index):
+                candidates = recommender._limit_candidates(available_societies, joined_societies)
+                self.assertEqual(set(candidates), {self.art_society, self.sports_society})
+    
+    def test_requests_never_build_vector_index(self):
+        """Test that without a built index every candidate is scored and the build is left to the background."""
+        recommender = SocietyRecommender()
+        recommender.candidate_pool_size = 1
+        available_ids = [self.art_society.id, self.sports_society.id]
+        
+        with patch.object(society_vector_index, 'index', None), \
+             patch.object(society_vector_index, 'stale', True), \
+             patch.object(recommender, 'build_vector_index') as mock_build, \
+             self.captureOnCommitCallbacks() as callbacks:
+            self.assertIsNone(recommender.nearest_candidate_ids(available_ids, [self.tech_society.id]))
+            mock_build.assert_not_called()
+        self.assertEqual(callbacks, [vector_index_refresh._start])
+        
+        # Small catalogs never use the index, so they never start building it
+        recommender.candidate_pool_size = 10
+        with patch.object(society_vector_index, 'stale', True), \
+             self.captureOnCommitCallbacks() as callbacks:
+            self.assertIsNone(recommender.nearest_candidate_ids(available_ids, [self.tech_society.id]))
+        self.assertEqual(callbacks, [])
+    
+    def test_vector_index_is_shared_and_refreshed_after_society_changes(self):
+        """Test that one build serves every recommender until a society change marks it stale."""
+        # Index with a fresh TF-IDF model rather than refitting the shared one
+        self.addCleanup(setattr, text_similarity_analyzer, 'tfidf_vectorizer', text_similarity_analyzer.tfidf_vectorizer)
+        text_similarity_analyzer.tfidf_vectorizer = IncrementalTfidfModel()
+        with patch.object(society_vector_index, 'index', None), \
+             patch.object(society_vector_index, 'stale', True), \
+             patch.object(text_similarity_analyzer, 'preprocess_text', side_effect=lambda x: x.lower() if x else ""):
+            self.assertTrue(SocietyRecommender().refresh_vector_index())
+            self.assertIs(SocietyRecommender().vector_index, society_vector_index.index)
+            self.assertEqual(len(society_vector_index.index), 3)
+            self.assertFalse(SocietyRecommender().refresh_vector_index())
+            
+            Society.objects.create(
+                name='Chess Club', description='Weekly chess games', category='Games',
+                status='Approved', president=self.student1
+            )
+            self.assertTrue(society_vector_index.stale)
+            self.assertTrue(SocietyRecommender().refresh_vector_index())
+            self.assertEqual(len(society_vector_index.index), 4)
+    
+    def test_limit_candidates_keeps_co_joined_societies(self):
+        """Test that societies often joined together are scored even when not nearest in the index."""
+        recommender = SocietyRecommender()
+        recommender.candidate_pool_size = 1
+        index = SocietyVectorIndex(
+            [self.tech_society.id, self.art_society.id, self.sports_society.id],
+            np.array([[1.0, 0.0], [0.0, 1.0], [0.9, 0.1]])
+        )
+        available_societies = Society.objects.exclude(id=self.tech_society.id)
+        
+        with patch.object(society_vector_index, 'index', index), \
+             patch('api.recommendation_service.society_cooccurrence.scores_for',
+                   return_value={self.art_society.id: 0.5}):
+            candidates = recommender._limit_candidates(available_societies, self.student1.societies.all())
+        
+        self.assertEqual(set(candidates), {self.art_society, self.sports_society})
+    
     def test_similarity_score_calculation(self):
         """Test similarity score calculation."""
         recommender = SocietyRecommender()
@@ -200,6 +380,62 @@ class SocietyRecommenderTests(TestCase):
         self.assertIsInstance(similarity_score, float)
         self.assertGreater(similarity_score, 0)
     
+    def test_query_count_does_not_grow_with_catalog(self):
+        """Test that scoring more candidates issues the same number of queries."""
+        recommender = SocietyRecommender()
+        recommender._limit_candidates = lambda available, joined: available
+        
+        def add_societies(count):
+            for i in range(count):
+                society = Society.objects.create(
+                    name=f'Club {Society.objects.count()}',
+                    description='A club for hobbyists',
+                    category='Hobbies',
+                    status='Approved',
+                    tags=['hobby'],
+                    president=self.student2,
+                    approved_by=self.admin_user
+                )
+                Event.objects.create(
+                    title='Meetup', hosted_by=society,
+                    date=timezone.now() - datetime.timedelta(days=5)
+                )
+        
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                recommender.get_recommendations_for_student(self.student1.id, limit=3)
+            return len(queries)
+        
+        add_societies(3)
+        recommender.get_recommendations_for_student(self.student1.id, limit=3)
+        small_catalog = count_queries()
+        
+        add_societies(12)
+        recommender.get_recommendations_for_student(self.student1.id, limit=3)
+        self.assertEqual(count_queries(), small_catalog)
+    
+    def test_unchanged_description_is_not_re_encoded(self):
+        """Test that saving a society without editing its description leaves its embedding alone."""
+        with patch.object(text_similarity_analyzer.embedding_store, 'needs_update', return_value=False), \
+             patch.object(text_similarity_analyzer, 'update_society_embedding') as mock_update:
+            self.tech_society.icon = None
+            self.tech_society.save()
+
+        mock_update.assert_not_called()
+    
+    def test_changed_description_is_encoded_in_the_background(self):
+        """Test that saving a new description queues the encoding instead of running the model."""
+        with patch.object(text_similarity_analyzer, 'update_society_embedding') as mock_update, \
+             self.captureOnCommitCallbacks() as callbacks:
+            self.tech_society.description = 'Robotics and electronics projects'
+            self.tech_society.save()
+            mock_update.assert_not_called()
+        self.assertIn(embedding_refresh._start, callbacks)
+        
+        with patch.object(text_similarity_analyzer, 'update_society_embedding', return_value=True) as mock_update:
+            self.assertEqual(encode_stale_society_embeddings(), 3)
+        mock_update.assert_any_call(self.tech_society.id, 'Robotics and electronics projects')
+
     def test_recommendation_for_nonexistent_student(self):
         """Test recommendations for a nonexistent student."""
         recommender = SocietyRecommender()
@@ -0,0 +1,74 @@
+import unittest
+from api.scoring_stats import ScoringStats, scoring_stats, timed
+
+
+class TestScoringStats(unittest.TestCase):
+    """Test suite for the scoring instrumentation."""
+
+    def setUp(self):
+        self.stats = ScoringStats()
+
+    def test_records_component_timings(self):
+        """Test that calls, totals and percentiles are reported in milliseconds."""
+        for seconds in (0.001, 0.002, 0.003, 0.004):
+            self.stats.record('analyzer.tfidf', seconds)
+        with self.stats.timer('recommender.mmr'):
+            pass
+
+        components = self.stats.snapshot()['components']
+        tfidf = components['analyzer.tfidf']
+        self.assertEqual(tfidf['calls'], 4)
+        self.assertAlmostEqual(tfidf['total_ms'], 10.0)
+        self.assertAlmostEqual(tfidf['mean_ms'], 2.5)
+        self.assertAlmostEqual(tfidf['p50_ms'], 2.5)
+        self.assertLessEqual(tfidf['p95_ms'], tfidf['p99_ms'])
+        self.assertEqual(components['recommender.mmr']['calls'], 1)
+
+    def test_cache_hit_rates_and_fallbacks(self):
+        """Test that cache counters produce hit rates and fallbacks are counted."""
+        self.stats.cache_hit('analyzer.normalized_text_cache', 3)
+        self.stats.cache_miss('analyzer.normalized_text_cache')
+        self.stats.fallback('analyzer.worker')
+
+        snapshot = self.stats.snapshot()
+        cache = snapshot['caches']['analyzer.normalized_text_cache']
+        self.assertEqual((cache['hits'], cache['misses']), (3, 1))
+        self.assertAlmostEqual(cache['hit_rate'], 0.75)
+        self.assertEqual(snapshot['fallbacks'], {'analyzer.worker': 1})
+
+    def test_prefix_filters_snapshot_and_reset(self):
+        """Test that a prefix limits both snapshots and resets."""
+        self.stats.record('analyzer.tfidf', 0.001)
+        self.stats.record('recommender.mmr', 0.001)
+
+        self.assertEqual(list(self.stats.snapshot('analyzer.')['components']), ['analyzer.tfidf'])
+
+        self.stats.reset('analyzer.')
+        self.assertEqual(list(self.stats.snapshot()['components']), ['recommender.mmr'])
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled instance ignores every record call."""
+        self.stats.enabled = False
+        with self.stats.timer('analyzer.tfidf'):
+            pass
+        self.stats.cache_hit('analyzer.embedding_store')
+        self.stats.fallback('analyzer.worker')
+        self.assertEqual(
+            self.stats.snapshot(), {'components': {}, 'caches': {}, 'fallbacks': {}}
+        )
+
+    def test_timed_decorator(self):
+        """Test that the decorator times calls on the shared instance."""
+        scoring_stats.reset('test.')
+
+        @timed('test.function')
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(scoring_stats.snapshot('test.')['components']['test.function']['calls'], 1)
+        scoring_stats.reset('test.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from api.semantic_enhancer import SemanticDomainEnhancer, semantic_enhancer
 
 class TestSemanticDomainEnhancer(unittest.TestCase):
@@ -201,64 +202,70 @@ class TestSemanticDomainEnhancer(unittest.TestCase):
         )
         self.assertGreater(boost, 0)
     
+    def _mask(self, names, all_names):
+        """Bitmask of the given category or activity names."""
+        return sum(1 << all_names.index(name) for name in names)
+    
     def test_calculate_semantic_boost_formula(self):
         """Test that the boost calculation follows the expected formula."""
-        original_extract_categories = self.enhancer.extract_categories
-        original_extract_activities = self.enhancer.extract_activities
-        original_get_related_score = self.enhancer.get_related_score
+        categories = self.enhancer.category_names
+        activities = self.enhancer.activity_names
+        profiles = {
+            "text1": (self._mask(["tech"], categories), self._mask(["competition"], activities)),
+            "text2": (self._mask(["science"], categories), self._mask(["learning"], activities)),
+        }
+        self.enhancer.extract_profile = lambda text: profiles[text]
         
-        try:
-            self.enhancer.extract_categories = lambda text: ["tech"] if text == "text1" else ["science"]
-            self.enhancer.extract_activities = lambda text: ["competition"] if text == "text1" else ["learning"]
-            self.enhancer.get_related_score = lambda cat1, cat2: 0.5
-            
-            boost = self.enhancer.calculate_semantic_boost("text1", "text2")
-            self.assertAlmostEqual(boost, 0.35)
-            
-            self.enhancer.extract_activities = lambda text: ["competition"]
-            boost = self.enhancer.calculate_semantic_boost("text1", "text2")
-            self.assertAlmostEqual(boost, 0.65)
-            
-        finally:
-            self.enhancer.extract_categories = original_extract_categories
-            self.enhancer.extract_activities = original_extract_activities
-            self.enhancer.get_related_score = original_get_related_score
+        boost = self.enhancer.calculate_semantic_boost("text1", "text2")
+        self.assertAlmostEqual(boost, 0.7 * 0.5)
+        
+        profiles["text2"] = (self._mask(["science"], categories), self._mask(["competition"], activities))
+        boost = self.enhancer.calculate_semantic_boost("text1", "text2")
+        self.assertAlmostEqual(boost, 0.7 * 0.5 + 0.3)
     
     def test_top_category_scores_averaging(self):
         """Test that only top category scores are used in the calculation."""
-        original_extract_categories = self.enhancer.extract_categories
-        original_get_related_score = self.enhancer.get_related_score
+        self.enhancer.category_relationships = {
+            ("tech", "gaming"): 0.5,
+            ("tech", "sports"): 0.2,
+            ("tech", "media"): 0.4,
+            ("science", "gaming"): 0.3,
+            ("science", "sports"): 0.1,
+            ("science", "media"): 0.3,
+            ("business", "gaming"): 0.2,
+            ("business", "sports"): 0.3,
+            ("business", "media"): 0.4,
+        }
+        self.enhancer.build_relationship_table()
         
-        try:
-            self.enhancer.extract_categories = lambda text: ["tech", "science", "business"] if text == "text1" else ["gaming", "sports", "media"]
-            scores = {
-                ("tech", "gaming"): 0.5,
-                ("tech", "sports"): 0.2,
-                ("tech", "media"): 0.4,
-                ("science", "gaming"): 0.3,
-                ("science", "sports"): 0.1,
-                ("science", "media"): 0.3,
-                ("business", "gaming"): 0.2,
-                ("business", "sports"): 0.3,
-                ("business", "media"): 0.4,
-            }
-            
-            def mock_get_related_score(cat1, cat2):
-                key = (cat1, cat2)
-                if key in scores:
-                    return scores[key]
-                return scores.get((cat2, cat1), 0.2)
-            
-            self.enhancer.get_related_score = mock_get_related_score
-            self.enhancer.extract_activities = lambda text: []
-            
-            boost = self.enhancer.calculate_semantic_boost("text1", "text2")
-            self.assertAlmostEqual(boost, 0.7 * ((0.5 + 0.4 + 0.4) / 3))
-            
-        finally:
-            self.enhancer.extract_categories = original_extract_categories
-            self.enhancer.get_related_score = original_get_related_score
-            self.enhancer.extract_activities = lambda text: []
+        categories = self.enhancer.category_names
+        profiles = {
+            "text1": (self._mask(["tech", "science", "business"], categories), 0),
+            "text2": (self._mask(["gaming", "sports", "media"], categories), 0),
+        }
+        self.enhancer.extract_profile = lambda text: profiles[text]
+        
+        boost = self.enhancer.calculate_semantic_boost("text1", "text2")
+        self.assertAlmostEqual(boost, 0.7 * ((0.5 + 0.4 + 0.4) / 3))
+    
+    def test_extract_profile_bitmasks(self):
+        """Test that profiles are bitmasks over category_names and activity_names."""
+        category_mask, activity_mask = self.enhancer.extract_profile(
+            "Public speaking workshops and a coding tournament"
+        )
+        self.assertEqual(
+            set(self.enhancer.categories_from_mask(category_mask)),
+            {"debate", "tech", "gaming"}
+        )
+        self.assertEqual(
+            set(self.enhancer.activities_from_mask(activity_mask)),
+            {"competition"}
+        )
+        self.assertEqual(self.enhancer.extract_profile(""), (0, 0))
+    
+    def test_phrases_match_inside_longer_text(self):
+        """Test that multi-word terms match as substrings, e.g. plurals."""
+        self.assertIn("gaming", self.enhancer.extract_categories("We play video games"))
     
     def test_activity_similarity_calculation(self):
         """Test the activity similarity calculation."""
@@ -339,5 +346,53 @@ class TestSemanticDomainEnhancer(unittest.TestCase):
         )
         self.assertGreater(boost, 0)
 
+    def test_calculate_semantic_boost_matrix(self):
+        """Test that the boost matrix matches pairwise calculate_semantic_boost."""
+        texts_a = ["Programming and technology club", "Academic research opportunities", ""]
+        texts_b = ["Scientific experiments and observations", "Outdoor hiking and camping adventures"]
+        boosts = self.enhancer.calculate_semantic_boost_matrix(texts_a, texts_b)
+        self.assertEqual(boosts.shape, (3, 2))
+        for i, text_a in enumerate(texts_a):
+            for j, text_b in enumerate(texts_b):
+                self.assertAlmostEqual(
+                    boosts[i, j], self.enhancer.calculate_semantic_boost(text_a, text_b)
+                )
+
+    def test_relationship_matrix(self):
+        """Test that the relationship table is a dense symmetric matrix over category_names."""
+        matrix = self.enhancer.relationship_matrix
+        categories = self.enhancer.category_names
+        self.assertEqual(matrix.shape, (16, 16))
+        np.testing.assert_array_equal(matrix, matrix.T)
+        np.testing.assert_array_equal(np.diag(matrix), 1.0)
+        self.assertEqual(matrix[categories.index("academic"), categories.index("science")], 0.8)
+        self.assertEqual(matrix[categories.index("gaming"), categories.index("business")], 0.2)
+
+    def test_semantic_boost_matrix_from_profile_vectors(self):
+        """Test the batch API on indicator vectors, including multi-category texts."""
+        texts_a = [
+            "Programming, science and business startup workshops",
+            "Music concerts and theatre performance shows",
+        ]
+        texts_b = [
+            "Board game tournaments and esports competitions",
+            "Hiking trail adventures",
+            "Nothing relevant here",
+        ]
+        categories_a, activities_a = self.enhancer.profile_vectors(texts_a)
+        self.assertEqual(categories_a.shape, (2, 16))
+        self.assertEqual(activities_a.shape, (2, 6))
+
+        boosts = self.enhancer.semantic_boost_matrix(
+            (categories_a, activities_a), self.enhancer.profile_vectors(texts_b)
+        )
+        self.assertEqual(boosts.shape, (2, 3))
+        for i, text_a in enumerate(texts_a):
+            for j, text_b in enumerate(texts_b):
+                self.assertAlmostEqual(
+                    boosts[i, j], self.enhancer.calculate_semantic_boost(text_a, text_b)
+                )
+        np.testing.assert_array_equal(boosts[:, 2], 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
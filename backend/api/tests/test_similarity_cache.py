@@ -0,0 +1,86 @@
+from unittest.mock import patch
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from api import recommendation_service  # noqa: F401 - connects the Society receivers
+from api.models import Society, Student
+from api.similarity_cache import SocietySimilarityCache, society_similarity_cache
+
+
+class SocietySimilarityCacheTest(TestCase):
+    """Tests for the process-wide society pair similarity cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.cache = SocietySimilarityCache(maxsize=100, ttl=60, alias='')
+        self.version_patcher = patch(
+            'api.similarity_cache.society_similarity_matrix.model_version', return_value=1.0
+        )
+        self.model_version = self.version_patcher.start()
+        self.addCleanup(self.version_patcher.stop)
+        self.cache.sync()
+
+    def test_pairs_are_symmetric(self):
+        """Test that a pair is found regardless of the order of its ids."""
+        self.cache.set(3, 7, 0.4)
+        self.assertEqual(self.cache.get(7, 3), 0.4)
+
+    def test_model_version_change_clears(self):
+        """Test that a rebuilt similarity model drops every cached pair."""
+        self.cache.set(3, 7, 0.4)
+        self.cache.sync()
+        self.assertEqual(self.cache.get(3, 7), 0.4)
+
+        self.model_version.return_value = 2.0
+        self.cache.sync()
+        self.assertIsNone(self.cache.get(3, 7))
+
+    def test_invalidate_society(self):
+        """Test that only the pairs of the invalidated society are dropped."""
+        self.cache.set(3, 7, 0.4)
+        self.cache.set(7, 11, 0.6)
+        self.cache.invalidate_society(3)
+
+        self.assertIsNone(self.cache.get(3, 7))
+        self.assertEqual(self.cache.get(7, 11), 0.6)
+
+        self.cache.invalidate_society(11)
+        self.assertIsNone(self.cache.get(7, 11))
+        self.assertEqual(dict(self.cache._society_pairs), {7: set()})
+
+    def test_society_save_invalidates_its_pairs(self):
+        """Test that only a description change drops the society's pairs from the shared instance."""
+        student = Student.objects.create(username='student1', email='student1@example.com', password='password')
+        society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', category='Games',
+            status='Approved', president=student
+        )
+        society_similarity_cache.set(society.id, society.id + 1, 0.5)
+
+        society.name = 'Chess Society'
+        society.save()
+        self.assertEqual(society_similarity_cache.get(society.id, society.id + 1), 0.5)
+
+        society.description = 'Weekly chess and go games'
+        society.save()
+
+        self.assertIsNone(society_similarity_cache.get(society.id, society.id + 1))
+
+    @override_settings(CACHES={'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_pairs_shared_between_processes(self):
+        """Test that pairs written by one process are read by another, until invalidated."""
+        caches['shared'].clear()
+        writer = SocietySimilarityCache(alias='shared')
+        reader = SocietySimilarityCache(alias='shared')
+        writer.sync()
+        reader.sync()
+
+        writer.set(3, 7, 0.4)
+        writer.set(7, 11, 0.6)
+        self.assertEqual(reader.get(3, 7), 0.4)
+
+        # Invalidating one society keeps the generation, so other pairs stay shared
+        writer.invalidate_society(3)
+        other_reader = SocietySimilarityCache(alias='shared')
+        other_reader.sync()
+        self.assertIsNone(other_reader.get(3, 7))
+        self.assertEqual(other_reader.get(7, 11), 0.6)
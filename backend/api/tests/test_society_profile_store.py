@@ -0,0 +1,86 @@
+from django.test import TestCase
+from api import recommendation_service  # noqa: F401 - connects the Society receivers
+from api.models import Society, SocietySemanticProfile, Student
+from api.nlp_similarity import text_similarity_analyzer
+from api.semantic_enhancer import semantic_enhancer
+from api.society_profile_store import society_profile_store
+
+
+class SocietyProfileStoreTest(TestCase):
+    """Tests for the stored society semantic profiles."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.student = Student.objects.create(
+            username='student1', email='student1@example.com', password='password'
+        )
+        self.society = Society.objects.create(
+            name='Coding Club',
+            description='Programming workshop and coding tournament',
+            category='Technology',
+            status='Approved',
+            president=self.student
+        )
+
+    def test_profile_stored_on_save(self):
+        """Test that saving an approved society stores its masks, keywords and hash."""
+        profile = SocietySemanticProfile.objects.get(society=self.society)
+        category_mask, activity_mask = semantic_enhancer.extract_profile(self.society.description)
+
+        self.assertEqual(profile.category_mask, category_mask)
+        self.assertEqual(profile.activity_mask, activity_mask)
+        self.assertEqual(set(society_profile_store.categories(profile)), {'tech', 'gaming'})
+        self.assertEqual(society_profile_store.activities(profile), ['competition', 'learning'])
+        self.assertEqual(
+            profile.description_hash, society_profile_store.description_hash(self.society.description)
+        )
+        self.assertIsInstance(profile.keywords, list)
+
+    def test_recomputed_only_when_description_changes(self):
+        """Test that the profile is rewritten only for a changed description."""
+        self.assertFalse(society_profile_store.update(self.society))
+
+        self.society.name = 'Coders'
+        self.society.save()
+        self.assertEqual(
+            SocietySemanticProfile.objects.get(society=self.society).category_mask,
+            semantic_enhancer.extract_profile('Programming workshop and coding tournament')[0]
+        )
+
+        self.society.description = 'Hiking and camping trips'
+        self.society.save()
+        profile = SocietySemanticProfile.objects.get(society=self.society)
+        self.assertEqual(society_profile_store.categories(profile), ['outdoors'])
+
+    def test_get_profiles_fills_missing_and_primes_enhancer(self):
+        """Test that get_profiles computes missing profiles and seeds the enhancer memo."""
+        SocietySemanticProfile.objects.all().delete()
+        semantic_enhancer._profile_cache.pop(self.society.description, None)
+
+        profiles = society_profile_store.get_profiles([self.society])
+
+        self.assertEqual(profiles[self.society.id].society_id, self.society.id)
+        self.assertIn(self.society.description, semantic_enhancer._profile_cache)
+
+        with self.assertNumQueries(1):
+            society_profile_store.get_profiles([self.society])
+
+    def test_load_profiles_is_read_only_and_primes_keywords(self):
+        """Test that load_profiles reads in one query, skips stale rows and primes the analyzer."""
+        SocietySemanticProfile.objects.filter(society=self.society).update(keywords=['coding', 'tournament'])
+        text_similarity_analyzer.keyword_cache.clear()
+
+        with self.assertNumQueries(1):
+            profiles = society_profile_store.load_profiles([self.society])
+
+        self.assertEqual(list(profiles), [self.society.id])
+        self.assertEqual(
+            text_similarity_analyzer.keyword_cache.get(self.society.description), ['coding', 'tournament']
+        )
+
+        SocietySemanticProfile.objects.filter(society=self.society).update(description_hash='stale')
+        with self.assertNumQueries(1):
+            self.assertEqual(society_profile_store.load_profiles([self.society]), {})
+        self.assertEqual(
+            SocietySemanticProfile.objects.get(society=self.society).description_hash, 'stale'
+        )
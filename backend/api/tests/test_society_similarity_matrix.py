@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from api.society_similarity_matrix import SocietySimilarityMatrix
+
+
+class TestSocietySimilarityMatrix(unittest.TestCase):
+    """Test suite for the persisted society similarity matrix."""
+
+    def setUp(self):
+        """Point the matrix at a temporary directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = SocietySimilarityMatrix(directory=self.tmp_dir)
+
+        self.society_ids = [3, 7, 11]
+        self.full_matrix = np.array([
+            [1.0, 0.4, 0.1],
+            [0.4, 1.0, 0.6],
+            [0.1, 0.6, 1.0],
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _compute_rows(self, start, end):
+        return self.full_matrix[start:end]
+
+    def test_get_without_stored_matrix(self):
+        """Test that lookups return None when nothing has been built yet."""
+        self.assertFalse(self.store.refresh())
+        self.assertIsNone(self.store.get(3, 7))
+
+    def test_save_and_lookup(self):
+        """Test that saved similarities can be looked up by society id."""
+        size = self.store.save(self.society_ids, self._compute_rows, chunk_size=2)
+        self.assertEqual(size, 3)
+        self.assertAlmostEqual(self.store.get(3, 7), 0.4, places=5)
+        self.assertAlmostEqual(self.store.get(11, 7), 0.6, places=5)
+        self.assertIsNone(self.store.get(3, 99))
+
+    def test_get_row(self):
+        """Test that a row lookup aligns with the requested ids and marks unknown pairs NaN."""
+        self.store.save(self.society_ids, self._compute_rows)
+        row = self.store.get_row(7, [11, 99, 3])
+        np.testing.assert_allclose(row[[0, 2]], [0.6, 0.4], rtol=1e-5)
+        self.assertTrue(np.isnan(row[1]))
+        self.assertTrue(np.isnan(self.store.get_row(99, [3, 7])).all())
+
+    def test_matrix_is_memory_mapped_float32(self):
+        """Test that the stored matrix is opened as a float32 memory map."""
+        self.store.save(self.society_ids, self._compute_rows)
+        self.assertIsInstance(self.store.matrix, np.memmap)
+        self.assertEqual(self.store.matrix.dtype, np.float32)
+
+    def test_other_instance_sees_saved_matrix(self):
+        """Test that a second instance (e.g. another worker) loads the saved matrix."""
+        self.store.save(self.society_ids, self._compute_rows)
+        reader = SocietySimilarityMatrix(directory=self.tmp_dir)
+        self.assertTrue(reader.refresh())
+        self.assertAlmostEqual(reader.get(7, 3), 0.4, places=5)
+
+    def test_mismatched_index_is_ignored(self):
+        """Test that a matrix whose index does not match its shape is not used."""
+        self.store.save(self.society_ids, self._compute_rows)
+        with open(self.store._path(self.store.version, 'index.json'), 'w') as f:
+            f.write('{"society_ids": [1, 2]}')
+        self.store._loaded_mtime = None
+        self.assertFalse(self.store.refresh())
+        self.assertIsNone(self.store.get(3, 7))
+
+    def test_rebuild_switches_matrix_and_index_together(self):
+        """Test that a reader of the previous version keeps a matching matrix and index until the pointer moves."""
+        self.store.save(self.society_ids, self._compute_rows)
+        reader = SocietySimilarityMatrix(directory=self.tmp_dir)
+        self.assertTrue(reader.refresh())
+
+        # Same shape, different ids: only the pointer decides which pair is read
+        self.store.save([7, 3, 11], self._compute_rows)
+        self.assertAlmostEqual(reader.get(3, 11), 0.1, places=5)
+        reader._loaded_mtime = None
+        self.assertTrue(reader.refresh())
+        self.assertAlmostEqual(reader.get(3, 11), 0.6, places=5)
+
+    def test_old_versions_are_pruned(self):
+        """Test that only the last `keep` versions stay on disk."""
+        versions = []
+        for _ in range(3):
+            self.store.save(self.society_ids, self._compute_rows, keep=2)
+            versions.append(self.store.version)
+
+        self.assertEqual(self.store.versions(), versions[1:])
+        self.assertFalse(any(versions[0] in name for name in os.listdir(self.tmp_dir)))
+
+if __name__ == '__main__':
+    unittest.main()
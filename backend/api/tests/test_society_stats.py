@@ -0,0 +1,110 @@
+import datetime
+from django.test import TestCase
+from django.utils import timezone
+from api.models import Event, Society, SocietyStats, Student
+from api.society_stats import society_stats_store
+
+
+class SocietyStatsTest(TestCase):
+    """Tests for the materialized society popularity statistics."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.president = Student.objects.create(
+            username='president', email='president@example.com', password='password'
+        )
+        self.students = [
+            Student.objects.create(
+                username=f'student{i}', email=f'student{i}@example.com', password='password'
+            )
+            for i in range(3)
+        ]
+        self.society = Society.objects.create(
+            name='Chess Club', description='Weekly chess games', category='Games',
+            status='Approved', president=self.president
+        )
+        self.other = Society.objects.create(
+            name='Film Club', description='Classic film screenings', category='Arts',
+            status='Approved', president=self.president
+        )
+
+    def stats(self, society):
+        return SocietyStats.objects.get(society=society)
+
+    def assertMatchesReconcile(self):
+        """The incrementally maintained rows equal a full recount."""
+        maintained = list(SocietyStats.objects.order_by('society_id').values())
+        society_stats_store.reconcile()
+        recounted = list(SocietyStats.objects.order_by('society_id').values())
+        for row in maintained + recounted:
+            row.pop('updated_at')
+        self.assertEqual(maintained, recounted)
+
+    def test_created_with_society(self):
+        """Test that a new society starts with its president as only member."""
+        stats = self.stats(self.society)
+        self.assertEqual(stats.member_count, 1)
+        self.assertEqual(stats.base_popularity_score, 2)
+
+    def test_memberships_from_either_side(self):
+        """Test that joins and leaves on both sides of the relation keep counts exact."""
+        self.society.society_members.add(*self.students)
+        self.students[0].societies_belongs_to.add(self.other)
+        self.assertEqual(self.stats(self.society).member_count, 4)
+        self.assertEqual(self.stats(self.other).member_count, 2)
+
+        self.society.society_members.remove(self.students[1])
+        self.students[0].societies_belongs_to.clear()
+        self.assertEqual(self.stats(self.society).member_count, 2)
+        self.assertEqual(self.stats(self.other).member_count, 1)
+        self.assertMatchesReconcile()
+
+    def test_events_and_attendance(self):
+        """Test that hosted events and their attendees are counted without join inflation."""
+        self.society.society_members.add(*self.students)
+        recent = Event.objects.create(title='Blitz night', hosted_by=self.society, date=timezone.now().date())
+        old = Event.objects.create(
+            title='Open', hosted_by=self.society,
+            date=timezone.now().date() - datetime.timedelta(days=60)
+        )
+        recent.current_attendees.add(*self.students)
+        self.students[0].event_set.add(old)
+
+        stats = self.stats(self.society)
+        self.assertEqual(stats.event_count, 2)
+        self.assertEqual(stats.recent_event_count, 1)
+        self.assertEqual(stats.total_attendance, 4)
+        self.assertEqual(stats.member_count, 4)
+
+        old.delete()
+        self.assertEqual(self.stats(self.society).total_attendance, 3)
+        self.assertEqual(self.stats(self.society).event_count, 1)
+        self.assertMatchesReconcile()
+
+    def test_reconcile_corrects_drift(self):
+        """Test that reconcile recomputes rows that drifted or were never created."""
+        SocietyStats.objects.filter(society=self.society).update(member_count=99, popularity_score=0)
+        SocietyStats.objects.filter(society=self.other).delete()
+
+        self.assertEqual(society_stats_store.reconcile(), 2)
+
+        self.assertEqual(self.stats(self.society).member_count, 1)
+        self.assertEqual(self.stats(self.other).member_count, 1)
+
+    def test_popular_societies_order(self):
+        """Test that popularity rankings follow the stored scores."""
+        self.other.society_members.add(*self.students)
+
+        popular = list(society_stats_store.popular_societies())
+
+        self.assertEqual(popular[:2], [self.other, self.society])
+        self.assertEqual(popular[0].total_members, 4)
+        self.assertEqual(popular[0].popularity_score, self.stats(self.other).popularity_score)
+
+    def test_deleting_society_removes_stats(self):
+        """Test that deleting a society with events does not leave or recreate its row."""
+        Event.objects.create(title='Blitz night', hosted_by=self.society)
+
+        self.society.delete()
+
+        self.assertFalse(SocietyStats.objects.filter(society_id=self.society.id).exists())
@@ -0,0 +1,123 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from api.vector_index import SocietyVectorIndex, RandomProjectionLSH
+
+
+class TestSocietyVectorIndex(unittest.TestCase):
+    """Test suite for the nearest-society vector index."""
+
+    def setUp(self):
+        """Create a small random catalog of society vectors."""
+        rng = np.random.default_rng(42)
+        self.vectors = rng.standard_normal((200, 16))
+        self.society_ids = list(range(1000, 1200))
+        self.index = SocietyVectorIndex(self.society_ids, self.vectors)
+
+        normalized = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self.cosine = normalized @ normalized.T
+
+    def test_search_matches_brute_force(self):
+        """Test that exact search returns the same ranking as a full sort."""
+        query = self.vectors[5] + 0.1
+        results = self.index.search(query, k=10)
+
+        normalized_query = query / np.linalg.norm(query)
+        normalized = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(normalized @ normalized_query))[:10]
+
+        self.assertEqual([society_id for society_id, _ in results],
+                         [self.society_ids[i] for i in expected])
+        scores = [score for _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_search_similar_to_uses_max_similarity(self):
+        """Test that a candidate is scored by its closest joined society."""
+        joined = [1000, 1001]
+        results = self.index.search_similar_to(joined, k=5)
+
+        scores = self.cosine[[0, 1]].max(axis=0)
+        scores[[0, 1]] = -np.inf
+        expected = np.argsort(-scores)[:5]
+
+        self.assertEqual([society_id for society_id, _ in results],
+                         [self.society_ids[i] for i in expected])
+        for society_id, score in results:
+            self.assertAlmostEqual(score, scores[society_id - 1000], places=5)
+
+    def test_search_similar_to_excludes_joined_and_excluded(self):
+        """Test that joined and explicitly excluded societies are never returned."""
+        results = self.index.search_similar_to([1000], k=199, exclude_ids=[1002])
+        returned = {society_id for society_id, _ in results}
+
+        self.assertEqual(len(results), 198)
+        self.assertNotIn(1000, returned)
+        self.assertNotIn(1002, returned)
+
+    def test_unknown_or_empty_queries(self):
+        """Test that unknown societies and empty indexes return no results."""
+        self.assertEqual(self.index.search_similar_to([1], k=5), [])
+        empty = SocietyVectorIndex([], np.zeros((0, 0)))
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.search(np.ones(16), k=5), [])
+
+    def test_lsh_search_finds_near_duplicates(self):
+        """Test that the approximate mode still finds the nearest neighbours."""
+        lsh_index = SocietyVectorIndex(
+            self.society_ids, self.vectors, search=RandomProjectionLSH(n_planes=6, n_tables=8)
+        )
+        for row in (3, 50, 120):
+            results = lsh_index.search(self.vectors[row] * 2, k=3)
+            self.assertEqual(results[0][0], self.society_ids[row])
+            self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+    def test_lsh_falls_back_to_exact_scan(self):
+        """Test that the approximate mode scans everything when buckets are too small."""
+        lsh_index = SocietyVectorIndex(
+            self.society_ids, self.vectors, search=RandomProjectionLSH(n_planes=16, n_tables=1)
+        )
+        results = lsh_index.search(self.vectors[0], k=150)
+        self.assertEqual(len(results), 150)
+        self.assertEqual(results, self.index.search(self.vectors[0], k=150))
+
+    def test_from_societies_uses_tfidf_vectors(self):
+        """Test building an index from societies with the analyzer's TF-IDF space."""
+        societies = [
+            SimpleNamespace(id=1, description='coding hackathon programming'),
+            SimpleNamespace(id=2, description='painting drawing art'),
+            SimpleNamespace(id=3, description='programming workshop coding'),
+            SimpleNamespace(id=4, description=''),
+        ]
+        analyzer = Mock()
+        analyzer.preprocess_many.side_effect = lambda texts: list(texts)
+        analyzer.tfidf_vectorizer = TfidfVectorizer().fit(
+            [society.description for society in societies]
+        )
+        analyzer.sentence_model = None
+
+        index = SocietyVectorIndex.from_societies(societies, analyzer)
+
+        self.assertEqual(len(index), 3)
+        self.assertNotIn(4, index)
+        self.assertTrue(sparse.issparse(index.vectors))
+        self.assertEqual(index.search_similar_to([1], k=1)[0][0], 3)
+
+    def test_sparse_vectors_match_dense(self):
+        """Test that sparse rows give the same rankings as their dense form, exact and with LSH."""
+        vectors = self.vectors.copy()
+        vectors[np.abs(vectors) < 1.0] = 0.0
+        for search in (None, RandomProjectionLSH(n_planes=6, n_tables=8)):
+            dense_index = SocietyVectorIndex(self.society_ids, vectors, search=search)
+            sparse_index = SocietyVectorIndex(self.society_ids, sparse.csr_matrix(vectors), search=search)
+            self.assertTrue(sparse.issparse(sparse_index.vectors))
+
+            dense_results = dense_index.search_similar_to([1000, 1001], k=10)
+            sparse_results = sparse_index.search_similar_to([1000, 1001], k=10)
+            self.assertEqual([i for i, _ in sparse_results], [i for i, _ in dense_results])
+            np.testing.assert_allclose(
+                [score for _, score in sparse_results], [score for _, score in dense_results], rtol=1e-5
+            )
+            self.assertEqual(sparse_index.search(vectors[7], k=3), dense_index.search(vectors[7], k=3))
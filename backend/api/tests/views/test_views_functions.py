@@ -88,8 +88,9 @@ class TestViewFunctions(APITestCase):
             society2.society_members.count(),
             self.society.society_members.count()
         )
-        self.assertEqual(response.data[0]["id"], self.society.id)
-        self.assertEqual(response.data[1]["id"], society2.id)
+        # The society with more members ranks first
+        self.assertEqual(response.data[0]["id"], society2.id)
+        self.assertEqual(response.data[1]["id"], self.society.id)
         with self.assertRaises(IndexError):
             response.data[2]
 
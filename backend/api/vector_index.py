@@ -0,0 +1,207 @@
+import numpy as np
+from collections import defaultdict
+from scipy import sparse
+
+
+def _normalize_rows(vectors):
+    """L2-normalize each row; all-zero rows stay zero. Sparse matrices stay sparse (CSR)."""
+    if sparse.issparse(vectors):
+        vectors = sparse.csr_matrix(vectors, dtype=np.float32)
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(vectors).astype(np.float32).tocsr()
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores, k):
+    """Indices of the k highest scores, best first, using argpartition instead of a full sort."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=int)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class ExactSearch:
+    """Candidate generator that considers every indexed row."""
+
+    def fit(self, vectors):
+        self.size = vectors.shape[0]
+
+    def candidates(self, query_vectors, k):
+        return None  # None means "all rows"
+
+
+class RandomProjectionLSH:
+    """
+    Approximate candidate generator using random-hyperplane locality sensitive hashing.
+    Each table hashes a vector to the sign pattern of n_planes random projections;
+    rows sharing a bucket with the query in any table become candidates.
+    """
+
+    def __init__(self, n_planes=12, n_tables=6, seed=0):
+        self.n_planes = n_planes
+        self.n_tables = n_tables
+        self.seed = seed
+        self.planes = None
+        self.tables = []
+
+    def fit(self, vectors):
+        rng = np.random.default_rng(self.seed)
+        self.planes = rng.standard_normal(
+            (self.n_tables, vectors.shape[1], self.n_planes)
+        ).astype(np.float32)
+        self.powers = 1 << np.arange(self.n_planes, dtype=np.int64)
+
+        self.tables = []
+        for codes in self._hash(vectors):
+            buckets = defaultdict(list)
+            for row, code in enumerate(codes):
+                buckets[int(code)].append(row)
+            self.tables.append({code: np.array(rows) for code, rows in buckets.items()})
+
+    def _hash(self, vectors):
+        """Bucket code of each vector in every table, shape (n_tables, n_vectors)."""
+        # One (sparse or dense) @ dense product per table; sparse rows are never densified
+        projections = np.stack([np.asarray(vectors @ planes) for planes in self.planes])
+        return (projections > 0).astype(np.int64) @ self.powers
+
+    def candidates(self, query_vectors, k):
+        rows = set()
+        for table, codes in zip(self.tables, self._hash(query_vectors)):
+            for code in codes:
+                bucket = table.get(int(code))
+                if bucket is not None:
+                    rows.update(bucket.tolist())
+
+        # Too few collisions to fill k results: let the index fall back to an exact scan
+        if len(rows) < k:
+            return None
+        return np.fromiter(rows, dtype=int)
+
+
+class SocietyVectorIndex:
+    """
+    Top-k nearest-society index over TF-IDF and/or sentence-embedding vectors.
+    Rows are L2-normalized so a dot product is the cosine similarity; sparse TF-IDF
+    rows are kept in CSR form rather than densified. Search is exact by default;
+    pass search=RandomProjectionLSH() to only rank the rows that share an LSH
+    bucket with the query, for large catalogs.
+    """
+
+    def __init__(self, society_ids, vectors, search=None):
+        self.society_ids = np.asarray(list(society_ids), dtype=np.int64)
+        self.vectors = _normalize_rows(vectors) if len(self.society_ids) else np.zeros((0, 0), np.float32)
+        self.row_index = {int(society_id): row for row, society_id in enumerate(self.society_ids)}
+
+        self.search_strategy = search or ExactSearch()
+        if len(self.society_ids):
+            self.search_strategy.fit(self.vectors)
+
+    def __len__(self):
+        return len(self.society_ids)
+
+    def __contains__(self, society_id):
+        return society_id in self.row_index
+
+    @classmethod
+    def from_societies(cls, societies, analyzer, source='auto', search=None):
+        """
+        Build an index from Society objects using the analyzer's vector spaces.
+        source is 'tfidf', 'embedding', or 'auto' (embeddings concatenated with TF-IDF
+        when a sentence model is available, TF-IDF alone otherwise).
+        """
+        societies = [society for society in societies if society.description]
+        if not societies:
+            return cls([], np.zeros((0, 0)), search=search)
+
+        descriptions = [society.description for society in societies]
+        blocks = []
+
+        if source in ('tfidf', 'auto') and analyzer._ensure_vectorizers_fitted():
+            processed = analyzer.preprocess_many(descriptions)
+            tfidf = analyzer.tfidf_vectorizer.transform(processed)
+            blocks.append(_normalize_rows(tfidf if sparse.issparse(tfidf) else np.asarray(tfidf)))
+
+        if source in ('embedding', 'auto') and analyzer.sentence_model is not None:
+            embeddings = analyzer._embedding_matrix(descriptions)
+            if embeddings is not None:
+                blocks.append(_normalize_rows(embeddings))
+
+        if not blocks:
+            return cls([], np.zeros((0, 0)), search=search)
+
+        if any(sparse.issparse(block) for block in blocks):
+            vectors = sparse.hstack(blocks, format='csr')
+        else:
+            vectors = np.hstack(blocks)
+        return cls([society.id for society in societies], vectors, search=search)
+
+    def search(self, query_vector, k, exclude_ids=None):
+        """Return up to k (society_id, cosine similarity) pairs closest to a query vector."""
+        if not len(self):
+            return []
+        query = _normalize_rows(query_vector)
+        return self._rank(query.toarray() if sparse.issparse(query) else query, k, exclude_ids)
+
+    def search_similar_to(self, society_ids, k, exclude_ids=None):
+        """
+        Return up to k (society_id, similarity) pairs most similar to any of the given
+        societies (a candidate's score is its max cosine similarity to the set).
+        The query societies themselves are excluded.
+        """
+        rows = [self.row_index[s] for s in society_ids if s in self.row_index]
+        if not rows:
+            return []
+
+        exclude_ids = set(exclude_ids or []) | set(society_ids)
+        queries = self.vectors[rows]
+        # The few query rows are densified, so scoring is a sparse @ dense product
+        return self._rank(queries.toarray() if sparse.issparse(queries) else queries, k, exclude_ids)
+
+    def _rank(self, queries, k, exclude_ids):
+        candidate_rows = self.search_strategy.candidates(queries, k + len(exclude_ids or []))
+        if candidate_rows is None:
+            candidate_rows = np.arange(len(self))
+
+        scores = np.asarray(self.vectors[candidate_rows] @ queries.T).max(axis=1)
+
+        if exclude_ids:
+            keep = ~np.isin(self.society_ids[candidate_rows], list(exclude_ids))
+            candidate_rows = candidate_rows[keep]
+            scores = scores[keep]
+
+        top = _top_k(scores, k)
+        return [
+            (int(self.society_ids[candidate_rows[i]]), float(scores[i])) for i in top
+        ]
+
+
+class SharedVectorIndex:
+    """
+    Holder of the process-wide SocietyVectorIndex. Recommenders read the index in
+    place instead of building their own; a rebuild swaps in a whole new index, and
+    catalog changes only mark it stale for the next background rebuild.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.stale = True
+
+    def set(self, index):
+        self.index = index
+
+    def mark_stale(self):
+        self.stale = True
+
+
+# Create a singleton instance for reuse
+society_vector_index = SharedVectorIndex()
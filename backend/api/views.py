@@ -1,7 +1,6 @@
 from PIL import Image
 from io import BytesIO
 from django.core.files.base import ContentFile
-from django.db.models import Sum
 from django.utils.timezone import now
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
@@ -42,6 +41,7 @@ from django.conf import settings
 from django.views.static import serve
 import os
 from api.models import RecommendationFeedback, Society, Student
+from api.society_stats import society_stats_store
 from api.serializers import RecommendationFeedbackSerializer, RecommendationFeedbackCreateSerializer
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -58,23 +58,10 @@ def get_popular_societies(request):
     - Number of hosted events
     - Total event attendees
 
+    Rankings are read from the materialized SocietyStats.
     Data is processed via SocietySerializer.
     """
-    popular_societies_qs = (
-        Society.objects.annotate(
-            total_members=Count("society_members"),
-            total_events=Count("events"),
-            total_event_attendance=Sum("events__current_attendees")
-        )
-        .annotate(
-            popularity_score=(
-                (2 * Count("society_members")) +
-                (3 * Count("events")) +
-                (4 * Sum("events__current_attendees"))
-            )
-        )
-        .order_by("-popularity_score")[:5]
-    )
+    popular_societies_qs = society_stats_store.popular_societies(with_recent_boost=False)[:5]
 
     serializer = SocietySerializer(popular_societies_qs, many=True, context={'request': request})
     return Response(serializer.data)
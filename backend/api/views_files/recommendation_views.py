@@ -9,6 +9,8 @@ from api.models import Student, Society
 from api.serializers import SocietySerializer
 from api.recommendation_service import SocietyRecommender
 from api.feedback_processor import feedback_processor
+from api.recommendation_cache import recommendation_cache
+from api.recommendation_materializer import recommendation_materializer
 
 class RecommendedSocietiesView(APIView):
     """
@@ -29,12 +31,10 @@ class RecommendedSocietiesView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
             
-        # Initialize the enhanced recommender
-        recommender = SocietyRecommender()
-        
         # Get parameters from query params
         limit = int(request.query_params.get('limit', 5))
         diversity_level = request.query_params.get('diversity', 'balanced')
+        mode = request.query_params.get('mode', 'content')
         
         # Track this recommendation request as implicit feedback
         feedback_processor.record_feedback(
@@ -44,40 +44,98 @@ class RecommendedSocietiesView(APIView):
             metadata={'timestamp': timezone.now().isoformat()}
         )
         
-        # Get recommended societies from the enhanced recommender
-        recommended_societies = recommender.get_recommendations_for_student(
-            student.id, limit, diversity_level
-        )
-        
-        # EXCLUDE societies the student has already joined
-        joined_society_ids = student.societies_belongs_to.values_list("id", flat=True)
-        filtered_societies = [
-            soc for soc in recommended_societies
-            if soc.id not in joined_society_ids
-        ]
+        if mode == 'factorization':
+            # One product over the trained factors; the cache and materialized rows hold content-based results
+            cached_recommendations = self._compute_recommendations(student, limit, diversity_level, mode)
+        else:
+            # Repeat loads are served from the cache until the student's inputs or the model change
+            cached_recommendations = recommendation_cache.get(student.id, limit, diversity_level)
+        if cached_recommendations is None:
+            cached_recommendations = (
+                self._materialized_recommendations(student, limit, diversity_level)
+                or self._compute_recommendations(student, limit, diversity_level)
+            )
+            recommendation_cache.set(student.id, limit, diversity_level, cached_recommendations)
         
         # Build the final response array with explanation data
         recommendations = []
-        for society in filtered_societies:
-            explanation = recommender.get_recommendation_explanation(student.id, society.id)
+        for item in cached_recommendations:
+            society_id = item['society']['id']
             
             # Record impression for this recommendation
             feedback_processor.record_feedback(
                 student.id,
-                society.id,
+                society_id,
                 'impression',
                 metadata={'position': len(recommendations) + 1}
             )
             
             recommendations.append({
-                'society': SocietySerializer(society).data,
-                'explanation': explanation,
-                'feedback_id': f"rec_{student.id}_{society.id}_{timezone.now().strftime('%Y%m%d%H%M%S')}"
+                'society': item['society'],
+                'explanation': item['explanation'],
+                'feedback_id': f"rec_{student.id}_{society_id}_{timezone.now().strftime('%Y%m%d%H%M%S')}"
                 # This feedback_id can be used when tracking interactions with this recommendation
             })
             
         return Response(recommendations, status=status.HTTP_200_OK)
 
+    def _materialized_recommendations(self, student, limit, diversity_level):
+        """
+        Recommendations from the nightly materialized table, or None if the student
+        has no fresh rows. Served without loading any NLP model.
+        """
+        rows = recommendation_materializer.get(student.id, limit, diversity_level)
+        if rows is None:
+            return None
+        
+        joined_society_ids = set(student.societies_belongs_to.values_list("id", flat=True))
+        return [
+            {
+                'society': SocietySerializer(row.society).data,
+                'explanation': {
+                    'type': row.explanation_type,
+                    'message': row.explanation_message,
+                },
+            }
+            for row in rows
+            if row.society_id not in joined_society_ids
+        ]
+
+    def _compute_recommendations(self, student, limit, diversity_level, mode='content'):
+        """Serialized recommendations and their explanations, as stored in the cache."""
+        # Initialize the enhanced recommender
+        recommender = SocietyRecommender()
+        
+        # Get recommended societies from the enhanced recommender
+        recommended_societies = recommender.get_recommendations_for_student(
+            student.id, limit, diversity_level, mode
+        )
+        
+        # EXCLUDE societies the student has already joined
+        joined_society_ids = student.societies_belongs_to.values_list("id", flat=True)
+        filtered_societies = [
+            soc for soc in recommended_societies
+            if soc.id not in joined_society_ids
+        ]
+        
+        return [
+            {
+                'society': SocietySerializer(society).data,
+                'explanation': self._explanation(recommender, student, society),
+            }
+            for society in filtered_societies
+        ]
+
+    def _explanation(self, recommender, student, society):
+        """The explanation attached while scoring, computed separately only if missing."""
+        explanation = getattr(society, '_recommendation_explanation', None)
+        if explanation is None:
+            return recommender.get_recommendation_explanation(student.id, society.id)
+        return {
+            'type': explanation['type'],
+            'message': explanation['message']
+        }
+
 class SocietyRecommendationExplanationView(APIView):
     """
     API View for getting an explanation of why a society is recommended to a student.
@@ -14,6 +14,53 @@ SECRET_KEY = os.getenv(
 
 DEBUG = os.getenv("DJANGO_DEBUG", "True") == "True"
 
+# Load the NLP similarity models in a background thread at start-up instead of on first use
+NLP_WARM_UP_ON_STARTUP = os.getenv("NLP_WARM_UP_ON_STARTUP", "False") == "True"
+
+# Storage precision of persisted society embeddings: float32, float16 or int8
+NLP_EMBEDDING_PRECISION = os.getenv("NLP_EMBEDDING_PRECISION", "float32")
+
+# Unix socket of the shared NLP scoring worker (run_nlp_worker); empty scores in-process
+NLP_WORKER_SOCKET = os.getenv("NLP_WORKER_SOCKET", "")
+
+# Seconds between saves of incremental TF-IDF/keyword model changes to disk
+NLP_TEXT_MODEL_SAVE_INTERVAL = int(os.getenv("NLP_TEXT_MODEL_SAVE_INTERVAL", "300"))
+
+# Seconds a student's computed recommendations stay in the cache (entries are also invalidated on change)
+RECOMMENDATION_CACHE_TIMEOUT = int(os.getenv("RECOMMENDATION_CACHE_TIMEOUT", "3600"))
+
+# Hours the nightly materialized recommendations are served before falling back to online scoring
+MATERIALIZED_RECOMMENDATION_MAX_AGE_HOURS = int(os.getenv("MATERIALIZED_RECOMMENDATION_MAX_AGE_HOURS", "26"))
+
+# Worker processes of the nightly recommendation materialization job
+MATERIALIZED_RECOMMENDATION_PROCESSES = int(os.getenv("MATERIALIZED_RECOMMENDATION_PROCESSES", "1"))
+
+# Process-wide cache of society pair similarities: entry bound, seconds to live, and an
+# optional Django cache alias to also share pairs between processes (empty: process-local)
+SIMILARITY_CACHE_SIZE = int(os.getenv("SIMILARITY_CACHE_SIZE", "100000"))
+SIMILARITY_CACHE_TTL = int(os.getenv("SIMILARITY_CACHE_TTL", "3600"))
+SIMILARITY_CACHE_ALIAS = os.getenv("SIMILARITY_CACHE_ALIAS", "")
+
+# Item-item collaborative filtering: neighbors kept per society, cosine or jaccard scores,
+# and seconds before the scheduler rebuilds the incrementally maintained co-occurrence counts
+COLLABORATIVE_FILTERING_NEIGHBORS = int(os.getenv("COLLABORATIVE_FILTERING_NEIGHBORS", "20"))
+COLLABORATIVE_FILTERING_METRIC = os.getenv("COLLABORATIVE_FILTERING_METRIC", "cosine")
+COLLABORATIVE_FILTERING_MAX_AGE = int(os.getenv("COLLABORATIVE_FILTERING_MAX_AGE", "3600"))
+
+# Offline implicit-feedback matrix factorization: latent factors, solver threads (0: one per CPU)
+# and the interactions solved per block, which bounds the training memory
+MATRIX_FACTORIZATION_FACTORS = int(os.getenv("MATRIX_FACTORIZATION_FACTORS", "32"))
+MATRIX_FACTORIZATION_THREADS = int(os.getenv("MATRIX_FACTORIZATION_THREADS", "0"))
+MATRIX_FACTORIZATION_BLOCK_SIZE = int(os.getenv("MATRIX_FACTORIZATION_BLOCK_SIZE", "4096"))
+
+# Seconds the cold-start category leaders and per-major society rankings are cached
+COLD_START_CACHE_TTL = int(os.getenv("COLD_START_CACHE_TTL", "600"))
+
+# Smoothing of the major -> society affinities (members / (students of the major + smoothing))
+# and the similar majors kept per major as cold-start fallbacks
+MAJOR_AFFINITY_SMOOTHING = int(os.getenv("MAJOR_AFFINITY_SMOOTHING", "5"))
+MAJOR_SIMILARITY_NEIGHBORS = int(os.getenv("MAJOR_SIMILARITY_NEIGHBORS", "5"))
+
 ALLOWED_HOSTS = ["*"]
 
 REST_FRAMEWORK = {
@@ -1,15 +1,12 @@
 #!/bin/bash
 set -e
 
-# Remove existing db and api/migrations/0001_initial.py
-echo "Cleaning up old DB and initial migration..."
+# Remove existing db
+echo "Cleaning up old DB..."
 rm -f db.sqlite3
-rm -f api/migrations/0001_initial.py
-rm -f api/migrations/__pycache__/*
 
-# Run Django migrations and other setup commands
+# Apply the committed migrations (0002+ depend on 0001_initial, so it must be kept)
 echo "Running migrations..."
-python manage.py makemigrations
 python manage.py migrate
 
 # Optional: Load seed data